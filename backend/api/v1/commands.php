@@ -74,7 +74,46 @@ try {
         // Complete command execution
         // Extract command ID from path: /commands/{id}/complete
         $path = $_SERVER['REQUEST_URI'];
-        if (preg_match('/\/commands\/(\d+)\/complete/', $path, $matches)) {
+        if (preg_match('/\/commands\/results\/batch/', $path)) {
+            // Complete several commands at once: /commands/results/batch
+            $data = getJsonInput();
+            $results = $data['results'] ?? null;
+            
+            // Validate
+            if (!is_array($results) || empty($results)) {
+                sendError('results must be a non-empty array', 400);
+            }
+            
+            foreach ($results as $result) {
+                if (!is_array($result) || !isset($result['id']) || !Validator::enum($result['status'] ?? '', ['completed', 'failed'])) {
+                    sendError('Each result needs an id and a status of completed or failed', 400);
+                }
+            }
+            
+            // Update commands
+            $stmt = $pdo->prepare("
+                UPDATE dmr_commands
+                SET status = ?, completed_at = NOW(), error_message = ?
+                WHERE id = ?
+            ");
+            
+            $updated = 0;
+            $pdo->beginTransaction();
+            foreach ($results as $result) {
+                $stmt->execute([$result['status'], $result['error_message'] ?? null, (int)$result['id']]);
+                $updated += $stmt->rowCount();
+            }
+            $pdo->commit();
+            
+            logApiRequest(
+                '/commands/results/batch',
+                $authInfo,
+                "Completed $updated of " . count($results) . " commands"
+            );
+            
+            sendSuccess(['updated' => $updated]);
+            
+        } elseif (preg_match('/\/commands\/(\d+)\/complete/', $path, $matches)) {
             $commandId = (int)$matches[1];
             
             $data = getJsonInput();
@@ -108,7 +147,7 @@ try {
             sendSuccess(['updated' => true]);
             
         } else {
-            sendError('Invalid endpoint. Use /commands/{id}/complete', 400);
+            sendError('Invalid endpoint. Use /commands/{id}/complete or /commands/results/batch', 400);
         }
         
     } else {
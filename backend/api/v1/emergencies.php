@@ -20,7 +20,63 @@ $method = getRequestMethod();
 try {
     $pdo = getDatabaseConnection();
     
-    if ($method === 'POST') {
+    if ($method === 'POST' && preg_match('/\/emergencies\/bulk/', $_SERVER['REQUEST_URI'])) {
+        // Receive several emergency alerts at once: /emergencies/bulk
+        $items = getJsonInput();
+        
+        if (empty($items) || !isset($items[0])) {
+            sendError('Request body must be a non-empty array of emergency alerts', 400);
+        }
+        
+        // Validate every alert before inserting any
+        $rows = [];
+        foreach ($items as $index => $data) {
+            $data = is_array($data) ? $data : [];
+            
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $emergencyType = Validator::string($data['emergency_type'] ?? 'generic', 1, 50);
+            $latitude = isset($data['latitude']) ? Validator::latitude($data['latitude']) : null;
+            $longitude = isset($data['longitude']) ? Validator::longitude($data['longitude']) : null;
+            $triggeredAt = isset($data['triggered_at']) ? Validator::datetime($data['triggered_at']) : date('Y-m-d H:i:s');
+            
+            if ($radioId === false || $emergencyType === false || $triggeredAt === false) {
+                sendError("Emergency $index: invalid or missing required fields: radio_id, emergency_type, triggered_at", 400);
+            }
+            
+            $rows[] = [$radioId, $emergencyType, $latitude, $longitude, $triggeredAt];
+        }
+        
+        // Insert emergency alerts and set each radio's status to emergency
+        $stmt = $pdo->prepare("
+            INSERT INTO dmr_emergencies (
+                radio_id, emergency_type, latitude, longitude,
+                triggered_at, status
+            ) VALUES (?, ?, ?, ?, ?, 'active')
+        ");
+        $updateStmt = $pdo->prepare("
+            INSERT INTO dmr_radios (radio_id, status, last_seen)
+            VALUES (?, 'emergency', NOW())
+            ON DUPLICATE KEY UPDATE
+                status = 'emergency',
+                last_seen = NOW()
+        ");
+        
+        $pdo->beginTransaction();
+        foreach ($rows as $row) {
+            $stmt->execute($row);
+            $updateStmt->execute([$row[0]]);
+        }
+        $pdo->commit();
+        
+        logApiRequest(
+            '/emergencies/bulk POST',
+            $authInfo,
+            "EMERGENCY: " . count($rows) . " alerts from radios " . implode(', ', array_unique(array_column($rows, 0)))
+        );
+        
+        sendSuccess(['inserted' => count($rows)]);
+        
+    } elseif ($method === 'POST') {
         // Receive emergency alert
         $data = getJsonInput();
         
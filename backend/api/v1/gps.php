@@ -20,7 +20,58 @@ $method = getRequestMethod();
 try {
     $pdo = getDatabaseConnection();
     
-    if ($method === 'POST') {
+    if ($method === 'POST' && preg_match('/\/gps\/bulk/', $_SERVER['REQUEST_URI'])) {
+        // Receive several GPS positions at once: /gps/bulk
+        $items = getJsonInput();
+        
+        if (empty($items) || !isset($items[0])) {
+            sendError('Request body must be a non-empty array of GPS positions', 400);
+        }
+        
+        // Validate every position before inserting any
+        $rows = [];
+        foreach ($items as $index => $data) {
+            $data = is_array($data) ? $data : [];
+            
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $latitude = Validator::latitude($data['latitude'] ?? null);
+            $longitude = Validator::longitude($data['longitude'] ?? null);
+            $altitude = isset($data['altitude']) ? Validator::integer($data['altitude']) : null;
+            $speed = isset($data['speed']) ? Validator::integer($data['speed'], 0) : null;
+            $heading = isset($data['heading']) ? Validator::integer($data['heading'], 0, 359) : null;
+            $accuracy = isset($data['accuracy']) ? Validator::integer($data['accuracy'], 0) : null;
+            $timestamp = isset($data['timestamp']) ? Validator::datetime($data['timestamp']) : date('Y-m-d H:i:s');
+            
+            if ($radioId === false || $latitude === false || $longitude === false || $timestamp === false) {
+                sendError("Position $index: invalid or missing required fields: radio_id, latitude, longitude, timestamp", 400);
+            }
+            
+            $rows[] = [$radioId, $latitude, $longitude, $altitude, $speed, $heading, $accuracy, $timestamp];
+        }
+        
+        // Insert GPS positions
+        $stmt = $pdo->prepare("
+            INSERT INTO dmr_gps_positions (
+                radio_id, latitude, longitude, altitude,
+                speed, heading, accuracy, timestamp
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ");
+        
+        $pdo->beginTransaction();
+        foreach ($rows as $row) {
+            $stmt->execute($row);
+        }
+        $pdo->commit();
+        
+        logApiRequest(
+            '/gps/bulk POST',
+            $authInfo,
+            count($rows) . " positions"
+        );
+        
+        sendSuccess(['inserted' => count($rows)]);
+        
+    } elseif ($method === 'POST') {
         // Receive GPS position
         $data = getJsonInput();
         
@@ -21,6 +21,53 @@ requireMethod('POST');
 try {
     $pdo = getDatabaseConnection();
     
+    // Update radio status
+    $stmt = $pdo->prepare("
+        INSERT INTO dmr_radios (radio_id, status, last_seen, last_rssi, last_ber)
+        VALUES (?, ?, NOW(), ?, ?)
+        ON DUPLICATE KEY UPDATE
+            status = VALUES(status),
+            last_seen = NOW(),
+            last_rssi = COALESCE(VALUES(last_rssi), last_rssi),
+            last_ber = COALESCE(VALUES(last_ber), last_ber)
+    ");
+    
+    if (preg_match('/\/radio-status\/bulk/', $_SERVER['REQUEST_URI'])) {
+        // Receive several status updates at once: /radio-status/bulk
+        $items = getJsonInput();
+        
+        if (empty($items) || !isset($items[0])) {
+            sendError('Request body must be a non-empty array of status updates', 400);
+        }
+        
+        // Validate every update before writing any
+        $rows = [];
+        foreach ($items as $index => $data) {
+            $data = is_array($data) ? $data : [];
+            
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $status = $data['status'] ?? '';
+            $rssi = isset($data['rssi']) ? Validator::integer($data['rssi']) : null;
+            $ber = isset($data['ber']) ? Validator::float($data['ber'], 0, 100) : null;
+            
+            if ($radioId === false || !Validator::enum($status, ['online', 'offline', 'emergency'])) {
+                sendError("Update $index: invalid radio status. Needs radio_id and a status of online, offline, or emergency", 400);
+            }
+            
+            $rows[] = [$radioId, $status, $rssi, $ber];
+        }
+        
+        $pdo->beginTransaction();
+        foreach ($rows as $row) {
+            $stmt->execute($row);
+        }
+        $pdo->commit();
+        
+        logApiRequest('/radio-status/bulk', $authInfo, count($rows) . " status updates");
+        
+        sendSuccess(['updated' => count($rows)]);
+    }
+    
     $data = getJsonInput();
     
     $radioId = Validator::integer($data['radio_id'] ?? null);
@@ -37,17 +84,6 @@ try {
         sendError('Invalid status. Must be: online, offline, or emergency', 400);
     }
     
-    // Update radio status
-    $stmt = $pdo->prepare("
-        INSERT INTO dmr_radios (radio_id, status, last_seen, last_rssi, last_ber)
-        VALUES (?, ?, NOW(), ?, ?)
-        ON DUPLICATE KEY UPDATE
-            status = VALUES(status),
-            last_seen = NOW(),
-            last_rssi = COALESCE(VALUES(last_rssi), last_rssi),
-            last_ber = COALESCE(VALUES(last_ber), last_ber)
-    ");
-    
     $stmt->execute([$radioId, $status, $rssi, $ber]);
     
     // Log request (only occasionally to avoid spam)
@@ -20,7 +20,59 @@ $method = getRequestMethod();
 try {
     $pdo = getDatabaseConnection();
     
-    if ($method === 'POST') {
+    if ($method === 'POST' && preg_match('/\/sms\/bulk/', $_SERVER['REQUEST_URI'])) {
+        // Receive several incoming SMS at once: /sms/bulk
+        $items = getJsonInput();
+        
+        if (empty($items) || !isset($items[0])) {
+            sendError('Request body must be a non-empty array of SMS messages', 400);
+        }
+        
+        // Validate every message before inserting any
+        $rows = [];
+        foreach ($items as $index => $data) {
+            $data = is_array($data) ? $data : [];
+            
+            $fromRadioId = Validator::integer($data['from_radio_id'] ?? null);
+            $toRadioId = isset($data['to_radio_id']) ? Validator::integer($data['to_radio_id']) : null;
+            $toTalkgroupId = isset($data['to_talkgroup_id']) ? Validator::integer($data['to_talkgroup_id']) : null;
+            $message = Validator::string($data['message'] ?? '', 1, 1000);
+            $timestamp = isset($data['timestamp']) ? Validator::datetime($data['timestamp']) : date('Y-m-d H:i:s');
+            
+            if ($fromRadioId === false || $message === false) {
+                sendError("SMS $index: invalid or missing required fields: from_radio_id, message", 400);
+            }
+            
+            if ($toRadioId === false && $toTalkgroupId === false) {
+                sendError("SMS $index: must specify either to_radio_id or to_talkgroup_id", 400);
+            }
+            
+            $rows[] = [$fromRadioId, $toRadioId, $toTalkgroupId, $message, $timestamp];
+        }
+        
+        // Insert SMS
+        $stmt = $pdo->prepare("
+            INSERT INTO dmr_sms (
+                from_radio_id, to_radio_id, to_talkgroup_id,
+                message, direction, sent_at, status
+            ) VALUES (?, ?, ?, ?, 'incoming', ?, 'delivered')
+        ");
+        
+        $pdo->beginTransaction();
+        foreach ($rows as $row) {
+            $stmt->execute($row);
+        }
+        $pdo->commit();
+        
+        logApiRequest(
+            '/sms/bulk POST',
+            $authInfo,
+            count($rows) . " messages"
+        );
+        
+        sendSuccess(['inserted' => count($rows)]);
+        
+    } elseif ($method === 'POST') {
         // Receive incoming SMS
         $data = getJsonInput();
         
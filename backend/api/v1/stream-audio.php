@@ -29,21 +29,80 @@ if ($_SERVER['REQUEST_METHOD'] !== 'POST') {
     Response::error('Method not allowed', 405);
 }
 
-// Parse JSON body
-$input = json_decode(file_get_contents('php://input'), true);
+$contentType = $_SERVER['CONTENT_TYPE'] ?? '';
 
-// Validate input
-$requiredFields = ['slot', 'radio_id', 'talkgroup_id', 'chunk_data', 'sequence'];
-foreach ($requiredFields as $field) {
-    if (!isset($input[$field])) {
-        Response::error("Missing required field: {$field}", 400);
+if (stripos($contentType, 'application/octet-stream') === 0) {
+    // Raw Opus chunk in the body, metadata in X- headers
+    $headerFields = [
+        'slot' => 'HTTP_X_SLOT',
+        'radio_id' => 'HTTP_X_RADIO_ID',
+        'talkgroup_id' => 'HTTP_X_TG_ID',
+        'sequence' => 'HTTP_X_SEQUENCE',
+    ];
+    $input = [];
+    foreach ($headerFields as $field => $header) {
+        if (!isset($_SERVER[$header])) {
+            Response::error("Missing required field: {$field}", 400);
+        }
+        $input[$field] = $_SERVER[$header];
+    }
+    if (isset($_SERVER['HTTP_X_TIMESTAMP'])) {
+        // Unix epoch seconds from current collectors, ISO 8601 from older ones
+        $input['timestamp'] = is_numeric($_SERVER['HTTP_X_TIMESTAMP'])
+            ? date('Y-m-d H:i:s', (int)$_SERVER['HTTP_X_TIMESTAMP'])
+            : $_SERVER['HTTP_X_TIMESTAMP'];
+    }
+    if (isset($_SERVER['HTTP_X_SAVE_RECORDING'])) {
+        $input['save_recording'] = $_SERVER['HTTP_X_SAVE_RECORDING'] === '1';
+    }
+    
+    $body = file_get_contents('php://input');
+    if ($body === false || $body === '') {
+        Response::error('Missing required field: chunk_data', 400);
     }
+    
+    if (isset($_SERVER['HTTP_X_CHUNK_COUNT'])) {
+        // Batch: big-endian 16-bit length of each chunk, then the chunks
+        $count = (int)$_SERVER['HTTP_X_CHUNK_COUNT'];
+        $offset = $count * 2;
+        if ($count < 1 || strlen($body) < $offset) {
+            Response::error('Invalid chunk batch', 400);
+        }
+        
+        $chunks = [];
+        foreach (array_values(unpack("n{$count}", $body)) as $length) {
+            if ($length === 0 || $offset + $length > strlen($body)) {
+                Response::error('Invalid chunk batch', 400);
+            }
+            $chunks[] = substr($body, $offset, $length);
+            $offset += $length;
+        }
+    } else {
+        $chunks = [$body];
+    }
+} else {
+    // Legacy JSON body with base64-encoded chunk
+    $input = json_decode(file_get_contents('php://input'), true);
+    
+    // Validate input
+    $requiredFields = ['slot', 'radio_id', 'talkgroup_id', 'chunk_data', 'sequence'];
+    foreach ($requiredFields as $field) {
+        if (!isset($input[$field])) {
+            Response::error("Missing required field: {$field}", 400);
+        }
+    }
+    
+    // Decode and validate base64
+    $chunkBinary = base64_decode($input['chunk_data'], true);
+    if ($chunkBinary === false || $chunkBinary === '') {
+        Response::error('Invalid chunk_data (not valid base64)', 400);
+    }
+    $chunks = [$chunkBinary];
 }
 
 $slot = (int)$input['slot'];
 $radio_id = (int)$input['radio_id'];
 $talkgroup_id = (int)$input['talkgroup_id'];
-$chunk_data = $input['chunk_data'];
 $sequence = (int)$input['sequence'];
 $timestamp = $input['timestamp'] ?? date('Y-m-d H:i:s');
 
@@ -52,11 +111,6 @@ if (!in_array($slot, [1, 2])) {
     Response::error('Invalid slot (must be 1 or 2)', 400);
 }
 
-// Validate base64
-if (!base64_decode($chunk_data, true)) {
-    Response::error('Invalid chunk_data (not valid base64)', 400);
-}
-
 try {
     // Buffer directory structure
     $bufferDir = __DIR__ . '/../../tmp/audio_buffers';
@@ -94,15 +148,14 @@ try {
     }
     
     // Chunk file path
-    $chunkFile = $slotDir . "/{$transmissionId}_{$sequence}.opus";
-    
-    // Decode and save chunk
-    $chunkBinary = base64_decode($chunk_data);
-    if ($chunkBinary === false) {
-        Response::error('Failed to decode chunk data', 400);
+    // Save chunks
+    $size = 0;
+    foreach ($chunks as $index => $chunkBinary) {
+        $chunkFile = $slotDir . "/{$transmissionId}_" . ($sequence + $index) . ".opus";
+        file_put_contents($chunkFile, $chunkBinary);
+        $size += strlen($chunkBinary);
     }
-    
-    file_put_contents($chunkFile, $chunkBinary);
+    $lastSequence = $sequence + count($chunks) - 1;
     
     // Update metadata file
     $metaFile = $slotDir . "/current_meta.json";
@@ -111,7 +164,7 @@ try {
         'slot' => $slot,
         'radio_id' => $radio_id,
         'talkgroup_id' => $talkgroup_id,
-        'last_sequence' => $sequence,
+        'last_sequence' => $lastSequence,
         'last_update' => time(),
         'timestamp' => $timestamp
     ];
@@ -166,7 +219,8 @@ try {
         'received' => true,
         'slot' => $slot,
         'sequence' => $sequence,
-        'size' => strlen($chunkBinary)
+        'chunks' => count($chunks),
+        'size' => $size
     ]);
     
 } catch (Exception $e) {
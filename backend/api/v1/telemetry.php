@@ -0,0 +1,116 @@
+<?php
+/**
+ * EasyDispatch API - Telemetry Endpoint
+ * Handles batches of GPS positions and radio status updates
+ */
+
+require_once __DIR__ . '/../middleware/cors.php';
+require_once __DIR__ . '/../config/auth.php';
+require_once __DIR__ . '/../config/database.php';
+require_once __DIR__ . '/../utils/response.php';
+require_once __DIR__ . '/../utils/validator.php';
+require_once __DIR__ . '/../middleware/rate_limiter.php';
+
+// Authenticate
+$authInfo = requireAuth();
+applyRateLimit($authInfo['raspberry_id'], 500); // Same limit as status updates
+
+// Only allow POST
+requireMethod('POST');
+
+try {
+    $pdo = getDatabaseConnection();
+    
+    // Extract action from path: /telemetry/bulk
+    $path = $_SERVER['REQUEST_URI'];
+    if (!preg_match('/\/telemetry\/bulk/', $path)) {
+        sendError('Invalid endpoint. Use /telemetry/bulk', 404);
+    }
+    
+    // Items: {"type": "gps" | "radio_status", "data": {...}}
+    $items = getJsonInput();
+    
+    if (empty($items) || !isset($items[0])) {
+        sendError('Request body must be a non-empty array of telemetry items', 400);
+    }
+    
+    // Validate every item before writing any
+    $positions = [];
+    $statuses = [];
+    foreach ($items as $index => $item) {
+        $type = is_array($item) ? ($item['type'] ?? '') : '';
+        $data = is_array($item) && is_array($item['data'] ?? null) ? $item['data'] : [];
+        
+        if ($type === 'gps') {
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $latitude = Validator::latitude($data['latitude'] ?? null);
+            $longitude = Validator::longitude($data['longitude'] ?? null);
+            $altitude = isset($data['altitude']) ? Validator::integer($data['altitude']) : null;
+            $speed = isset($data['speed']) ? Validator::integer($data['speed'], 0) : null;
+            $heading = isset($data['heading']) ? Validator::integer($data['heading'], 0, 359) : null;
+            $accuracy = isset($data['accuracy']) ? Validator::integer($data['accuracy'], 0) : null;
+            $timestamp = isset($data['timestamp']) ? Validator::datetime($data['timestamp']) : date('Y-m-d H:i:s');
+            
+            if ($radioId === false || $latitude === false || $longitude === false || $timestamp === false) {
+                sendError("Item $index: invalid or missing required GPS fields: radio_id, latitude, longitude, timestamp", 400);
+            }
+            
+            $positions[] = [$radioId, $latitude, $longitude, $altitude, $speed, $heading, $accuracy, $timestamp];
+        
+        } elseif ($type === 'radio_status') {
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $status = $data['status'] ?? '';
+            $rssi = isset($data['rssi']) ? Validator::integer($data['rssi']) : null;
+            $ber = isset($data['ber']) ? Validator::float($data['ber'], 0, 100) : null;
+            
+            if ($radioId === false || !Validator::enum($status, ['online', 'offline', 'emergency'])) {
+                sendError("Item $index: invalid radio status. Needs radio_id and a status of online, offline, or emergency", 400);
+            }
+            
+            $statuses[] = [$radioId, $status, $rssi, $ber];
+        
+        } else {
+            sendError("Item $index: type must be gps or radio_status", 400);
+        }
+    }
+    
+    // Insert GPS positions
+    $gpsStmt = $pdo->prepare("
+        INSERT INTO dmr_gps_positions (
+            radio_id, latitude, longitude, altitude,
+            speed, heading, accuracy, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ");
+    
+    // Update radio status
+    $statusStmt = $pdo->prepare("
+        INSERT INTO dmr_radios (radio_id, status, last_seen, last_rssi, last_ber)
+        VALUES (?, ?, NOW(), ?, ?)
+        ON DUPLICATE KEY UPDATE
+            status = VALUES(status),
+            last_seen = NOW(),
+            last_rssi = COALESCE(VALUES(last_rssi), last_rssi),
+            last_ber = COALESCE(VALUES(last_ber), last_ber)
+    ");
+    
+    $pdo->beginTransaction();
+    foreach ($positions as $row) {
+        $gpsStmt->execute($row);
+    }
+    foreach ($statuses as $row) {
+        $statusStmt->execute($row);
+    }
+    $pdo->commit();
+    
+    logApiRequest(
+        '/telemetry/bulk',
+        $authInfo,
+        count($positions) . " positions, " . count($statuses) . " status updates"
+    );
+    
+    sendSuccess(['positions' => count($positions), 'statuses' => count($statuses)]);
+    
+} catch (PDOException $e) {
+    error_log("Database error in telemetry.php: " . $e->getMessage());
+    sendError('Database error', 500);
+}
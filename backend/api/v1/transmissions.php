@@ -21,6 +21,71 @@ requireMethod('POST');
 try {
     $pdo = getDatabaseConnection();
     
+    if (preg_match('/\/transmissions\/bulk/', $_SERVER['REQUEST_URI'])) {
+        // Log several transmissions without audio at once: /transmissions/bulk
+        $items = getJsonInput();
+        
+        if (empty($items) || !isset($items[0])) {
+            sendError('Request body must be a non-empty array of transmissions', 400);
+        }
+        
+        // Validate every transmission before inserting any
+        $rows = [];
+        foreach ($items as $index => $data) {
+            $data = is_array($data) ? $data : [];
+            
+            $radioId = Validator::integer($data['radio_id'] ?? null);
+            $talkgroupId = isset($data['talkgroup_id']) ? Validator::integer($data['talkgroup_id']) : null;
+            $timeslot = Validator::integer($data['timeslot'] ?? null, 1, 2);
+            $startTime = Validator::datetime($data['start_time'] ?? '');
+            $endTime = isset($data['end_time']) ? Validator::datetime($data['end_time']) : null;
+            $duration = isset($data['duration']) ? Validator::integer($data['duration'], 0) : null;
+            $rssi = isset($data['rssi']) ? Validator::integer($data['rssi']) : null;
+            $ber = isset($data['ber']) ? Validator::float($data['ber'], 0, 100) : null;
+            
+            if ($radioId === false || $timeslot === false || $startTime === false) {
+                sendError("Transmission $index: invalid or missing required fields: radio_id, timeslot, start_time", 400);
+            }
+            
+            $rows[] = [$radioId, $talkgroupId, $timeslot, $startTime, $endTime, $duration, $rssi, $ber];
+        }
+        
+        // Insert transmissions and set each radio online
+        $stmt = $pdo->prepare("
+            INSERT INTO dmr_transmissions (
+                radio_id, talkgroup_id, timeslot, transmission_type,
+                start_time, end_time, duration, rssi, ber
+            ) VALUES (
+                ?, ?, ?, 'voice',
+                ?, ?, ?, ?, ?
+            )
+        ");
+        $updateStmt = $pdo->prepare("
+            INSERT INTO dmr_radios (radio_id, status, last_seen, last_rssi, last_ber)
+            VALUES (?, 'online', NOW(), ?, ?)
+            ON DUPLICATE KEY UPDATE
+                status = 'online',
+                last_seen = NOW(),
+                last_rssi = COALESCE(VALUES(last_rssi), last_rssi),
+                last_ber = COALESCE(VALUES(last_ber), last_ber)
+        ");
+        
+        $pdo->beginTransaction();
+        foreach ($rows as $row) {
+            $stmt->execute($row);
+            $updateStmt->execute([$row[0], $row[6], $row[7]]);
+        }
+        $pdo->commit();
+        
+        logApiRequest(
+            '/transmissions/bulk',
+            $authInfo,
+            count($rows) . " transmissions"
+        );
+        
+        sendSuccess(['inserted' => count($rows)]);
+    }
+    
     // Get form data
     $radioId = Validator::integer($_POST['radio_id'] ?? null);
     $talkgroupId = isset($_POST['talkgroup_id']) ? Validator::integer($_POST['talkgroup_id']) : null;
@@ -6,20 +6,28 @@ Main package for DMR traffic monitoring and data collection
 __version__ = "1.0.0"
 __author__ = "EasyDispatch Team"
 
-from .dmr_monitor import DMRMonitor
-from .audio_capture import AudioCapture
-from .audio_streamer import AudioStreamer
-from .data_parser import DataParser
-from .api_client import APIClient
-from .command_handler import CommandHandler
-from .display_manager import DisplayManager
+# Submodule providing each public class; imported on first access so a
+# process only pays for the components it uses
+_MODULES = {
+    'DMRMonitor': 'dmr_monitor',
+    'AudioCapture': 'audio_capture',
+    'AudioStreamer': 'audio_streamer',
+    'DataParser': 'data_parser',
+    'APIClient': 'api_client',
+    'CommandHandler': 'command_handler',
+    'DisplayManager': 'display_manager',
+    'Scheduler': 'scheduler',
+}
 
-__all__ = [
-    'DMRMonitor',
-    'AudioCapture',
-    'AudioStreamer',
-    'DataParser',
-    'APIClient',
-    'CommandHandler',
-    'DisplayManager'
-]
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    """Import the submodule providing name on first access"""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    from importlib import import_module
+    value = getattr(import_module(f'.{_MODULES[name]}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,107 @@
+"""
+CPU Affinity Module
+Reserves a CPU core for DMR monitoring and keeps all other work off it
+"""
+
+import os
+import logging
+from threading import get_native_id
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cores and nice value for everything but the pinned threads (None until a core is reserved)
+_shared_cpus = None
+_shared_nice = 0
+
+
+def reserve_cpu(cpu: int) -> bool:
+    """
+    Move the calling thread off one CPU core
+    
+    Threads and subprocesses started afterwards by the calling thread
+    inherit the remaining cores. Threads pinned to the reserved core with
+    pin_current_thread() should call release_current_thread() in any
+    thread they start, and pass subprocess_preexec_fn() to subprocesses.
+    
+    Args:
+        cpu: CPU core number to reserve
+    
+    Returns:
+        True if the core was reserved
+    """
+    global _shared_cpus, _shared_nice
+    try:
+        allowed = os.sched_getaffinity(0)
+        cpus = allowed - {cpu}
+        if cpu not in allowed or not cpus:
+            return False
+        # On Linux, pid 0 addresses the calling thread only
+        os.sched_setaffinity(0, cpus)
+        _shared_nice = os.getpriority(os.PRIO_PROCESS, get_native_id())
+    except (AttributeError, OSError) as e:
+        logger.debug(f"CPU {cpu} not reserved: {e}")
+        return False
+    
+    _shared_cpus = cpus
+    return True
+
+
+def pin_current_thread(cpus: set, niceness: int = 0) -> bool:
+    """
+    Restrict the calling thread to some CPU cores and adjust its priority
+    
+    Raising priority (negative niceness) needs CAP_SYS_NICE and is skipped
+    without it.
+    
+    Args:
+        cpus: CPU core numbers the thread may run on
+        niceness: Nice value to apply (0 leaves the priority unchanged)
+    
+    Returns:
+        True if the CPU affinity was applied
+    """
+    try:
+        os.sched_setaffinity(0, cpus)
+    except (AttributeError, OSError) as e:
+        logger.debug(f"CPU affinity not applied: {e}")
+        return False
+    
+    if niceness:
+        try:
+            os.setpriority(os.PRIO_PROCESS, get_native_id(), niceness)
+        except (AttributeError, OSError) as e:
+            logger.debug(f"Thread priority not changed: {e}")
+    
+    return True
+
+
+def release_current_thread():
+    """
+    Move the calling thread back to the shared cores and priority
+    
+    Does nothing unless a core is reserved. Safe to call in a forked child
+    before exec, as it neither logs nor takes locks.
+    """
+    if _shared_cpus is None:
+        return
+    
+    try:
+        os.sched_setaffinity(0, _shared_cpus)
+    except OSError:
+        pass
+    try:
+        os.setpriority(os.PRIO_PROCESS, get_native_id(), _shared_nice)
+    except OSError:
+        pass  # Restoring a raised priority needs CAP_SYS_NICE
+
+
+def subprocess_preexec_fn() -> Optional[Callable]:
+    """
+    Get a preexec_fn that starts subprocesses on the shared cores
+    
+    Returns:
+        release_current_thread while a core is reserved, otherwise None so
+        subprocesses keep the faster spawn path
+    """
+    return release_current_thread if _shared_cpus is not None else None
@@ -4,21 +4,199 @@ Handles communication with the hosting backend API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import os
+import socket
 import time
 import json
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple, Union, Callable, NamedTuple
 from datetime import datetime
-from queue import Queue, Empty
-from threading import Thread, Event
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty, Full
+from threading import Thread, Event, Lock
+
+from .affinity import release_current_thread
 
 logger = logging.getLogger(__name__)
 
+# Try to import orjson for faster JSON serialization (optional)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# Try to import requests-toolbelt for streaming multipart uploads (optional)
+try:
+    from requests_toolbelt import MultipartEncoder
+    MULTIPART_ENCODER_AVAILABLE = True
+except ImportError:
+    MULTIPART_ENCODER_AVAILABLE = False
+
+# Wakes the offline queue processor on shutdown
+_QUEUE_SENTINEL = object()
+
+
+def _format_datetime(dt: Optional[datetime]) -> Optional[str]:
+    """Format datetime for API (YYYY-MM-DD HH:MM:SS)"""
+    return dt.isoformat(' ', 'seconds') if dt else None
+
+
+def _format_timestamp(record: Dict) -> Optional[str]:
+    """Format a record's timestamp (datetime) or timestamp_ns (epoch ns, from DataParser) for API"""
+    if record.get('timestamp_ns') is not None:
+        return _format_datetime(datetime.fromtimestamp(record['timestamp_ns'] // 1_000_000_000))
+    return _format_datetime(record.get('timestamp'))
+
+
+def _transmission_fields(transmission: Dict) -> Dict:
+    """Build API payload for a voice transmission"""
+    return {
+        'radio_id': transmission.get('radio_id'),
+        'talkgroup_id': transmission.get('destination_id'),
+        'timeslot': transmission.get('slot'),
+        'start_time': _format_datetime(transmission.get('start_time')),
+        'end_time': _format_datetime(transmission.get('end_time')),
+        'duration': transmission.get('duration'),
+        'rssi': transmission.get('rssi'),
+        'ber': transmission.get('ber'),
+    }
+
+
+def _sms_fields(sms: Dict) -> Dict:
+    """Build API payload for an SMS message"""
+    return {
+        'from_radio_id': sms.get('from_radio_id'),
+        'to_radio_id': sms.get('to_radio_id'),
+        'to_talkgroup_id': sms.get('to_talkgroup_id'),
+        'message': sms.get('message'),
+        'timestamp': _format_timestamp(sms),
+    }
+
+
+def _gps_fields(gps: Dict) -> Dict:
+    """Build API payload for a GPS position"""
+    return {
+        'radio_id': gps.get('radio_id'),
+        'latitude': gps.get('latitude'),
+        'longitude': gps.get('longitude'),
+        'altitude': gps.get('altitude'),
+        'speed': gps.get('speed'),
+        'heading': gps.get('heading'),
+        'accuracy': gps.get('accuracy'),
+        'timestamp': _format_timestamp(gps),
+    }
+
+
+def _emergency_fields(emergency: Dict) -> Dict:
+    """Build API payload for an emergency alert"""
+    return {
+        'radio_id': emergency.get('radio_id'),
+        'emergency_type': emergency.get('emergency_type'),
+        'latitude': emergency.get('latitude'),
+        'longitude': emergency.get('longitude'),
+        'triggered_at': _format_datetime(emergency.get('triggered_at')),
+    }
+
+
+def _radio_status_fields(status: Dict) -> Dict:
+    """Build API payload for a radio status update"""
+    return {
+        'radio_id': status.get('radio_id'),
+        'status': status.get('status'),
+        'rssi': status.get('rssi'),
+        'ber': status.get('ber'),
+    }
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter disabling Nagle's algorithm and enabling TCP keep-alive"""
+    
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+    
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+class _TokenBucket:
+    """Token bucket limiting the rate of requests across threads"""
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize token bucket
+        
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            burst: Maximum number of tokens
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = Lock()
+    
+    def acquire(self):
+        """Take one token, waiting until one is available"""
+        if self.rate <= 0:
+            return
+        
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+
+class _Endpoint(NamedTuple):
+    """API endpoint used by APIClient._post"""
+    path: str
+    fields: Callable[[Dict], Dict]
+    label: str
+    queue_on_failure: bool
+    log_level: Optional[int]
+
+
+# Record kinds posted through APIClient._post
+_ENDPOINTS = {
+    'transmission': _Endpoint('transmissions', _transmission_fields, 'Transmission', True, logging.INFO),
+    'sms': _Endpoint('sms', _sms_fields, 'SMS', True, logging.INFO),
+    'gps': _Endpoint('gps', _gps_fields, 'GPS position', True, logging.INFO),
+    'emergency': _Endpoint('emergencies', _emergency_fields, 'Emergency', True, logging.WARNING),
+    'radio_status': _Endpoint('radio-status', _radio_status_fields, 'Radio status', False, None),
+}
+
 
 class APIClient:
     """Client for communicating with EasyDispatch backend API"""
     
+    # Upper bound in seconds for offline queue retry backoff
+    MAX_RETRY_BACKOFF = 300
+    
+    # Responses meaning the server has no bulk endpoint (other failures may be transient)
+    BULK_UNSUPPORTED_STATUSES = (404, 405)
+    
     def __init__(self, config: dict):
         """
         Initialize API Client
@@ -32,12 +210,59 @@ class APIClient:
         self.retry_attempts = config.get('retry_attempts', 3)
         self.raspberry_id = config.get('raspberry_id', 'UNKNOWN')
         
+        # Request URLs derived from the endpoint
+        self._urls = {kind: f"{self.endpoint}/{endpoint.path}" for kind, endpoint in _ENDPOINTS.items()}
+        self._bulk_urls = {kind: f"{url}/bulk" for kind, url in self._urls.items()}
+        self._telemetry_url = f"{self.endpoint}/telemetry/bulk"
+        self._commands_url = f"{self.endpoint}/commands?raspberry_id={self.raspberry_id}"
+        self._radios_url = f"{self.endpoint}/radios"
+        self._command_results_url = f"{self.endpoint}/commands/results/batch"
+        
+        # Persistent HTTP session (keep-alive + connection pooling)
+        self.session = requests.Session()
+        pool_maxsize = 16
+        adapter = _SocketOptionsAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Authorization': f'Bearer {self.api_key}'})
+        self._last_ok = None  # time.monotonic() of the last successful request
+        
         # Offline queue for failed requests
-        self.offline_queue = Queue()
-        self.queue_file = Path('/var/lib/easydispatch/offline_queue.json')
+        self.offline_queue = Queue(maxsize=config.get('max_offline_queue', 5000))
+        self.dropped_items = 0
+        self.queue_file = Path('/var/lib/easydispatch/offline_queue.jsonl')
+        self.legacy_queue_file = Path('/var/lib/easydispatch/offline_queue.json')
         
-        # Background thread for queue processing
+        # Append-only journal backing the offline queue
+        self.journal_max_bytes = config.get('queue_journal_max_bytes', 8 * 1024 * 1024)
+        self._journal = None
+        self._journal_bytes = 0
+        self._journal_lock = Lock()
+        
+        # Offline queue batching
+        self.max_batch = config.get('queue_max_batch', 100)
+        self.dispatch_interval = config.get('queue_dispatch_interval', 2)
+        self.bulk_supported = True
+        self.command_results_batch_supported = True
+        self._unposted_command_results = []  # (command_id, status, error_message, posts tried)
+        
+        # Parallel uploads of queued items, bounded by the connection pool
+        # (workers may be started from the DMR event thread, so leave its core)
+        self.upload_workers = max(1, min(config.get('queue_upload_workers', 4), pool_maxsize))
+        self._upload_executor = ThreadPoolExecutor(max_workers=self.upload_workers,
+                                                   thread_name_prefix='queue-upload',
+                                                   initializer=release_current_thread)
+        self._rate_limiter = _TokenBucket(config.get('queue_rate_limit', 5), self.upload_workers)
+        
+        # GPS positions and radio status updates are buffered and flushed in bulk
+        self.telemetry_flush_interval = config.get('telemetry_flush_interval', 10)
+        self._telemetry_buffer = deque()
+        self._telemetry_lock = Lock()
+        self.telemetry_bulk_supported = True
+        
+        # Background threads for queue processing and telemetry flushing
         self.queue_thread = None
+        self.telemetry_thread = None
         self.stop_event = Event()
         
         # Load offline queue from disk
@@ -52,13 +277,40 @@ class APIClient:
             self.queue_thread = Thread(target=self._process_offline_queue, daemon=True)
             self.queue_thread.start()
             logger.info("Started offline queue processor")
+        
+        if self.telemetry_thread is None or not self.telemetry_thread.is_alive():
+            self.telemetry_thread = Thread(target=self._process_telemetry, daemon=True)
+            self.telemetry_thread.start()
     
     def stop_queue_processor(self):
         """Stop background queue processor"""
         if self.queue_thread and self.queue_thread.is_alive():
             self.stop_event.set()
+            try:
+                self.offline_queue.put_nowait(_QUEUE_SENTINEL)
+            except Full:
+                pass  # Processor is not blocked waiting for items
             self.queue_thread.join(timeout=5)
             logger.info("Stopped offline queue processor")
+        
+        if self.telemetry_thread and self.telemetry_thread.is_alive():
+            self.stop_event.set()
+            self.telemetry_thread.join(timeout=5)
+        
+        # Deliver (or queue) whatever telemetry is still buffered
+        self.flush_telemetry()
+        
+        self.close()
+    
+    def close(self):
+        """Close the HTTP session and the offline queue journal"""
+        self._upload_executor.shutdown(wait=True)
+        self.session.close()
+        
+        with self._journal_lock:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
     
     def post_transmission(self, transmission: Dict, audio_file: Optional[Path] = None) -> bool:
         """
@@ -66,57 +318,12 @@ class APIClient:
         
         Args:
             transmission: Transmission data dictionary
-            audio_file: Path to audio file (optional)
+            audio_file: Path to audio file or in-memory recording (optional)
             
         Returns:
             True if successful, False otherwise
         """
-        endpoint = f"{self.endpoint}/transmissions"
-        
-        data = {
-            'radio_id': transmission.get('radio_id'),
-            'talkgroup_id': transmission.get('destination_id'),
-            'timeslot': transmission.get('slot'),
-            'start_time': self._format_datetime(transmission.get('start_time')),
-            'end_time': self._format_datetime(transmission.get('end_time')),
-            'duration': transmission.get('duration'),
-            'rssi': transmission.get('rssi'),
-            'ber': transmission.get('ber'),
-        }
-        
-        files = None
-        if audio_file and audio_file.exists():
-            files = {'audio': open(audio_file, 'rb')}
-        
-        try:
-            response = self._make_request('POST', endpoint, data=data, files=files)
-            
-            if files:
-                files['audio'].close()
-            
-            if response and response.get('success'):
-                logger.info(f"Transmission posted successfully: {response.get('transmission_id')}")
-                
-                # Delete audio file from Raspberry after successful upload
-                if audio_file and audio_file.exists():
-                    try:
-                        audio_file.unlink()
-                        logger.info(f"Audio file deleted from Raspberry: {audio_file}")
-                    except Exception as e:
-                        logger.error(f"Failed to delete audio file {audio_file}: {e}")
-                
-                return True
-            else:
-                logger.error(f"Failed to post transmission: {response}")
-                self._queue_for_retry('transmission', data, audio_file)
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error posting transmission: {e}", exc_info=True)
-            if files:
-                files['audio'].close()
-            self._queue_for_retry('transmission', data, audio_file)
-            return False
+        return self._post('transmission', transmission, audio_file=audio_file)
     
     def post_sms(self, sms: Dict) -> bool:
         """
@@ -128,58 +335,19 @@ class APIClient:
         Returns:
             True if successful, False otherwise
         """
-        endpoint = f"{self.endpoint}/sms"
-        
-        data = {
-            'from_radio_id': sms.get('from_radio_id'),
-            'to_radio_id': sms.get('to_radio_id'),
-            'to_talkgroup_id': sms.get('to_talkgroup_id'),
-            'message': sms.get('message'),
-            'timestamp': self._format_datetime(sms.get('timestamp')),
-        }
-        
-        response = self._make_request('POST', endpoint, data=data)
-        
-        if response and response.get('success'):
-            logger.info(f"SMS posted successfully: {response.get('sms_id')}")
-            return True
-        else:
-            logger.error(f"Failed to post SMS: {response}")
-            self._queue_for_retry('sms', data)
-            return False
+        return self._post('sms', sms)
     
     def post_gps(self, gps: Dict) -> bool:
         """
-        Post GPS position to API
+        Buffer GPS position for the next telemetry flush
         
         Args:
             gps: GPS data dictionary
             
         Returns:
-            True if successful, False otherwise
+            True once buffered
         """
-        endpoint = f"{self.endpoint}/gps"
-        
-        data = {
-            'radio_id': gps.get('radio_id'),
-            'latitude': gps.get('latitude'),
-            'longitude': gps.get('longitude'),
-            'altitude': gps.get('altitude'),
-            'speed': gps.get('speed'),
-            'heading': gps.get('heading'),
-            'accuracy': gps.get('accuracy'),
-            'timestamp': self._format_datetime(gps.get('timestamp')),
-        }
-        
-        response = self._make_request('POST', endpoint, data=data)
-        
-        if response and response.get('success'):
-            logger.info(f"GPS position posted successfully")
-            return True
-        else:
-            logger.error(f"Failed to post GPS: {response}")
-            self._queue_for_retry('gps', data)
-            return False
+        return self._buffer_telemetry('gps', gps)
     
     def post_emergency(self, emergency: Dict) -> bool:
         """
@@ -191,29 +359,11 @@ class APIClient:
         Returns:
             True if successful, False otherwise
         """
-        endpoint = f"{self.endpoint}/emergencies"
-        
-        data = {
-            'radio_id': emergency.get('radio_id'),
-            'emergency_type': emergency.get('emergency_type'),
-            'latitude': emergency.get('latitude'),
-            'longitude': emergency.get('longitude'),
-            'triggered_at': self._format_datetime(emergency.get('triggered_at')),
-        }
-        
-        response = self._make_request('POST', endpoint, data=data)
-        
-        if response and response.get('success'):
-            logger.warning(f"Emergency posted successfully: {response.get('emergency_id')}")
-            return True
-        else:
-            logger.error(f"Failed to post emergency: {response}")
-            self._queue_for_retry('emergency', data)
-            return False
+        return self._post('emergency', emergency)
     
     def post_radio_status(self, radio_id: int, status: str, rssi: Optional[int] = None, ber: Optional[float] = None) -> bool:
         """
-        Post radio status update to API
+        Buffer radio status update for the next telemetry flush
         
         Args:
             radio_id: DMR radio ID
@@ -222,24 +372,86 @@ class APIClient:
             ber: Bit error rate (optional)
             
         Returns:
-            True if successful, False otherwise
+            True once buffered
+        """
+        return self._buffer_telemetry('radio_status', {'radio_id': radio_id, 'status': status, 'rssi': rssi, 'ber': ber})
+    
+    def enqueue(self, kind: str, record: Dict, audio_file: Optional[Path] = None):
         """
-        endpoint = f"{self.endpoint}/radio-status"
+        Hand a record to the background senders without waiting for the API
         
-        data = {
-            'radio_id': radio_id,
-            'status': status,
-            'rssi': rssi,
-            'ber': ber,
-        }
+        Records are added to the offline queue, whose processor posts them
+        in batches to the bulk endpoints. Emergencies and records with audio
+        are posted right away on the upload pool instead (emergencies skip
+        the queue's backlog and rate limit, and in-memory recordings are not
+        written to disk first); a failed post is queued for retry as usual.
         
-        response = self._make_request('POST', endpoint, data=data)
+        Args:
+            kind: Record kind (transmission, sms, gps, emergency)
+            record: Record data dictionary
+            audio_file: Path to audio file or in-memory recording (optional)
+        """
+        if audio_file is not None or kind == 'emergency':
+            self._upload_executor.submit(self._post, kind, record, audio_file)
+            return
         
-        if response and response.get('success'):
+        data = {key: value for key, value in _ENDPOINTS[kind].fields(record).items() if value is not None}
+        self._queue_item(kind, data)
+    
+    def flush_telemetry(self) -> bool:
+        """
+        Send buffered GPS positions and radio status updates in one request
+        
+        Falls back to per-item requests when the telemetry bulk endpoint is
+        not available. GPS positions that cannot be delivered are added to
+        the offline queue; radio status updates are dropped as before.
+        
+        Returns:
+            True if everything buffered was delivered, False otherwise
+        """
+        with self._telemetry_lock:
+            items = list(self._telemetry_buffer)
+            self._telemetry_buffer.clear()
+        
+        if not items:
             return True
-        else:
-            logger.error(f"Failed to post radio status: {response}")
-            return False
+        
+        if self.telemetry_bulk_supported:
+            status = self._post_bulk(self._telemetry_url, items)
+            if 200 <= status < 300:
+                logger.debug(f"Telemetry batch posted successfully ({len(items)} items)")
+                return True
+            if status in self.BULK_UNSUPPORTED_STATUSES:
+                logger.info("Telemetry bulk endpoint not available, using per-item requests")
+                self.telemetry_bulk_supported = False
+        
+        failed = [item for item in items if not self._send(item['type'], item['data'])]
+        
+        for item in failed:
+            if _ENDPOINTS[item['type']].queue_on_failure:
+                self._queue_for_retry(item['type'], item['data'])
+        
+        return not failed
+    
+    def post_binary(self, path: str, data: bytes, headers: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        POST raw bytes to API as application/octet-stream
+        
+        The request is attempted once; callers handle their own retries.
+        
+        Args:
+            path: Endpoint path (e.g. /stream-audio)
+            data: Request body
+            headers: Extra request headers (e.g. metadata)
+            
+        Returns:
+            Response JSON or None
+        """
+        request_headers = {'Content-Type': 'application/octet-stream'}
+        if headers:
+            request_headers.update(headers)
+        
+        return self._make_request('POST', f"{self.endpoint}{path}", body=data, headers=request_headers)
     
     def get_pending_commands(self) -> List[Dict]:
         """
@@ -248,9 +460,7 @@ class APIClient:
         Returns:
             List of command dictionaries
         """
-        endpoint = f"{self.endpoint}/commands?raspberry_id={self.raspberry_id}"
-        
-        response = self._make_request('GET', endpoint)
+        response = self._make_request('GET', self._commands_url)
         
         if response and 'commands' in response:
             commands = response['commands']
@@ -287,6 +497,48 @@ class APIClient:
             logger.error(f"Failed to post command result: {response}")
             return False
     
+    def post_command_results(self, results: List[Tuple[int, str, Optional[str]]]) -> bool:
+        """
+        Post the results of several commands in one request
+        
+        Falls back to post_command_result per command when the batch
+        endpoint is not available. Results that fail to post are sent
+        again with the next call, up to retry_attempts tries each.
+        
+        Args:
+            results: (command_id, status, error_message) per command
+            
+        Returns:
+            True if all results, including earlier unposted ones, were posted
+        """
+        pending = self._unposted_command_results + [(*result, 0) for result in results]
+        self._unposted_command_results = []
+        if not pending:
+            return True
+        
+        if self.command_results_batch_supported and len(pending) > 1:
+            data = {'results': [{'id': command_id, 'status': status, 'error_message': error_message}
+                                for command_id, status, error_message, _ in pending]}
+            status = self._post_bulk(self._command_results_url, data)
+            if 200 <= status < 300:
+                logger.info(f"Command results posted: {len(pending)} commands")
+                return True
+            if status in self.BULK_UNSUPPORTED_STATUSES:
+                logger.info("Command results batch endpoint not available, using per-command requests")
+                self.command_results_batch_supported = False
+        
+        posted_all = True
+        for command_id, status, error_message, tries in pending:
+            if self.post_command_result(command_id, status, error_message):
+                continue
+            posted_all = False
+            if tries + 1 < self.retry_attempts:
+                self._unposted_command_results.append((command_id, status, error_message, tries + 1))
+            else:
+                logger.error(f"Dropped result of command {command_id} after {tries + 1} failed posts")
+        
+        return posted_all
+    
     def check_api_connection(self) -> bool:
         """
         Check if API is reachable
@@ -295,13 +547,42 @@ class APIClient:
             True if API is connected, False otherwise
         """
         try:
-            endpoint = f"{self.endpoint}/radios"
-            response = self._make_request('GET', endpoint)
+            response = self._make_request('GET', self._radios_url)
             return response is not None
         except Exception as e:
             logger.debug(f"API connection check failed: {e}")
             return False
     
+    def check_connections(self) -> Tuple[bool, bool]:
+        """
+        Check API and database connectivity with a single request
+        
+        Returns:
+            (api_connected, db_connected), as check_api_connection and
+            check_db_connection would report them
+        """
+        try:
+            response = self._make_request('GET', self._radios_url)
+            return response is not None, response is not None and 'radios' in response
+        except Exception as e:
+            logger.debug(f"Connection check failed: {e}")
+            return False, False
+    
+    def succeeded_within(self, seconds: float) -> bool:
+        """
+        Check whether any API request succeeded in the last seconds
+        
+        Every endpoint is served from the database, so a recent success
+        shows both the API and the database are reachable.
+        
+        Args:
+            seconds: Time window in seconds
+            
+        Returns:
+            True if a request succeeded within the window
+        """
+        return self._last_ok is not None and time.monotonic() - self._last_ok < seconds
+    
     def check_db_connection(self) -> bool:
         """
         Check if database is accessible through API
@@ -318,178 +599,512 @@ class APIClient:
         # We check DB connectivity through the API
         # If the API can respond with valid data structure, it means DB is accessible
         try:
-            endpoint = f"{self.endpoint}/radios"
-            response = self._make_request('GET', endpoint)
+            response = self._make_request('GET', self._radios_url)
             # If we get a valid response with expected structure, DB is accessible
             return response is not None and 'radios' in response
         except Exception as e:
             logger.debug(f"DB connection check failed: {e}")
             return False
     
-    def _make_request(self, method: str, url: str, data: Optional[Dict] = None, files: Optional[Dict] = None) -> Optional[Dict]:
+    def _make_request(self, method: str, url: str, data: Optional[Union[Dict, List]] = None,
+                      audio_file: Optional[Path] = None,
+                      body: Optional[bytes] = None, headers: Optional[Dict] = None) -> Optional[Dict]:
         """
-        Make HTTP request with retry logic
+        Make one HTTP request
+        
+        Failures are not retried here, so callers are never held up by
+        backoff; the offline queue, stream senders and command polling
+        retry on their own schedule.
         
         Args:
             method: HTTP method (GET/POST)
             url: Request URL
             data: Request data
-            files: Files to upload
+            audio_file: Audio file to upload as multipart form data
+            body: Raw request body, sent instead of JSON data
+            headers: Extra request headers
             
         Returns:
             Response JSON or None
         """
-        headers = {
-            'Authorization': f'Bearer {self.api_key}'
-        }
+        if method not in ('GET', 'POST'):
+            logger.error(f"Unsupported method: {method}")
+            return None
         
-        for attempt in range(self.retry_attempts):
-            try:
-                if method == 'GET':
-                    response = requests.get(url, headers=headers, timeout=self.timeout)
-                elif method == 'POST':
-                    if files:
-                        response = requests.post(url, headers=headers, data=data, files=files, timeout=self.timeout)
-                    else:
-                        headers['Content-Type'] = 'application/json'
-                        response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
-                else:
-                    logger.error(f"Unsupported method: {method}")
-                    return None
+        if data is not None and not audio_file and body is None:
+            body = _json_dumps(data)
+            headers = {'Content-Type': 'application/json'}
+        
+        # Authorization header is set once on the session
+        try:
+            if audio_file:
+                response = self._post_audio(url, data, audio_file)
+            else:
+                response = self.session.request(method, url, data=body, headers=headers, timeout=self.timeout)
+            
+            # Record creation endpoints answer 201
+            if 200 <= response.status_code < 300:
+                self._last_ok = time.monotonic()
+                return _json_loads(response.content)
+            elif response.status_code == 401:
+                logger.error("API authentication failed (401)")
+            else:
+                logger.warning(f"API request failed: {response.status_code} - {response.text}")
                 
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 401:
-                    logger.error("API authentication failed (401)")
-                    return None
-                else:
-                    logger.warning(f"API request failed: {response.status_code} - {response.text}")
-                    
-            except requests.exceptions.Timeout:
-                logger.warning(f"Request timeout (attempt {attempt + 1}/{self.retry_attempts})")
-            except requests.exceptions.ConnectionError:
-                logger.warning(f"Connection error (attempt {attempt + 1}/{self.retry_attempts})")
+        except requests.exceptions.Timeout:
+            logger.warning(f"Request timeout: {method} {url}")
+        except requests.exceptions.ConnectionError:
+            logger.warning(f"Connection error: {method} {url}")
+        except Exception as e:
+            logger.error(f"Request error: {e}", exc_info=True)
+        
+        return None
+    
+    def _post_bulk(self, url: str, data: Union[Dict, List]) -> int:
+        """
+        POST a bulk or batch request once
+        
+        Args:
+            url: Request URL
+            data: Request data
+            
+        Returns:
+            HTTP status code, or 0 if no response was received
+        """
+        try:
+            response = self.session.post(url, data=_json_dumps(data), headers={'Content-Type': 'application/json'},
+                                         timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Bulk request failed: {e}")
+            return 0
+        
+        if 200 <= response.status_code < 300:
+            self._last_ok = time.monotonic()
+        else:
+            logger.warning(f"Bulk request failed: {response.status_code} - {response.text}")
+        return response.status_code
+    
+    def _post(self, kind: str, record: Dict, audio_file: Optional[Path] = None) -> bool:
+        """
+        Build the API payload for a record and POST it
+        
+        Failed records of queueable kinds are added to the offline queue.
+        
+        Args:
+            kind: Record kind (key of _ENDPOINTS)
+            record: Record data dictionary
+            audio_file: Path to audio file (optional)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        # Omit unset fields; the API treats missing and null alike
+        data = {key: value for key, value in _ENDPOINTS[kind].fields(record).items() if value is not None}
+        
+        if audio_file and not audio_file.exists():
+            audio_file = None
+        
+        if self._send(kind, data, audio_file):
+            return True
+        
+        if _ENDPOINTS[kind].queue_on_failure:
+            self._queue_for_retry(kind, data, audio_file)
+        return False
+    
+    def _buffer_telemetry(self, kind: str, record: Dict) -> bool:
+        """
+        Build the API payload for a telemetry record and add it to the buffer
+        
+        Args:
+            kind: Record kind (gps or radio_status)
+            record: Record data dictionary
+            
+        Returns:
+            True once buffered
+        """
+        data = {key: value for key, value in _ENDPOINTS[kind].fields(record).items() if value is not None}
+        
+        with self._telemetry_lock:
+            self._telemetry_buffer.append({'type': kind, 'data': data})
+        return True
+    
+    def _process_telemetry(self):
+        """Flush the telemetry buffer every telemetry_flush_interval seconds"""
+        while not self.stop_event.wait(self.telemetry_flush_interval):
+            try:
+                self.flush_telemetry()
             except Exception as e:
-                logger.error(f"Request error: {e}", exc_info=True)
+                logger.error(f"Error flushing telemetry: {e}", exc_info=True)
+    
+    def _send(self, kind: str, data: Dict, audio_file: Optional[Path] = None) -> bool:
+        """
+        POST a prepared payload, deleting the audio file after a successful upload
+        
+        Args:
+            kind: Record kind (key of _ENDPOINTS)
+            data: API payload
+            audio_file: Path to audio file (optional)
             
-            # Wait before retry
-            if attempt < self.retry_attempts - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
+        Returns:
+            True if successful, False otherwise
+        """
+        endpoint = _ENDPOINTS[kind]
         
-        return None
+        try:
+            response = self._make_request('POST', self._urls[kind], data=data, audio_file=audio_file)
+        except Exception as e:
+            logger.error(f"Error posting {endpoint.label}: {e}", exc_info=True)
+            return False
+        
+        if not (response and response.get('success')):
+            logger.error(f"Failed to post {endpoint.label}: {response}")
+            return False
+        
+        if endpoint.log_level is not None:
+            record_id = response.get(f"{kind}_id")
+            logger.log(endpoint.log_level, f"{endpoint.label} posted successfully"
+                                           + (f": {record_id}" if record_id else ""))
+        
+        # Delete audio file from Raspberry after successful upload
+        if audio_file and audio_file.exists():
+            try:
+                audio_file.unlink()
+                logger.info(f"Audio file deleted from Raspberry: {audio_file}")
+            except Exception as e:
+                logger.error(f"Failed to delete audio file {audio_file}: {e}")
+        
+        return True
+    
+    def _post_audio(self, url: str, data: Dict, audio_file: Path) -> requests.Response:
+        """
+        POST form data with an audio file attachment
+        
+        The multipart body is streamed from disk when requests-toolbelt is
+        available instead of being built in memory.
+        
+        Args:
+            url: Request URL
+            data: Form fields
+            audio_file: Audio file to upload
+            
+        Returns:
+            HTTP response
+        """
+        with audio_file.open('rb') as f:
+            # Name the part explicitly: in-memory recordings have no file name,
+            # and the backend takes the stored file's extension from it
+            audio_part = (audio_file.name, f, f"audio/{audio_file.suffix.lstrip('.')}")
+            
+            if MULTIPART_ENCODER_AVAILABLE:
+                fields = {key: str(value) for key, value in data.items() if value is not None}
+                fields['audio'] = audio_part
+                encoder = MultipartEncoder(fields=fields)
+                return self.session.post(url, data=encoder, headers={'Content-Type': encoder.content_type},
+                                         timeout=self.timeout)
+            
+            return self.session.post(url, data=data, files={'audio': audio_part}, timeout=self.timeout)
     
     def _queue_for_retry(self, item_type: str, data: Dict, audio_file: Optional[Path] = None):
         """Queue failed request for later retry"""
+        self._queue_item(item_type, data, audio_file)
+        logger.info(f"Queued {item_type} for retry (queue size: {self.offline_queue.qsize()})")
+    
+    def _queue_item(self, item_type: str, data: Dict, audio_file: Optional[Path] = None):
+        """
+        Add a prepared payload to the offline queue and its journal
+        
+        Args:
+            item_type: Record kind (key of _ENDPOINTS)
+            data: API payload
+            audio_file: Path to audio file or in-memory recording (optional)
+        """
+        if audio_file is not None and not isinstance(audio_file, Path):
+            # In-memory recording: persist it so the retry survives restarts
+            audio_file = audio_file.save()
+        
         item = {
+            'id': uuid.uuid4().hex,
             'type': item_type,
             'data': data,
             'audio_file': str(audio_file) if audio_file else None,
             'timestamp': datetime.now().isoformat()
         }
         
-        self.offline_queue.put(item)
-        self._save_offline_queue()
-        logger.info(f"Queued {item_type} for retry (queue size: {self.offline_queue.qsize()})")
+        # Journal first, so an eviction or delivery ack always follows the item
+        self._append_journal([item])
+        self._enqueue(item)
+    
+    def _enqueue(self, item: Dict):
+        """
+        Put item in the offline queue, evicting the oldest item when full
+        
+        Emergencies are never evicted: when the queue holds nothing else, a
+        new emergency is added beyond the limit and other items are dropped.
+        
+        Args:
+            item: Queued (and journaled) item
+        """
+        queue = self.offline_queue
+        with queue.mutex:
+            dropped = None
+            if 0 < queue.maxsize <= len(queue.queue):
+                for index, queued in enumerate(queue.queue):
+                    if queued is not _QUEUE_SENTINEL and queued['type'] != 'emergency':
+                        dropped = queued
+                        del queue.queue[index]
+                        break
+                else:
+                    if item['type'] != 'emergency':
+                        dropped = item
+            
+            if dropped is not item:
+                queue.queue.append(item)
+                queue.unfinished_tasks += 1
+                queue.not_empty.notify()
+        
+        if dropped is not None:
+            self.dropped_items += 1
+            self._append_journal([{'ack': dropped['id']}])
+            logger.warning(f"Offline queue full, dropped oldest {dropped['type']} "
+                           f"(total dropped: {self.dropped_items})")
     
     def _process_offline_queue(self):
-        """Process offline queue in background"""
+        """Process offline queue in background, submitting items in batches"""
         while not self.stop_event.is_set():
             try:
-                # Try to process one item
-                item = self.offline_queue.get(timeout=10)
+                items = self._collect_batch()
+                if not items:
+                    continue
                 
-                item_type = item['type']
-                data = item['data']
-                audio_file = Path(item['audio_file']) if item['audio_file'] else None
+                now = time.time()
+                due = [item for item in items if item.get('next_retry_at', 0) <= now]
+                deferred = [item for item in items if item.get('next_retry_at', 0) > now]
                 
-                success = False
+                failed = self._submit_batch(due) if due else []
                 
-                if item_type == 'transmission':
-                    # For transmission with audio file, we need special handling
-                    if audio_file and audio_file.exists():
-                        endpoint = f"{self.endpoint}/transmissions"
-                        try:
-                            with open(audio_file, 'rb') as f:
-                                files = {'audio': f}
-                                response = self._make_request('POST', endpoint, data=data, files=files)
-                            
-                            if response and response.get('success'):
-                                logger.info(f"Queued transmission posted successfully")
-                                # Delete audio file after successful upload
-                                try:
-                                    audio_file.unlink()
-                                    logger.info(f"Audio file deleted from Raspberry: {audio_file}")
-                                except Exception as e:
-                                    logger.error(f"Failed to delete audio file {audio_file}: {e}")
-                                success = True
-                        except Exception as e:
-                            logger.error(f"Error posting queued transmission: {e}")
-                    else:
-                        # No audio file, just post data
-                        endpoint = f"{self.endpoint}/transmissions"
-                        response = self._make_request('POST', endpoint, data=data)
-                        success = response and response.get('success')
-                elif item_type == 'sms':
-                    success = self.post_sms(data)
-                elif item_type == 'gps':
-                    success = self.post_gps(data)
-                elif item_type == 'emergency':
-                    success = self.post_emergency(data)
+                # Schedule failed items with exponential backoff
+                for item in failed:
+                    item['attempts'] = item.get('attempts', 0) + 1
+                    item['next_retry_at'] = now + min(2 ** item['attempts'], self.MAX_RETRY_BACKOFF)
                 
-                if not success:
-                    # Put back in queue
-                    self.offline_queue.put(item)
-                    time.sleep(60)  # Wait before retrying
-                else:
+                # Put failed and not yet due items back in queue
+                for item in failed + deferred:
+                    self._enqueue(item)
+                
+                # Record delivered items in the journal
+                failed_ids = {item['id'] for item in failed}
+                acks = [{'ack': item['id']} for item in due if item['id'] not in failed_ids]
+                if acks:
+                    self._append_journal(acks)
+                
+                if self._journal_bytes > self.journal_max_bytes:
                     self._save_offline_queue()
+                
+                if not due:
+                    # Nothing ready yet: wait for the earliest retry
+                    earliest = min(item['next_retry_at'] for item in deferred)
+                    self.stop_event.wait(min(earliest - now, self.dispatch_interval))
                     
-            except Empty:
-                # Queue is empty, continue
-                pass
             except Exception as e:
                 logger.error(f"Error processing offline queue: {e}", exc_info=True)
                 time.sleep(10)
     
-    def _save_offline_queue(self):
-        """Save offline queue to disk"""
-        try:
-            items = []
-            temp_queue = Queue()
+    def _collect_batch(self) -> List[Dict]:
+        """
+        Drain up to max_batch items from the offline queue
+        
+        Blocks for the first item, then keeps collecting until the batch is
+        full or dispatch_interval has elapsed. Collection ends early when
+        the shutdown sentinel is received.
+        
+        Returns:
+            List of queued items (may be empty)
+        """
+        item = self.offline_queue.get()
+        if item is _QUEUE_SENTINEL:
+            return []
+        items = [item]
+        
+        deadline = time.monotonic() + self.dispatch_interval
+        while len(items) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.offline_queue.get(timeout=remaining)
+            except Empty:
+                break
+            if item is _QUEUE_SENTINEL:
+                break
+            items.append(item)
+        
+        return items
+    
+    def _submit_batch(self, items: List[Dict]) -> List[Dict]:
+        """
+        Submit a batch of queued items, grouped by type
+        
+        Items of the same type are posted together to the type's bulk
+        endpoint. Transmissions with audio files and batches rejected by the
+        server fall back to one request per item, uploaded in parallel.
+        
+        Args:
+            items: Queued items
             
-            while not self.offline_queue.empty():
-                try:
-                    item = self.offline_queue.get_nowait()
-                    items.append(item)
-                    temp_queue.put(item)
-                except Empty:
-                    break
+        Returns:
+            List of items that could not be delivered
+        """
+        groups = {}
+        singles = []
+        
+        for item in items:
+            if item['type'] not in _ENDPOINTS:
+                logger.warning(f"Dropping queued item with unknown type: {item['type']}")
+                continue
+            if item['type'] == 'transmission' and item.get('audio_file'):
+                # Multipart uploads cannot be bulked
+                singles.append(item)
+                continue
+            groups.setdefault(item['type'], []).append(item)
+        
+        failed = self._post_queued_items(singles)
+        
+        for item_type, group in groups.items():
+            if len(group) > 1 and self.bulk_supported:
+                self._rate_limiter.acquire()
+                status = self._post_bulk(self._bulk_urls[item_type], [item['data'] for item in group])
+                
+                if 200 <= status < 300:
+                    logger.info(f"Queued {item_type} batch posted successfully ({len(group)} items)")
+                    continue
+                if status in self.BULK_UNSUPPORTED_STATUSES:
+                    logger.info("Bulk endpoint not available, using per-item requests")
+                    self.bulk_supported = False
             
-            # Restore queue
-            while not temp_queue.empty():
-                self.offline_queue.put(temp_queue.get())
+            failed.extend(self._post_queued_items(group))
+        
+        return failed
+    
+    def _post_queued_items(self, items: List[Dict]) -> List[Dict]:
+        """
+        Post queued items one per request, up to upload_workers at a time
+        
+        Args:
+            items: Queued items
             
-            # Save to file
-            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.queue_file, 'w') as f:
-                json.dump(items, f)
+        Returns:
+            List of items that could not be delivered
+        """
+        if len(items) <= 1:
+            return [item for item in items if not self._post_queued_item(item)]
+        
+        results = self._upload_executor.map(self._post_queued_item, items)
+        return [item for item, delivered in zip(items, results) if not delivered]
+    
+    def _post_queued_item(self, item: Dict) -> bool:
+        """
+        Post a single queued item
+        
+        Args:
+            item: Queued item
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        self._rate_limiter.acquire()
+        
+        audio_file = Path(item['audio_file']) if item.get('audio_file') else None
+        if audio_file and not audio_file.exists():
+            audio_file = None
+        
+        return self._send(item['type'], item['data'], audio_file)
+    
+    def _append_journal(self, records: List[Dict]):
+        """
+        Append records to the offline queue journal
+        
+        Args:
+            records: Queued items or ack tombstones ({'ack': item_id})
+        """
+        data = b''.join(_json_dumps(record) + b'\n' for record in records)
+        
+        try:
+            with self._journal_lock:
+                if self._journal is None:
+                    self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.queue_file, 'ab')
+                    self._journal_bytes = self._journal.tell()
+                
+                self._journal.write(data)
+                self._journal.flush()
+                self._journal_bytes += len(data)
+        except Exception as e:
+            logger.error(f"Failed to write offline queue journal: {e}", exc_info=True)
+    
+    def _save_offline_queue(self):
+        """Compact the offline queue journal down to the live items"""
+        try:
+            with self._journal_lock:
+                # Snapshot the queue's deque under its own mutex
+                with self.offline_queue.mutex:
+                    items = [item for item in self.offline_queue.queue if item is not _QUEUE_SENTINEL]
+                
+                if self._journal:
+                    self._journal.close()
+                    self._journal = None
+                
+                # Rewrite journal atomically
+                data = b''.join(_json_dumps(item) + b'\n' for item in items)
+                self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.queue_file.with_suffix('.jsonl.tmp')
+                temp_file.write_bytes(data)
+                os.replace(temp_file, self.queue_file)
+                self._journal_bytes = len(data)
+            
+            logger.info(f"Compacted offline queue journal ({len(items)} items)")
                 
         except Exception as e:
             logger.error(f"Failed to save offline queue: {e}", exc_info=True)
     
     def _load_offline_queue(self):
-        """Load offline queue from disk"""
+        """Load offline queue from disk by replaying the journal"""
         try:
+            items = {}
+            compact = False
+            
+            # Migrate queue saved by older versions as a single JSON array
+            if self.legacy_queue_file.exists():
+                for item in _json_loads(self.legacy_queue_file.read_bytes()):
+                    item.setdefault('id', uuid.uuid4().hex)
+                    items[item['id']] = item
+                compact = True
+            
             if self.queue_file.exists():
-                with open(self.queue_file, 'r') as f:
-                    items = json.load(f)
-                    for item in items:
-                        self.offline_queue.put(item)
+                with open(self.queue_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = _json_loads(line)
+                        except ValueError:
+                            logger.warning("Skipping corrupt offline queue journal record")
+                            continue
+                        
+                        if 'ack' in record:
+                            items.pop(record['ack'], None)
+                            compact = True
+                        else:
+                            items[record['id']] = record
+            
+            for item in items.values():
+                self._enqueue(item)
+            
+            if compact:
+                self._save_offline_queue()
+                if self.legacy_queue_file.exists():
+                    self.legacy_queue_file.unlink()
+            
+            if items:
                 logger.info(f"Loaded {len(items)} items from offline queue")
         except Exception as e:
             logger.error(f"Failed to load offline queue: {e}", exc_info=True)
-    
-    def _format_datetime(self, dt: Optional[datetime]) -> Optional[str]:
-        """Format datetime for API"""
-        if dt:
-            return dt.strftime('%Y-%m-%d %H:%M:%S')
-        return None
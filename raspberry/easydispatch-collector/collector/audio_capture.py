@@ -3,20 +3,151 @@ Audio Capture Module
 Captures and processes audio from DMR transmissions
 """
 
+import io
+import math
 import os
 import subprocess
 import logging
 import tempfile
+import threading
+import time
+import wave
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple, Union
+
+from .affinity import release_current_thread, subprocess_preexec_fn
 
 logger = logging.getLogger(__name__)
 
 
+class InMemoryRecording:
+    """Short recording kept in memory; written to disk only when needed"""
+    
+    def __init__(self, filepath: Path, data: bytes):
+        """
+        Initialize in-memory recording
+        
+        Args:
+            filepath: Path the recording is saved to if it must be persisted
+            data: Encoded audio data
+        """
+        self.filepath = filepath
+        self.data = data
+        self.name = filepath.name
+        self.suffix = filepath.suffix
+    
+    def __str__(self) -> str:
+        return str(self.filepath)
+    
+    def exists(self) -> bool:
+        """Whether audio data is still held"""
+        return bool(self.data)
+    
+    def open(self, mode: str = 'rb') -> io.BytesIO:
+        """Open the audio data for reading"""
+        return io.BytesIO(self.data)
+    
+    def save(self) -> Path:
+        """
+        Write the audio data to disk
+        
+        Returns:
+            Path to saved file
+        """
+        self.filepath.write_bytes(self.data)
+        self.data = b''
+        return self.filepath
+    
+    def unlink(self):
+        """Discard the audio data"""
+        self.data = b''
+
+
+class _AudioSpool:
+    """Buffer recorded audio in memory, spilling to disk once it grows past max_size"""
+    
+    def __init__(self, filepath: Path, max_size: int, sample_rate: Optional[int] = None):
+        """
+        Initialize audio spool
+        
+        Args:
+            filepath: Path to spill to
+            max_size: Maximum bytes kept in memory
+            sample_rate: Sample rate of raw S16_LE mono input to wrap as WAV,
+                or None if input is already encoded
+        """
+        self.filepath = filepath
+        self.max_size = max_size
+        self.sample_rate = sample_rate
+        self.buffer = bytearray()
+        self.file = None
+        self.size = 0
+    
+    def write(self, data: bytes):
+        """Append audio data"""
+        self.size += len(data)
+        
+        if self.file is None:
+            if len(self.buffer) + len(data) <= self.max_size:
+                self.buffer += data
+                return
+            
+            self.file = self._open(self.filepath)
+            self._write(self.buffer)
+            self.buffer = bytearray()
+        
+        self._write(data)
+    
+    def close(self) -> Union[Path, InMemoryRecording, None]:
+        """
+        Finish the recording
+        
+        Returns:
+            Path if spilled to disk, InMemoryRecording otherwise, or None if empty
+        """
+        if self.file is not None:
+            self.file.close()
+            return self.filepath
+        
+        if not self.buffer:
+            return None
+        
+        output = io.BytesIO()
+        if self.sample_rate:
+            writer = self._open(output)
+            writer.writeframesraw(self.buffer)
+            writer.close()
+        else:
+            output.write(self.buffer)
+        
+        return InMemoryRecording(self.filepath, output.getvalue())
+    
+    def _open(self, target):
+        if self.sample_rate:
+            writer = wave.open(target if isinstance(target, io.BytesIO) else str(target), 'wb')
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(self.sample_rate)
+            return writer
+        return open(target, 'wb')
+    
+    def _write(self, data: bytes):
+        if self.sample_rate:
+            self.file.writeframesraw(data)
+        else:
+            self.file.write(data)
+
+
 class AudioCapture:
     """Capture and encode audio from DMR transmissions"""
     
+    # FFmpeg encoders and muxers for supported compression formats
+    CODECS = {
+        'mp3': ('libmp3lame', 'mp3'),
+        'opus': ('libopus', 'opus'),
+    }
+    
     def __init__(self, config: dict):
         """
         Initialize Audio Capture
@@ -26,18 +157,253 @@ class AudioCapture:
         """
         self.capture_device = config.get('capture_device', 'plughw:0,0')
         self.sample_rate = config.get('sample_rate', 8000)
+        self.channels = 2 if config.get('channels', 1) == 2 else 1
         self.format = config.get('format', 'wav')
         self.compression = config.get('compression', 'mp3')
         self.bitrate = config.get('bitrate', 64)
         self.recording_dir = Path(config.get('recording_dir', '/tmp/easydispatch/audio'))
+        self.spool_max_bytes = config.get('spool_max_bytes', 256 * 1024)
         
         # Create recording directory
         self.recording_dir.mkdir(parents=True, exist_ok=True)
         
         self.active_recordings = {}
+        self.lock = threading.Lock()
+        
+        # State of the last cleanup scan, used to skip scans that cannot delete anything
+        self._cleanup_dir_mtime = None  # Recording directory mtime (ns) before the scan
+        self._oldest_kept_mtime = math.inf  # mtime of the oldest file left in place
+        
+        # Capture process shared by all recordings and listeners (the audio
+        # streamer), kept running from start() to close() so starting a
+        # recording only registers it. With two channels, slot 1 is recorded
+        # from the left and slot 2 from the right channel.
+        self.frame_bytes = 2 * self.channels  # S16_LE
+        self.chunk_bytes = self.sample_rate * self.frame_bytes // 5  # 0.2 s
+        self.recorder = None
+        self.capture_thread = None
+        self._listeners = ()
+        
+        # Encoder started ahead of the next compressed recording, so no
+        # process is started when a transmission begins
+        self._spare_encoder = None
+        self._encoder_lock = threading.Lock()
+        self._closed = False
         
         logger.info(f"Initialized Audio Capture (device: {self.capture_device}, rate: {self.sample_rate})")
     
+    def start(self) -> bool:
+        """
+        Start the shared recorder, and an encoder for the first recording
+        
+        Returns:
+            True if the recorder is running
+        """
+        self._closed = False
+        started = self._start_recorder()
+        if self.compression in self.CODECS:
+            self._refill_encoder()
+        return started
+    
+    def add_listener(self, listener: Callable[[bytes], None]):
+        """
+        Feed every captured chunk to listener, from the capture thread
+        
+        Chunks are whole S16_LE frames at sample_rate with channels
+        interleaved. Listeners must not block, or recordings fall behind.
+        
+        Args:
+            listener: Function called with each chunk
+        """
+        with self.lock:
+            self._listeners += (listener,)
+    
+    def remove_listener(self, listener: Callable[[bytes], None]):
+        """
+        Stop feeding captured chunks to listener
+        
+        Args:
+            listener: Function passed to add_listener
+        """
+        with self.lock:
+            self._listeners = tuple(l for l in self._listeners if l != listener)
+    
+    def _start_recorder(self) -> bool:
+        """
+        Start the shared arecord process and its capture thread, if not running
+        
+        Returns:
+            True if the recorder is running
+        """
+        if self.recorder and self.recorder.poll() is None:
+            return True
+        
+        cmd = [
+            'arecord',
+            '-D', self.capture_device,
+            '-f', 'S16_LE',
+            '-r', str(self.sample_rate),
+            '-c', str(self.channels),
+            '-t', 'raw',
+            '-'
+        ]
+        
+        try:
+            self.recorder = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+                preexec_fn=subprocess_preexec_fn()
+            )
+        except Exception as e:
+            logger.error(f"Failed to start audio recorder: {e}")
+            self.recorder = None
+            return False
+        
+        self.capture_thread = threading.Thread(target=self._capture_loop, args=(self.recorder,), daemon=True)
+        self.capture_thread.start()
+        logger.info(f"Started audio recorder on {self.capture_device}")
+        return True
+    
+    def _capture_loop(self, recorder: subprocess.Popen):
+        """
+        Read PCM from the recorder and feed it to every active recording
+        
+        Args:
+            recorder: arecord process
+        """
+        release_current_thread()
+        partial = b''
+        while True:
+            try:
+                chunk = recorder.stdout.read(self.chunk_bytes)
+            except Exception as e:
+                logger.error(f"Error reading audio recorder: {e}", exc_info=True)
+                break
+            
+            if not chunk:
+                break
+            
+            # Pass on whole frames only; a short read can split one
+            if partial:
+                chunk = partial + chunk
+            whole = len(chunk) - len(chunk) % self.frame_bytes
+            chunk, partial = chunk[:whole], chunk[whole:]
+            if not chunk:
+                continue
+            
+            for listener in self._listeners:
+                try:
+                    listener(chunk)
+                except Exception as e:
+                    logger.error(f"Error in audio listener: {e}")
+            
+            samples = memoryview(chunk).cast('h') if self.channels > 1 else None
+            with self.lock:
+                for recording_id, recording in self.active_recordings.items():
+                    audio = chunk if samples is None else samples[recording['channel']::self.channels].tobytes()
+                    try:
+                        if recording['encoder']:
+                            recording['encoder'].stdin.write(audio)
+                        else:
+                            recording['spool'].write(audio)
+                    except Exception as e:
+                        logger.error(f"Error writing audio for {recording_id}: {e}")
+        
+        if recorder is self.recorder:
+            logger.warning("Audio recorder exited unexpectedly, restarting on next recording")
+    
+    def close(self):
+        """Stop the audio recorder and the spare encoder"""
+        self._stop_recorder()
+        
+        with self._encoder_lock:
+            self._closed = True
+            encoder, self._spare_encoder = self._spare_encoder, None
+        if encoder:
+            self._discard_encoder(encoder)
+    
+    def _start_encoder(self) -> subprocess.Popen:
+        """
+        Start an FFmpeg process encoding captured PCM in the configured format
+        
+        Returns:
+            Encoder process reading PCM on stdin and writing audio to stdout
+        """
+        codec, muxer = self.CODECS[self.compression]
+        cmd = [
+            'ffmpeg',
+            '-f', 's16le',
+            '-ar', str(self.sample_rate),
+            '-ac', '1',  # Mono
+            '-i', 'pipe:0',
+            '-codec:a', codec,
+            '-b:a', f'{self.bitrate}k',
+            '-f', muxer,
+            'pipe:1'
+        ]
+        
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=subprocess_preexec_fn()
+        )
+    
+    def _take_encoder(self) -> subprocess.Popen:
+        """
+        Take the encoder started ahead for a recording, starting the next one in the background
+        
+        Returns:
+            Encoder process (started now if none was ready)
+        """
+        with self._encoder_lock:
+            encoder, self._spare_encoder = self._spare_encoder, None
+        
+        if encoder is None or encoder.poll() is not None:
+            encoder = self._start_encoder()
+        
+        threading.Thread(target=self._refill_encoder, daemon=True).start()
+        return encoder
+    
+    def _refill_encoder(self):
+        """Start an encoder for the next compressed recording, unless one is waiting"""
+        release_current_thread()
+        try:
+            encoder = self._start_encoder()
+        except Exception as e:
+            logger.warning(f"Failed to start spare encoder: {e}")
+            return
+        
+        with self._encoder_lock:
+            if self._spare_encoder is None and not self._closed:
+                self._spare_encoder, encoder = encoder, None
+        
+        if encoder:
+            self._discard_encoder(encoder)
+    
+    def _discard_encoder(self, encoder: subprocess.Popen):
+        """Stop an encoder that was never given audio"""
+        try:
+            encoder.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            encoder.kill()
+            encoder.communicate()
+        except Exception as e:
+            logger.error(f"Error stopping spare encoder: {e}")
+    
+    def _stop_recorder(self):
+        """Stop the shared arecord process, releasing the capture device"""
+        recorder, self.recorder = self.recorder, None
+        if recorder and recorder.poll() is None:
+            recorder.terminate()
+            try:
+                recorder.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                recorder.kill()
+    
     def start_recording(self, slot: int, radio_id: int, talkgroup_id: int) -> str:
         """
         Start recording audio for a transmission
@@ -48,40 +414,48 @@ class AudioCapture:
             talkgroup_id: Talkgroup ID
             
         Returns:
-            Recording ID (file path)
+            Recording ID
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"slot{slot}_{radio_id}_tg{talkgroup_id}_{timestamp}.wav"
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        compressed = self.compression in self.CODECS
+        extension = self.compression if compressed else 'wav'
+        filename = f"slot{slot}_{radio_id}_tg{talkgroup_id}_{timestamp}.{extension}"
         filepath = self.recording_dir / filename
         
         logger.info(f"Starting audio recording: {filename}")
         
+        # Normally running since start(); restarted here if it exited
+        if not self._start_recorder():
+            return None
+        
         try:
-            # Start arecord process
-            cmd = [
-                'arecord',
-                '-D', self.capture_device,
-                '-f', 'S16_LE',
-                '-r', str(self.sample_rate),
-                '-c', '1',  # Mono
-                str(filepath)
-            ]
+            encoder = None
+            reader = None
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            if compressed:
+                encoder = self._take_encoder()
+            elif self.compression and self.compression != 'wav':
+                logger.warning(f"Unsupported compression format: {self.compression}, recording WAV")
+            
+            # Keep short recordings in memory; spill long ones to disk
+            spool = _AudioSpool(filepath, self.spool_max_bytes, None if compressed else self.sample_rate)
+            if encoder:
+                reader = threading.Thread(target=self._spool_output, args=(encoder, spool), daemon=True)
+                reader.start()
             
             recording_id = f"slot{slot}_{radio_id}_{timestamp}"
-            self.active_recordings[recording_id] = {
-                'process': process,
-                'filepath': filepath,
-                'slot': slot,
-                'radio_id': radio_id,
-                'talkgroup_id': talkgroup_id,
-                'start_time': datetime.now()
-            }
+            with self.lock:
+                self.active_recordings[recording_id] = {
+                    'encoder': encoder,
+                    'spool': spool,
+                    'reader': reader,
+                    'filepath': filepath,
+                    'channel': slot - 1 if 0 < slot <= self.channels else 0,
+                    'slot': slot,
+                    'radio_id': radio_id,
+                    'talkgroup_id': talkgroup_id,
+                    'start_time': datetime.now()
+                }
             
             return recording_id
             
@@ -89,7 +463,7 @@ class AudioCapture:
             logger.error(f"Failed to start recording: {e}", exc_info=True)
             return None
     
-    def stop_recording(self, recording_id: str) -> Optional[Path]:
+    def stop_recording(self, recording_id: str) -> Union[Path, InMemoryRecording, None]:
         """
         Stop an active recording
         
@@ -97,137 +471,112 @@ class AudioCapture:
             recording_id: Recording ID returned by start_recording
             
         Returns:
-            Path to recorded file, or None if failed
+            Path to recorded file, InMemoryRecording for recordings that fit
+            in memory, or None if failed
         """
-        if recording_id not in self.active_recordings:
+        with self.lock:
+            recording = self.active_recordings.pop(recording_id, None)
+        
+        if recording is None:
             logger.warning(f"Recording ID not found: {recording_id}")
             return None
         
-        recording = self.active_recordings[recording_id]
-        process = recording['process']
+        encoder = recording['encoder']
+        spool = recording['spool']
         filepath = recording['filepath']
         
         logger.info(f"Stopping audio recording: {recording_id}")
         
+        if encoder:
+            try:
+                # Closing stdin lets FFmpeg flush the encoder and exit
+                encoder.stdin.close()
+                encoder.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                logger.error("Failed to stop encoder process (timeout)")
+                encoder.kill()
+                return None
+            except Exception as e:
+                logger.error(f"Error stopping encoder: {e}", exc_info=True)
+                return None
+        
         try:
-            # Terminate arecord process
-            process.terminate()
-            process.wait(timeout=5)
+            if recording['reader']:
+                recording['reader'].join(timeout=5)
+            audio = spool.close()
             
-            # Check if file was created
-            if filepath.exists() and filepath.stat().st_size > 0:
-                logger.info(f"Recording saved: {filepath} ({filepath.stat().st_size} bytes)")
-                
-                # Compress if needed
-                if self.compression and self.compression != 'wav':
-                    compressed_path = self._compress_audio(filepath)
-                    if compressed_path:
-                        # Remove original WAV file
-                        filepath.unlink()
-                        filepath = compressed_path
-                
-                del self.active_recordings[recording_id]
-                return filepath
-            else:
-                logger.warning(f"Recording file is empty or not created: {filepath}")
-                if filepath.exists():
-                    filepath.unlink()
-                del self.active_recordings[recording_id]
+            if audio is None:
+                logger.warning(f"Recording is empty: {filepath}")
                 return None
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Failed to stop recording process (timeout)")
-            process.kill()
-            del self.active_recordings[recording_id]
-            return None
+            
+            location = "in memory" if isinstance(audio, InMemoryRecording) else "on disk"
+            logger.info(f"Recording saved: {filepath} ({spool.size} bytes, {location})")
+            return audio
+            
         except Exception as e:
-            logger.error(f"Error stopping recording: {e}", exc_info=True)
-            del self.active_recordings[recording_id]
+            logger.error(f"Error saving recording: {e}", exc_info=True)
             return None
     
-    def _compress_audio(self, wav_path: Path) -> Optional[Path]:
+    def _spool_output(self, process: subprocess.Popen, spool: _AudioSpool):
         """
-        Compress WAV file to specified format
+        Copy encoder output into its spool
         
         Args:
-            wav_path: Path to WAV file
-            
-        Returns:
-            Path to compressed file, or None if failed
+            process: Encoder process
+            spool: Destination spool
         """
-        if self.compression == 'mp3':
-            output_path = wav_path.with_suffix('.mp3')
-            
-            cmd = [
-                'ffmpeg',
-                '-i', str(wav_path),
-                '-codec:a', 'libmp3lame',
-                '-b:a', f'{self.bitrate}k',
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite
-                str(output_path)
-            ]
-        elif self.compression == 'opus':
-            output_path = wav_path.with_suffix('.opus')
-            
-            cmd = [
-                'ffmpeg',
-                '-i', str(wav_path),
-                '-codec:a', 'libopus',
-                '-b:a', f'{self.bitrate}k',
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite
-                str(output_path)
-            ]
-        else:
-            logger.warning(f"Unsupported compression format: {self.compression}")
-            return wav_path
-        
+        release_current_thread()
         try:
-            logger.info(f"Compressing audio to {self.compression}...")
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30
-            )
-            
-            if result.returncode == 0 and output_path.exists():
-                original_size = wav_path.stat().st_size
-                compressed_size = output_path.stat().st_size
-                ratio = (1 - compressed_size / original_size) * 100
-                logger.info(f"Compression complete: {compressed_size} bytes ({ratio:.1f}% reduction)")
-                return output_path
-            else:
-                logger.error(f"Compression failed: {result.stderr.decode()}")
-                return wav_path
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Compression timeout")
-            return wav_path
+            for chunk in iter(lambda: process.stdout.read(4096), b''):
+                spool.write(chunk)
         except Exception as e:
-            logger.error(f"Compression error: {e}", exc_info=True)
-            return wav_path
+            logger.error(f"Error reading recording output: {e}", exc_info=True)
     
     def cleanup_old_files(self, max_age_hours: int = 24):
         """
         Clean up old recording files
         
+        The directory is only scanned when files were added or removed
+        since the last scan (its mtime changed) or when the oldest file
+        left by that scan has expired, so an idle system costs one stat.
+        
         Args:
             max_age_hours: Maximum age in hours before deletion
         """
-        import time
-        
         cutoff_time = time.time() - (max_age_hours * 3600)
         deleted_count = 0
         
-        for filepath in self.recording_dir.glob('*'):
-            if filepath.is_file() and filepath.stat().st_mtime < cutoff_time:
+        try:
+            dir_mtime = os.stat(self.recording_dir).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Failed to check recording directory: {e}")
+            return
+        
+        if dir_mtime == self._cleanup_dir_mtime and self._oldest_kept_mtime >= cutoff_time:
+            return
+        
+        oldest_kept = math.inf
+        
+        # DirEntry caches stat results from the directory read
+        with os.scandir(self.recording_dir) as entries:
+            for entry in entries:
+                mtime = math.inf
                 try:
-                    filepath.unlink()
-                    deleted_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to delete {filepath}: {e}")
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                    if mtime < cutoff_time:
+                        os.unlink(entry.path)
+                        deleted_count += 1
+                        continue
+                except OSError as e:
+                    logger.error(f"Failed to delete {entry.path}: {e}")
+                oldest_kept = min(oldest_kept, mtime)
+        
+        # Our own deletions change the directory mtime, so the next call scans
+        # once more and then settles; anything added during this scan is seen too
+        self._cleanup_dir_mtime = dir_mtime
+        self._oldest_kept_mtime = oldest_kept
         
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old recording files")
@@ -5,45 +5,240 @@ Streams audio chunks to PHP backend via HTTP POST
 """
 
 import os
+import queue
+import random
+import select
+import struct
 import subprocess
 import logging
 import threading
 import time
-import base64
-from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict
-import queue
+from typing import Optional, Dict, List, Tuple
+
+from .affinity import release_current_thread, subprocess_preexec_fn
 
 logger = logging.getLogger(__name__)
 
 
+# Ogg page header: "OggS" capture pattern ... segment count at byte 26
+OGG_CAPTURE = b'OggS'
+OGG_HEADER_SIZE = 27
+
+# Frame durations (ms) accepted by the libopus encoder
+OPUS_FRAME_DURATIONS = (2.5, 5, 10, 20, 40, 60, 80, 100, 120)
+
+
+class _ChunkBatch:
+    """
+    Request body for a batch of Ogg pages, assembled in one reused buffer
+    
+    FFmpeg output is read from the pipe directly into place after a header
+    area sized for a full batch, and split into complete Ogg pages there;
+    each page is one chunk. The length header is written right-aligned in
+    the header area, so the finished body is one contiguous slice and a
+    single copy hands it to the send pool. A partial page left at the end
+    of a batch is moved to the start of the next one.
+    """
+    
+    def __init__(self, max_chunks: int, chunk_size: int):
+        """
+        Initialize chunk batch
+        
+        Args:
+            max_chunks: Chunks per batch
+            chunk_size: Expected chunk size in bytes (the buffer grows if needed)
+        """
+        self.header_size = 2 * max_chunks
+        self.buf = bytearray(self.header_size + 2 * max_chunks * chunk_size)
+        self.view = memoryview(self.buf)
+        self.lengths = []
+        self.end = self.header_size  # End of complete pages
+        self.filled = self.header_size  # End of data read
+        self.start_time = 0.0
+    
+    def __len__(self) -> int:
+        return len(self.lengths)
+    
+    def reserve(self, size: int) -> memoryview:
+        """Return a buffer region of size bytes for the next read"""
+        if self.filled + size > len(self.buf):
+            self.view.release()
+            self.buf.extend(bytes(self.filled + size - len(self.buf)))
+            self.view = memoryview(self.buf)
+        return self.view[self.filled:self.filled + size]
+    
+    def add(self, size: int):
+        """
+        Record size bytes read into the reserved region and split off complete pages
+        
+        Args:
+            size: Bytes read
+        """
+        self.filled += size
+        
+        while self.filled - self.end >= OGG_HEADER_SIZE:
+            if self.buf[self.end:self.end + 4] != OGG_CAPTURE:
+                # Lost sync: skip to the next capture pattern
+                sync = self.buf.find(OGG_CAPTURE, self.end, self.filled)
+                logger.warning("Ogg stream out of sync, skipping data")
+                if sync < 0:
+                    sync = self.filled - 3
+                self._discard(self.end, sync - self.end)
+                continue
+            
+            segments = self.buf[self.end + 26]
+            header_end = self.end + OGG_HEADER_SIZE + segments
+            if header_end > self.filled:
+                break
+            
+            page_end = header_end + sum(self.buf[self.end + OGG_HEADER_SIZE:header_end])
+            if page_end > self.filled:
+                break
+            
+            if not self.lengths:
+                self.start_time = time.monotonic()
+            self.lengths.append(page_end - self.end)
+            self.end = page_end
+    
+    def pages(self):
+        """Yield each complete page as a memoryview into the buffer"""
+        offset = self.header_size
+        for length in self.lengths:
+            yield self.view[offset:offset + length]
+            offset += length
+    
+    def append(self, page):
+        """
+        Add one complete page
+        
+        Args:
+            page: Page bytes
+        """
+        size = len(page)
+        self.reserve(size)[:] = page
+        self.add(size)
+    
+    def body(self) -> bytes:
+        """
+        Build the request body
+        
+        A single page is sent as is. Otherwise the body starts with the
+        big-endian 16-bit length of each page, followed by the pages.
+        """
+        count = len(self.lengths)
+        if count == 1:
+            return bytes(self.view[self.header_size:self.end])
+        
+        header = struct.pack(f'>{count}H', *self.lengths)
+        if len(header) > self.header_size:
+            # More pages than a full batch arrived in one read
+            return header + self.view[self.header_size:self.end].tobytes()
+        
+        start = self.header_size - len(header)
+        self.buf[start:self.header_size] = header
+        return bytes(self.view[start:self.end])
+    
+    def clear(self):
+        """Start a new batch, keeping any partial page"""
+        self.lengths = []
+        self._discard(self.header_size, self.end - self.header_size)
+        self.end = self.header_size
+    
+    def _discard(self, offset: int, size: int):
+        """Drop size bytes of data at offset, moving the following data down"""
+        pending = self.filled - offset - size
+        self.buf[offset:offset + pending] = self.buf[offset + size:offset + size + pending]
+        self.filled = offset + pending
+
+
 class AudioStreamer:
     """Stream audio in real-time using Opus codec"""
     
-    def __init__(self, config: dict, api_client):
+    def __init__(self, config: dict, api_client, audio_source=None):
         """
         Initialize Audio Streamer
         
         Args:
             config: Audio streaming configuration dictionary
             api_client: API client for sending chunks
+            audio_source: AudioCapture whose recorder feeds the encoder, so
+                recording and streaming share one capture of the device
+                (None captures from capture_device directly)
         """
         self.capture_device = config.get('capture_device', 'plughw:0,0')
         self.sample_rate = config.get('sample_rate', 8000)
         self.bitrate = config.get('bitrate', 16)  # kbps per slot
         self.chunk_duration_ms = config.get('chunk_duration_ms', 100)
+        if self.chunk_duration_ms not in OPUS_FRAME_DURATIONS:
+            logger.warning(f"Unsupported Opus frame duration {self.chunk_duration_ms}ms, using 100ms")
+            self.chunk_duration_ms = 100
+        
+        # Chunks sent per HTTP request, and max time a chunk may wait for its batch
+        self.batch_size = max(1, config.get('batch_size', 5))
+        self.batch_max_age = config.get('batch_max_age_ms', 500) / 1000
+        
+        # Chunks read from FFmpeg per read call
+        self.read_chunks = max(1, config.get('read_chunks', 4))
         self.api_client = api_client
+        self.audio_source = audio_source
         
-        # Active streams for each slot
+        # By default one mono capture feeds both slots. With split_channels,
+        # slot 1 is captured from the left and slot 2 from the right channel
+        # (wired that way on the hardware), each encoded to its own output of
+        # the shared FFmpeg process
+        self.split_channels = config.get('split_channels', False)
+        if self.split_channels and audio_source is not None and audio_source.channels != 2:
+            logger.warning("split_channels needs a two-channel audio capture, streaming one mono feed")
+            self.split_channels = False
+        self._slot_outputs = {1: 0, 2: 1 if self.split_channels else 0}
+        
+        # Active streams for each slot, fed by the shared FFmpeg encoder
         self.active_streams = {}
-        self.stream_threads = {}
-        self.stream_queues = {}
+        self._streams_lock = threading.Lock()
+        self._ffmpeg = None
+        self._dispatcher_thread = None
+        
+        # Stream header pages (OpusHead, OpusTags) of each encoder output,
+        # sent first on every stream fed by that output
+        self._ogg_headers: List[List[bytes]] = []
         
         # Reconnection settings
         self.max_retries = config.get('max_retries', 5)
         self.retry_delay = config.get('retry_delay', 2)
         
+        # Each slot's batches go through its own queue and sender thread, so
+        # they reach the backend in sequence order and the dispatcher never
+        # waits on the network. When a queue is full its oldest batch is dropped.
+        max_pending_sends = config.get('max_pending_sends', 20)
+        self._send_queues = {slot: queue.Queue(maxsize=max_pending_sends) for slot in (1, 2)}
+        self._send_lock = threading.Lock()
+        self._sending_stopped = threading.Event()
+        self._send_threads = []
+        for slot, send_queue in self._send_queues.items():
+            thread = threading.Thread(target=self._send_worker, args=(send_queue,),
+                                      name=f'stream-send-{slot}', daemon=True)
+            thread.start()
+            self._send_threads.append(thread)
+        
+        # Estimate chunk (Ogg page) size in bytes for buffer and read sizing
+        # Opus at 16kbps for 100ms = 16000/8 * 0.1 = 200 bytes (approximate)
+        self.chunk_size = int((self.bitrate * 1000 / 8) * (self.chunk_duration_ms / 1000))
+        
+        # Encoder arguments, the same for every output and stream
+        self._opus_args = [
+            '-acodec', 'libopus',
+            '-b:a', f'{self.bitrate}k',
+            '-ar', str(self.sample_rate),
+            '-ac', '1',  # Mono
+            '-application', 'voip',
+            '-frame_duration', str(self.chunk_duration_ms),
+            '-vbr', 'off',  # Constant bitrate
+            '-f', 'ogg',
+            '-page_duration', str(int(self.chunk_duration_ms * 1000)),  # One page per frame
+            '-flush_packets', '1',
+        ]
+        
         logger.info(f"Initialized Audio Streamer (device: {self.capture_device}, "
                    f"rate: {self.sample_rate}, bitrate: {self.bitrate}kbps)")
     
@@ -51,6 +246,9 @@ class AudioStreamer:
         """
         Start streaming audio for a slot
         
+        Registers the slot with the shared encoder, starting the encoder
+        if no other slot is streaming.
+        
         Args:
             slot: DMR slot number (1 or 2)
             radio_id: DMR radio ID
@@ -59,215 +257,427 @@ class AudioStreamer:
         Returns:
             True if stream started successfully
         """
-        if slot in self.active_streams:
-            logger.warning(f"Stream already active for slot {slot}")
-            return False
-        
-        logger.info(f"Starting audio stream for slot {slot} (Radio: {radio_id}, TG: {talkgroup_id})")
-        
-        try:
-            # Create queue for this stream
-            self.stream_queues[slot] = queue.Queue(maxsize=50)
-            
-            # Start FFmpeg process for Opus encoding
-            process = self._start_ffmpeg_process(slot)
-            if not process:
+        with self._streams_lock:
+            if slot in self.active_streams:
+                logger.warning(f"Stream already active for slot {slot}")
                 return False
             
-            # Store stream info
-            self.active_streams[slot] = {
-                'process': process,
-                'radio_id': radio_id,
-                'talkgroup_id': talkgroup_id,
-                'start_time': datetime.now(),
-                'chunk_count': 0
-            }
+            logger.info(f"Starting audio stream for slot {slot} (Radio: {radio_id}, TG: {talkgroup_id})")
             
-            # Start streaming thread
-            thread = threading.Thread(
-                target=self._stream_worker,
-                args=(slot,),
-                daemon=True
-            )
-            thread.start()
-            self.stream_threads[slot] = thread
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to start stream for slot {slot}: {e}", exc_info=True)
-            self._cleanup_stream(slot)
-            return False
+            try:
+                if not self._ensure_encoder():
+                    return False
+                
+                # Every stream starts with the Ogg header pages of its output
+                batch = _ChunkBatch(self.batch_size, self.chunk_size)
+                for page in self._ogg_headers[self._slot_outputs[slot]]:
+                    batch.append(page)
+                
+                self.active_streams[slot] = {
+                    'batch': batch,
+                    'radio_id': radio_id,
+                    'talkgroup_id': talkgroup_id,
+                    'start_time': time.monotonic(),
+                    'chunk_count': 0,
+                    'failed_sends': 0
+                }
+                
+                return True
+                
+            except Exception as e:
+                logger.error(f"Failed to start stream for slot {slot}: {e}", exc_info=True)
+                self.active_streams.pop(slot, None)
+                return False
     
     def stop_stream(self, slot: int) -> bool:
         """
         Stop streaming audio for a slot
         
+        Unregisters the slot and sends its remaining chunks; the shared
+        encoder is stopped if no other slot is streaming.
+        
         Args:
             slot: DMR slot number (1 or 2)
             
         Returns:
             True if stream stopped successfully
         """
-        if slot not in self.active_streams:
+        with self._streams_lock:
+            stream_info = self.active_streams.pop(slot, None)
+            self._stop_encoder_if_idle()
+        
+        if not stream_info:
             logger.warning(f"No active stream for slot {slot}")
             return False
         
         logger.info(f"Stopping audio stream for slot {slot}")
         
         try:
-            # Signal thread to stop by closing queue
-            if slot in self.stream_queues:
-                self.stream_queues[slot].put(None)
-            
-            # Wait for thread to finish
-            if slot in self.stream_threads:
-                self.stream_threads[slot].join(timeout=5)
-            
-            # Cleanup
-            self._cleanup_stream(slot)
+            if stream_info['batch']:
+                self._submit_chunks(slot, stream_info, stream_info['batch'])
             
+            logger.info(f"Stream finished for slot {slot} (queued {stream_info['chunk_count']} chunks)")
             return True
             
         except Exception as e:
             logger.error(f"Error stopping stream for slot {slot}: {e}", exc_info=True)
             return False
     
-    def _start_ffmpeg_process(self, slot: int) -> Optional[subprocess.Popen]:
+    def _ensure_encoder(self) -> bool:
         """
-        Start FFmpeg process for Opus encoding
+        Start the shared FFmpeg encoder and its dispatcher if not running
+        
+        Returns:
+            True if the encoder is running
+        """
+        if self._ffmpeg and self._ffmpeg.poll() is None:
+            return True
+        
+        started = self._start_ffmpeg_process()
+        if not started:
+            return False
+        
+        process, fds = started
+        self._ffmpeg = process
+        self._ogg_headers = [[] for _ in fds]
+        if self.audio_source is not None:
+            self.audio_source.add_listener(self._feed_encoder)
+        
+        logger.info("FFmpeg encoder started")
+        self._dispatcher_thread = threading.Thread(
+            target=self._dispatch_worker,
+            args=(process, fds),
+            daemon=True
+        )
+        self._dispatcher_thread.start()
+        return True
+    
+    def _stop_encoder_if_idle(self):
+        """
+        Stop the shared encoder once no slot is streaming (call with _streams_lock held)
+        
+        Its dispatcher reads what is left of the output and reaps it.
+        """
+        if self.active_streams or self._ffmpeg is None:
+            return
+        
+        process, self._ffmpeg = self._ffmpeg, None
+        self._release_encoder_input(process)
+        if self.audio_source is None:
+            process.terminate()  # Capturing from ALSA, not stdin
+        logger.info("FFmpeg encoder stopped (no active streams)")
+    
+    def _feed_encoder(self, chunk: bytes):
+        """
+        Write captured PCM to the shared encoder (audio source listener)
         
         Args:
-            slot: DMR slot number
-            
+            chunk: PCM from the audio source
+        """
+        process = self._ffmpeg
+        if process is None:
+            return
+        try:
+            process.stdin.write(chunk)
+        except (OSError, ValueError):
+            pass  # Encoder exited or is stopping
+    
+    def _release_encoder_input(self, process: subprocess.Popen):
+        """
+        Stop feeding an encoder that is no longer current
+        
+        Args:
+            process: Encoder process
+        """
+        if self.audio_source is not None:
+            self.audio_source.remove_listener(self._feed_encoder)
+        if process.stdin:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+    
+    def _start_ffmpeg_process(self) -> Optional[Tuple[subprocess.Popen, List[int]]]:
+        """
+        Start FFmpeg process for Opus encoding
+        
+        With split_channels, the stereo capture is split into one mono
+        Ogg Opus output per slot: slot 1 on stdout, slot 2 on an extra pipe.
+        
         Returns:
-            Process object or None if failed
+            (process, output pipe fds indexed by output), or None if failed
         """
+        source = self.audio_source
+        if source is not None:
+            # PCM from the shared recorder, written to stdin by _feed_encoder
+            input_args = ['-f', 's16le', '-ar', str(source.sample_rate), '-ac', str(source.channels), '-i', 'pipe:0']
+        elif self.split_channels:
+            input_args = ['-f', 'alsa', '-channels', '2', '-i', self.capture_device]
+        else:
+            input_args = ['-f', 'alsa', '-i', self.capture_device]
+        
+        extra_r = extra_w = None
         try:
-            cmd = [
-                'ffmpeg',
-                '-f', 'alsa',
-                '-i', self.capture_device,
-                '-acodec', 'libopus',
-                '-b:a', f'{self.bitrate}k',
-                '-ar', str(self.sample_rate),
-                '-ac', '1',  # Mono
-                '-application', 'voip',
-                '-frame_duration', str(self.chunk_duration_ms),
-                '-vbr', 'off',  # Constant bitrate
-                '-f', 'opus',
-                '-'
-            ]
+            if self.split_channels:
+                extra_r, extra_w = os.pipe()
+                cmd = [
+                    'ffmpeg',
+                    *input_args,
+                    '-filter_complex', 'channelsplit=channel_layout=stereo[slot1][slot2]',
+                    '-map', '[slot1]', *self._opus_args, 'pipe:1',
+                    '-map', '[slot2]', *self._opus_args, f'pipe:{extra_w}',
+                ]
+            else:
+                cmd = ['ffmpeg', *input_args, *self._opus_args, '-']
             
             process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE if source is not None else subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=0
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+                pass_fds=(extra_w,) if extra_w is not None else (),
+                preexec_fn=subprocess_preexec_fn()
             )
             
-            logger.info(f"FFmpeg process started for slot {slot}")
-            return process
+            fds = [process.stdout.fileno()]
+            if extra_r is not None:
+                fds.append(extra_r)
+            return process, fds
             
         except Exception as e:
             logger.error(f"Failed to start FFmpeg: {e}", exc_info=True)
+            if extra_r is not None:
+                os.close(extra_r)
             return None
+        finally:
+            # FFmpeg holds the write end now
+            if extra_w is not None:
+                os.close(extra_w)
     
-    def _stream_worker(self, slot: int):
+    def _dispatch_worker(self, process: subprocess.Popen, fds: List[int]):
         """
-        Worker thread that reads chunks and sends to API
+        Worker thread that reads the shared encoder outputs and routes them to slots
         
         Args:
-            slot: DMR slot number
+            process: Shared FFmpeg process
+            fds: Output pipe fds, indexed by output
         """
-        stream_info = self.active_streams.get(slot)
-        if not stream_info:
-            return
+        release_current_thread()
         
-        process = stream_info['process']
-        radio_id = stream_info['radio_id']
-        talkgroup_id = stream_info['talkgroup_id']
+        # Read straight from the pipes into reused buffers
+        readers = [_ChunkBatch(self.read_chunks, self.chunk_size) for _ in fds]
+        running = True
         
-        # Calculate chunk size in bytes
-        # Opus at 16kbps for 100ms = 16000/8 * 0.1 = 200 bytes (approximate)
-        chunk_size = int((self.bitrate * 1000 / 8) * (self.chunk_duration_ms / 1000))
+        while running:
+            try:
+                ready = select.select(fds, [], [])[0] if len(fds) > 1 else fds
+                for fd in ready:
+                    output = fds.index(fd)
+                    reader = readers[output]
+                    
+                    # Read whatever FFmpeg has written, up to several chunks
+                    size = os.readv(fd, [reader.reserve(self.read_chunks * self.chunk_size)])
+                    
+                    if not size:
+                        logger.info("FFmpeg encoder ended (no more data)")
+                        running = False
+                        break
+                    
+                    reader.add(size)
+                    if reader:
+                        self._dispatch_pages(process, reader, output)
+                        reader.clear()
+                
+            except Exception as e:
+                logger.error(f"Error in stream dispatcher: {e}", exc_info=True)
+                time.sleep(1)
+        
+        # The extra output pipe is ours to close; stdout belongs to the process
+        for fd in fds[1:]:
+            os.close(fd)
+        
+        # Encoder gone: flush and drop the streams it was feeding
+        with self._streams_lock:
+            if self._ffmpeg is process:
+                self._ffmpeg = None
+                self._release_encoder_input(process)
+                streams = list(self.active_streams.items())
+                self.active_streams.clear()
+            else:
+                streams = []
+        
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
         
-        retry_count = 0
+        for slot, stream_info in streams:
+            if stream_info['batch']:
+                self._submit_chunks(slot, stream_info, stream_info['batch'])
+            logger.warning(f"Stream for slot {slot} stopped: encoder exited")
+    
+    def _dispatch_pages(self, process: subprocess.Popen, reader: _ChunkBatch, output: int):
+        """
+        Copy newly read pages into the batch of every active slot fed by output
+        
+        With split_channels each output carries one slot's channel;
+        otherwise both slots share the single output. A slot is only
+        active while it has a transmission. Output left by a stopped
+        encoder is dropped.
+        
+        Args:
+            process: Encoder the pages were read from
+            reader: Batch holding the pages just read
+            output: Encoder output the pages were read from
+        """
+        with self._streams_lock:
+            if process is not self._ffmpeg:
+                return
+            
+            headers = self._ogg_headers[output]
+            streams = [stream_info for slot, stream_info in self.active_streams.items()
+                       if self._slot_outputs.get(slot) == output]
+            for page in reader.pages():
+                if len(headers) < 2:
+                    headers.append(bytes(page))
+                for stream_info in streams:
+                    stream_info['batch'].append(page)
+            
+            for slot, stream_info in list(self.active_streams.items()):
+                batch = stream_info['batch']
+                
+                # Send once the batch is full or its oldest chunk is too old
+                if batch and (len(batch) >= self.batch_size
+                              or time.monotonic() - batch.start_time >= self.batch_max_age):
+                    self._submit_chunks(slot, stream_info, batch)
+                    
+                    if stream_info['failed_sends'] >= self.max_retries:
+                        logger.error(f"Max retries reached for slot {slot}, stopping stream")
+                        del self.active_streams[slot]
+            
+            self._stop_encoder_if_idle()
+    
+    def _submit_chunks(self, slot: int, stream_info: Dict, batch: _ChunkBatch):
+        """
+        Queue a batch of chunks for sending, dropping the slot's oldest queued batch if full
         
+        The batch is cleared for reuse once its body has been copied out.
+        
+        Args:
+            slot: DMR slot number
+            stream_info: Active stream info
+            batch: Chunks read so far
+        """
+        count = len(batch)
+        body = batch.body()
+        batch.clear()
+        
+        base_sequence = stream_info['chunk_count']
+        stream_info['chunk_count'] += count
+        
+        send_queue = self._send_queues[slot]
+        item = (slot, stream_info, body, count, base_sequence)
         while True:
             try:
-                # Read chunk from FFmpeg stdout
-                chunk = process.stdout.read(chunk_size)
-                
-                if not chunk:
-                    logger.info(f"Stream ended for slot {slot} (no more data)")
-                    break
-                
-                # Encode chunk to base64
-                chunk_b64 = base64.b64encode(chunk).decode('utf-8')
-                
-                # Send to API
-                success = self._send_chunk(
-                    slot=slot,
-                    radio_id=radio_id,
-                    talkgroup_id=talkgroup_id,
-                    chunk_data=chunk_b64,
-                    sequence=stream_info['chunk_count']
-                )
+                send_queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            
+            try:
+                dropped = send_queue.get_nowait()
+                logger.warning(f"Send queue full, dropped {dropped[3]} chunks for slot {dropped[0]}")
+            except queue.Empty:
+                pass
+    
+    def _send_worker(self, send_queue: queue.Queue):
+        """
+        Worker thread that sends one slot's queued batches in order, retrying with backoff
+        
+        A failed batch is retried after an exponential, jittered delay
+        until it succeeds or the stream reaches max_retries consecutive
+        failures; the dispatcher then stops the stream. Later batches of
+        the slot wait meanwhile, so sequence numbers never go backwards.
+        
+        Args:
+            send_queue: Queue of the slot's batches
+        """
+        while True:
+            item = send_queue.get()
+            if item is None:
+                break
+            
+            slot, stream_info, body, count, base_sequence = item
+            while True:
+                success = self._send_chunk_batch(slot, stream_info['radio_id'], stream_info['talkgroup_id'],
+                                                 body, count, base_sequence)
+                with self._send_lock:
+                    stream_info['failed_sends'] = 0 if success else stream_info['failed_sends'] + 1
+                    failures = stream_info['failed_sends']
                 
                 if success:
-                    stream_info['chunk_count'] += 1
-                    retry_count = 0
-                else:
-                    # Handle retry
-                    retry_count += 1
-                    if retry_count >= self.max_retries:
-                        logger.error(f"Max retries reached for slot {slot}, stopping stream")
-                        break
-                    time.sleep(self.retry_delay)
-                
-                # Check if we should stop
-                if slot in self.stream_queues:
-                    try:
-                        stop_signal = self.stream_queues[slot].get_nowait()
-                        if stop_signal is None:
-                            logger.info(f"Received stop signal for slot {slot}")
-                            break
-                    except queue.Empty:
-                        pass
+                    break
                 
-            except Exception as e:
-                logger.error(f"Error in stream worker for slot {slot}: {e}", exc_info=True)
-                time.sleep(1)
+                # Give up at max_retries, or right away once stopping
+                delay = min(self.retry_delay * 2 ** (failures - 1), 30) + random.random() * 0.5
+                if failures >= self.max_retries or self._sending_stopped.wait(delay):
+                    logger.warning(f"Dropped {count} chunks for slot {slot} after {failures} failed sends")
+                    break
+    
+    def _send_chunk_batch(self, slot: int, radio_id: int, talkgroup_id: int,
+                          body: bytes, count: int, base_sequence: int) -> bool:
+        """
+        Send several audio chunks to API in one request
+        
+        A batched body starts with the big-endian 16-bit length of each
+        chunk, followed by the chunks themselves; X-Chunk-Count gives the count.
+        
+        Args:
+            slot: DMR slot number
+            radio_id: Radio ID
+            talkgroup_id: TalkGroup ID
+            body: Request body built by _ChunkBatch
+            count: Number of chunks in body
+            base_sequence: Sequence number of the first chunk
+            
+        Returns:
+            True if sent successfully
+        """
+        if count == 1:
+            return self._send_chunk(slot, radio_id, talkgroup_id, body, base_sequence)
         
-        logger.info(f"Stream worker finished for slot {slot} (sent {stream_info['chunk_count']} chunks)")
+        return self._send_chunk(slot, radio_id, talkgroup_id, body, base_sequence,
+                                extra_headers={'X-Chunk-Count': str(count)})
     
     def _send_chunk(self, slot: int, radio_id: int, talkgroup_id: int, 
-                    chunk_data: str, sequence: int) -> bool:
+                    chunk_data: bytes, sequence: int, extra_headers: Optional[Dict] = None) -> bool:
         """
-        Send audio chunk to API
+        Send audio chunk to API as a raw binary body
         
         Args:
             slot: DMR slot number
             radio_id: Radio ID
             talkgroup_id: TalkGroup ID
-            chunk_data: Base64 encoded chunk
+            chunk_data: Opus chunk bytes
             sequence: Chunk sequence number
+            extra_headers: Additional request headers
             
         Returns:
             True if sent successfully
         """
         try:
-            payload = {
-                'slot': slot,
-                'radio_id': radio_id,
-                'talkgroup_id': talkgroup_id,
-                'chunk_data': chunk_data,
-                'sequence': sequence,
-                'timestamp': datetime.now().isoformat()
+            headers = {
+                'X-Slot': str(slot),
+                'X-Radio-Id': str(radio_id),
+                'X-TG-Id': str(talkgroup_id),
+                'X-Sequence': str(sequence),
+                'X-Timestamp': f"{time.time():.3f}"  # Unix epoch seconds
             }
+            if extra_headers:
+                headers.update(extra_headers)
             
-            response = self.api_client.post('/stream-audio', payload)
+            response = self.api_client.post_binary('/stream-audio', chunk_data, headers)
             
             if response and response.get('success'):
                 return True
@@ -279,34 +689,6 @@ class AudioStreamer:
             logger.error(f"Error sending chunk: {e}", exc_info=True)
             return False
     
-    def _cleanup_stream(self, slot: int):
-        """
-        Cleanup resources for a stream
-        
-        Args:
-            slot: DMR slot number
-        """
-        # Terminate FFmpeg process
-        if slot in self.active_streams:
-            process = self.active_streams[slot]['process']
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            except Exception as e:
-                logger.error(f"Error terminating process for slot {slot}: {e}")
-            
-            del self.active_streams[slot]
-        
-        # Remove queue
-        if slot in self.stream_queues:
-            del self.stream_queues[slot]
-        
-        # Remove thread reference
-        if slot in self.stream_threads:
-            del self.stream_threads[slot]
-    
     def is_streaming(self, slot: int) -> bool:
         """
         Check if a slot is currently streaming
@@ -333,7 +715,7 @@ class AudioStreamer:
             return None
         
         info = self.active_streams[slot].copy()
-        info.pop('process', None)  # Don't include process object
+        info.pop('batch', None)  # Don't include chunk buffer
         return info
     
     def cleanup_all(self):
@@ -344,4 +726,26 @@ class AudioStreamer:
         for slot in slots:
             self.stop_stream(slot)
         
+        # Stop the shared encoder
+        with self._streams_lock:
+            process, self._ffmpeg = self._ffmpeg, None
+        if process:
+            self._release_encoder_input(process)
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            except Exception as e:
+                logger.error(f"Error terminating FFmpeg encoder: {e}")
+        if self._dispatcher_thread:
+            self._dispatcher_thread.join(timeout=5)
+        
+        # Send what is queued, without further retries
+        self._sending_stopped.set()
+        for send_queue in self._send_queues.values():
+            send_queue.put(None)
+        for thread in self._send_threads:
+            thread.join(timeout=5)
+        
         logger.info("Audio streamer cleanup complete")
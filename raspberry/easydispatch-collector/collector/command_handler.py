@@ -4,8 +4,11 @@ Executes remote commands received from the backend API
 """
 
 import logging
+import select
+import shlex
 import subprocess
-from typing import Dict, Optional
+import threading
+from typing import Callable, ClassVar, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,19 @@ class CommandHandler:
         """
         self.mmdvm_config_path = config.get('mmdvm_config_path', '/etc/mmdvm/MMDVM.ini')
         self.dmr_id = config.get('dmr_id', 2222000)
+        self.persistent_tools = config.get('persistent_tools', False)
+        
+        # Long-lived DMR tool helpers (tool name -> process), tools whose
+        # helper has answered with the daemon protocol, and tools known not
+        # to support daemon mode
+        self._persistent_procs: Dict[str, subprocess.Popen] = {}
+        self._daemon_confirmed = set()
+        self._no_daemon = set()
+        
+        # One lock per tool, so a slow command only holds back its own tool;
+        # _procs_lock only guards creating those locks
+        self._tool_locks: Dict[str, threading.Lock] = {}
+        self._procs_lock = threading.Lock()
         
         logger.info("Initialized Command Handler")
     
@@ -38,27 +54,150 @@ class CommandHandler:
         """
         command_type = command.get('command_type')
         
+        handler = self._HANDLERS.get(command_type)
+        if not handler:
+            error = f"Unknown command type: {command_type}"
+            logger.error(error)
+            return False, error
+        
         try:
-            if command_type == 'sms':
-                return self._send_sms(command)
-            elif command_type == 'call_alert':
-                return self._send_call_alert(command)
-            elif command_type == 'gps_request':
-                return self._request_gps(command)
-            elif command_type == 'radio_check':
-                return self._radio_check(command)
-            elif command_type == 'remote_monitor':
-                return self._remote_monitor(command)
-            else:
-                error = f"Unknown command type: {command_type}"
-                logger.error(error)
-                return False, error
+            return handler(self, command)
                 
         except Exception as e:
             error = f"Command execution failed: {e}"
             logger.error(error, exc_info=True)
             return False, error
     
+    def _run_tool(self, cmd: list, timeout: float) -> subprocess.CompletedProcess:
+        """
+        Run a DMR tool command, reusing a persistent helper when possible
+        
+        The helper is started once as ``<tool> --daemon`` and receives each
+        command's arguments as a shell-quoted line on stdin, answering with
+        a single ``OK [<output>]`` or ``ERR <message>`` line. Tools whose
+        helper exits, first answers anything else or never answers are
+        treated as not supporting daemon mode and fall back to one
+        subprocess.run per command.
+        
+        Args:
+            cmd: Tool name followed by its arguments
+            timeout: Seconds to wait for the command to complete
+            
+        Returns:
+            Completed process with returncode, stdout and stderr
+            
+        Raises:
+            FileNotFoundError: If the tool is not installed
+            subprocess.TimeoutExpired: If the tool does not answer in time
+        """
+        tool = cmd[0]
+        
+        if self.persistent_tools and tool not in self._no_daemon:
+            with self._tool_lock(tool):
+                try:
+                    reply = self._daemon_request(tool, shlex.join(cmd[1:]), timeout)
+                except subprocess.TimeoutExpired:
+                    # A helper that never answered is likely a tool waiting
+                    # on stdin for something else
+                    if tool in self._daemon_confirmed:
+                        raise
+                    reply = None
+            
+            if reply is not None:
+                if reply.startswith('ERR '):
+                    return subprocess.CompletedProcess(cmd, 1, '', reply[4:])
+                return subprocess.CompletedProcess(cmd, 0, reply[3:], '')
+            
+            if tool not in self._daemon_confirmed:
+                logger.info(f"{tool} has no daemon mode, running it per command")
+                self._no_daemon.add(tool)
+        
+        return subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
+    def _tool_lock(self, tool: str) -> threading.Lock:
+        """Lock serializing requests to the persistent helper for tool"""
+        with self._procs_lock:
+            return self._tool_locks.setdefault(tool, threading.Lock())
+    
+    def _daemon_request(self, tool: str, line: str, timeout: float) -> Optional[str]:
+        """
+        Send one request line to the persistent helper for tool
+        
+        Must be called with the tool's lock held.
+        
+        Args:
+            tool: Tool name
+            line: Request line (without newline)
+            timeout: Seconds to wait for the reply
+            
+        Returns:
+            ``OK`` or ``ERR <message>`` reply, or None if the helper exited
+            or answered outside the daemon protocol
+        """
+        proc = self._persistent_procs.get(tool)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                [tool, '--daemon'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            self._persistent_procs[tool] = proc
+        
+        try:
+            proc.stdin.write(line + '\n')
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self._stop_daemon(tool)
+            return None
+        
+        ready, _, _ = select.select([proc.stdout], [], [], timeout)
+        if not ready:
+            # The reply may still arrive later and desync the protocol
+            self._stop_daemon(tool)
+            raise subprocess.TimeoutExpired([tool, '--daemon'], timeout)
+        
+        reply = proc.stdout.readline().strip()
+        if reply != 'OK' and not reply.startswith(('OK ', 'ERR ')):
+            # Exited, or printed e.g. usage text: --daemon is not supported
+            # (or, for a confirmed helper, the protocol is out of sync)
+            self._stop_daemon(tool)
+            return None
+        
+        self._daemon_confirmed.add(tool)
+        return reply
+    
+    def _stop_daemon(self, tool: str):
+        """Terminate the persistent helper for tool, if running"""
+        proc = self._persistent_procs.pop(tool, None)
+        if proc is None:
+            return
+        
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        
+        try:
+            proc.terminate()
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    
+    def close(self):
+        """Stop all persistent DMR tool helpers"""
+        for tool in list(self._persistent_procs):
+            with self._tool_lock(tool):
+                self._stop_daemon(tool)
+    
     def _send_sms(self, command: Dict) -> tuple[bool, Optional[str]]:
         """
         Send SMS to radio or talkgroup
@@ -101,12 +240,7 @@ class CommandHandler:
                 '--message', message
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = self._run_tool(cmd, timeout=10)
             
             if result.returncode == 0:
                 logger.info(f"SMS sent successfully to {target_desc}")
@@ -150,12 +284,7 @@ class CommandHandler:
                 '--target', str(target_radio_id)
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = self._run_tool(cmd, timeout=10)
             
             if result.returncode == 0:
                 logger.info(f"Call alert sent to radio {target_radio_id}")
@@ -199,12 +328,7 @@ class CommandHandler:
                 '--target', str(target_radio_id)
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = self._run_tool(cmd, timeout=10)
             
             if result.returncode == 0:
                 logger.info(f"GPS request sent to radio {target_radio_id}")
@@ -272,12 +396,7 @@ class CommandHandler:
                 '--duration', str(duration)
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=duration + 10
-            )
+            result = self._run_tool(cmd, timeout=duration + 10)
             
             if result.returncode == 0:
                 logger.info(f"Remote monitor activated for radio {target_radio_id}")
@@ -294,3 +413,12 @@ class CommandHandler:
             error = "Remote monitor timeout"
             logger.error(error)
             return False, error
+    
+    # Command type -> handler, looked up by execute_command
+    _HANDLERS: ClassVar[Dict[str, Callable]] = {
+        'sms': _send_sms,
+        'call_alert': _send_call_alert,
+        'gps_request': _request_gps,
+        'radio_check': _radio_check,
+        'remote_monitor': _remote_monitor,
+    }
@@ -5,11 +5,17 @@ Parses DMR data messages (SMS, GPS, Emergency, etc.)
 
 import re
 import logging
+import time
 from typing import Optional, Dict, Tuple
-from datetime import datetime
+
+from .data_parser_fast import parse_aprs
 
 logger = logging.getLogger(__name__)
 
+# ASCII control bytes in SMS text are replaced by spaces (whitespace is kept)
+_CONTROL_BYTES = bytes(b for b in range(32) if not chr(b).isspace()) + b'\x7f'
+_SMS_TABLE = bytes.maketrans(_CONTROL_BYTES, b' ' * len(_CONTROL_BYTES))
+
 
 class DataParser:
     """Parse DMR data transmissions"""
@@ -27,6 +33,13 @@ class DataParser:
         r'(\d{2})(\d{2}\.\d{2})([NS])/(\d{3})(\d{2}\.\d{2})([EW])/A=(\d{6})'
     )
     
+    # Raw decimal coordinates (lat, lon)
+    DECIMAL_COORD_PATTERN = re.compile(r'(-?\d+\.\d+),\s*(-?\d+\.\d+)')
+    
+    # Telemetry patterns
+    BATTERY_PATTERN = re.compile(r'BATT[:\s]*(\d+\.?\d*)V?', re.IGNORECASE)
+    TEMP_PATTERN = re.compile(r'TEMP[:\s]*(-?\d+\.?\d*)C?', re.IGNORECASE)
+    
     def __init__(self):
         """Initialize Data Parser"""
         logger.info("Initialized Data Parser")
@@ -42,23 +55,21 @@ class DataParser:
             Dictionary with SMS information or None
         """
         try:
-            # Try to decode as text
-            text = data.decode('utf-8', errors='ignore').strip()
+            # Blank out control characters, then decode as text
+            text = data.translate(_SMS_TABLE).decode('utf-8', errors='ignore')
+            if not text.isascii():
+                # Also blank out non-ASCII non-printables (C1 controls, line separators, bidi marks)
+                text = ''.join(ch if ch.isprintable() or ch in '\t\n\r' else ' ' for ch in text)
+            text = text.strip()
             
             if not text:
                 return None
             
-            # Remove control characters
-            text = ''.join(char for char in text if char.isprintable() or char.isspace())
-            
-            if len(text) < 1:
-                return None
-            
             logger.info(f"Parsed SMS: {text}")
             
             return {
                 'message': text,
-                'timestamp': datetime.now()
+                'timestamp_ns': time.time_ns()
             }
             
         except Exception as e:
@@ -76,6 +87,22 @@ class DataParser:
             Dictionary with GPS information or None
         """
         try:
+            # Byte-level APRS parser (fixed offsets, no regex)
+            position = parse_aprs(data)
+            if position:
+                latitude, longitude, alt_feet = position
+                altitude = int(alt_feet * 0.3048) if alt_feet is not None else None
+                
+                logger.info(f"Parsed GPS: {latitude}, {longitude}"
+                            + (f", {altitude}m" if altitude is not None else ""))
+                
+                return {
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'altitude': altitude,
+                    'timestamp_ns': time.time_ns()
+                }
+            
             # Try to decode as text
             text = data.decode('utf-8', errors='ignore')
             
@@ -94,7 +121,7 @@ class DataParser:
                     'latitude': latitude,
                     'longitude': longitude,
                     'altitude': int(altitude),
-                    'timestamp': datetime.now()
+                    'timestamp_ns': time.time_ns()
                 }
             
             # Try without altitude
@@ -111,11 +138,11 @@ class DataParser:
                     'latitude': latitude,
                     'longitude': longitude,
                     'altitude': None,
-                    'timestamp': datetime.now()
+                    'timestamp_ns': time.time_ns()
                 }
             
             # Try to parse as raw decimal coordinates
-            decimal_match = re.search(r'(-?\d+\.\d+),\s*(-?\d+\.\d+)', text)
+            decimal_match = self.DECIMAL_COORD_PATTERN.search(text)
             if decimal_match:
                 latitude = float(decimal_match.group(1))
                 longitude = float(decimal_match.group(2))
@@ -127,7 +154,7 @@ class DataParser:
                         'latitude': latitude,
                         'longitude': longitude,
                         'altitude': None,
-                        'timestamp': datetime.now()
+                        'timestamp_ns': time.time_ns()
                     }
             
             return None
@@ -188,14 +215,14 @@ class DataParser:
             
             return {
                 'emergency_type': emergency_type,
-                'timestamp': datetime.now()
+                'timestamp_ns': time.time_ns()
             }
             
         except Exception as e:
             logger.error(f"Failed to parse emergency: {e}", exc_info=True)
             return {
                 'emergency_type': 'generic',
-                'timestamp': datetime.now()
+                'timestamp_ns': time.time_ns()
             }
     
     def parse_telemetry(self, data: bytes) -> Optional[Dict]:
@@ -217,17 +244,17 @@ class DataParser:
             telemetry = {}
             
             # Try to extract battery voltage
-            battery_match = re.search(r'BATT[:\s]*(\d+\.?\d*)V?', text, re.IGNORECASE)
+            battery_match = self.BATTERY_PATTERN.search(text)
             if battery_match:
                 telemetry['battery_voltage'] = float(battery_match.group(1))
             
             # Try to extract temperature
-            temp_match = re.search(r'TEMP[:\s]*(-?\d+\.?\d*)C?', text, re.IGNORECASE)
+            temp_match = self.TEMP_PATTERN.search(text)
             if temp_match:
                 telemetry['temperature'] = float(temp_match.group(1))
             
             if telemetry:
-                telemetry['timestamp'] = datetime.now()
+                telemetry['timestamp_ns'] = time.time_ns()
                 logger.info(f"Parsed telemetry: {telemetry}")
                 return telemetry
             
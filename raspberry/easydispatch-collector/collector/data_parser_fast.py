@@ -0,0 +1,164 @@
+"""
+Fast Data Parser Module
+Byte-level APRS position parsing, JIT-compiled with Numba when available
+and slice-based otherwise
+"""
+
+import logging
+import math
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import Numba for JIT compilation (optional)
+try:
+    import numba
+    import numpy as np
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _jit(func):
+    """Compile func with Numba when available, otherwise return it unchanged"""
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True)(func)
+    return func
+
+
+@_jit
+def _digits(buf, start: int, count: int) -> int:
+    """Return the integer value of count ASCII digits at start, or -1"""
+    value = 0
+    for i in range(start, start + count):
+        c = buf[i]
+        if c < 48 or c > 57:  # '0'..'9'
+            return -1
+        value = value * 10 + (c - 48)
+    return value
+
+
+@_jit
+def _minutes(buf, start: int) -> float:
+    """Return APRS minutes (mm.mm) at start, or -1.0"""
+    if buf[start + 2] != 46:  # '.'
+        return -1.0
+    whole = _digits(buf, start, 2)
+    frac = _digits(buf, start + 3, 2)
+    if whole < 0 or frac < 0:
+        return -1.0
+    return (whole * 100 + frac) / 100.0
+
+
+@_jit
+def _parse_aprs_kernel(buf) -> Tuple[float, float, float]:
+    """
+    Scan buf for an APRS position (DDMM.MMN/DDDMM.MMW[/A=AAAAAA])
+
+    Positions with altitude take precedence over the first position
+    without one, matching the order DataParser tries its regexes.
+
+    Returns:
+        (latitude, longitude, altitude_feet); latitude is NaN if no
+        position was found, altitude_feet is NaN if absent
+    """
+    n = len(buf)
+    nan = math.nan
+    found_lat = nan
+    found_lon = nan
+
+    # Layout relative to the '/' at index i:
+    # lat DDMM.MM at i-8..i-2, N/S at i-1, lon DDDMM.MM at i+1..i+8, E/W at i+9
+    for i in range(8, n - 9):
+        if buf[i] != 47:  # '/'
+            continue
+
+        lat_dir = buf[i - 1]
+        lon_dir = buf[i + 9]
+        if (lat_dir != 78 and lat_dir != 83) or (lon_dir != 69 and lon_dir != 87):  # N S / E W
+            continue
+
+        lat_deg = _digits(buf, i - 8, 2)
+        lat_min = _minutes(buf, i - 6)
+        lon_deg = _digits(buf, i + 1, 3)
+        lon_min = _minutes(buf, i + 4)
+        if lat_deg < 0 or lat_min < 0 or lon_deg < 0 or lon_min < 0:
+            continue
+
+        lat = lat_deg + lat_min / 60.0
+        lon = lon_deg + lon_min / 60.0
+        if lat_dir == 83:
+            lat = -lat
+        if lon_dir == 87:
+            lon = -lon
+
+        # Altitude suffix: /A=AAAAAA
+        if (i + 18 < n and buf[i + 10] == 47 and buf[i + 11] == 65 and buf[i + 12] == 61):
+            alt = _digits(buf, i + 13, 6)
+            if alt >= 0:
+                return lat, lon, float(alt)
+
+        if math.isnan(found_lat):
+            found_lat = lat
+            found_lon = lon
+
+    return found_lat, found_lon, nan
+
+
+def _parse_aprs_slices(data: bytes) -> Tuple[float, float, float]:
+    """
+    Pure Python equivalent of _parse_aprs_kernel
+
+    Candidate '/' delimiters are located with bytes.find and the fixed
+    width fields around them are checked and converted by slicing.
+    """
+    n = len(data)
+    found = (math.nan, math.nan, math.nan)
+
+    i = data.find(b'/', 8)
+    while 0 <= i < n - 9:
+        lat_dir = data[i - 1]
+        lon_dir = data[i + 9]
+
+        if (lat_dir in b'NS' and lon_dir in b'EW'
+                and data[i - 8:i - 4].isdigit() and data[i - 4] == 46 and data[i - 3:i - 1].isdigit()
+                and data[i + 1:i + 6].isdigit() and data[i + 6] == 46 and data[i + 7:i + 9].isdigit()):
+            lat = int(data[i - 8:i - 6]) + float(data[i - 6:i - 1]) / 60.0
+            lon = int(data[i + 1:i + 4]) + float(data[i + 4:i + 9]) / 60.0
+            if lat_dir == 83:  # 'S'
+                lat = -lat
+            if lon_dir == 87:  # 'W'
+                lon = -lon
+
+            # Altitude suffix: /A=AAAAAA
+            if data[i + 10:i + 13] == b'/A=' and len(data[i + 13:i + 19]) == 6 and data[i + 13:i + 19].isdigit():
+                return lat, lon, float(int(data[i + 13:i + 19]))
+
+            if math.isnan(found[0]):
+                found = (lat, lon, math.nan)
+
+        i = data.find(b'/', i + 1)
+
+    return found
+
+
+def parse_aprs(data: bytes) -> Optional[Tuple[float, float, Optional[float]]]:
+    """
+    Parse an APRS position from raw bytes
+
+    Args:
+        data: Raw data bytes
+
+    Returns:
+        (latitude, longitude, altitude_feet or None), or None if no
+        position was found
+    """
+    if NUMBA_AVAILABLE:
+        lat, lon, alt = _parse_aprs_kernel(np.frombuffer(data, dtype=np.uint8))
+    else:
+        lat, lon, alt = _parse_aprs_slices(bytes(data))
+
+    if math.isnan(lat):
+        return None
+
+    return round(lat, 6), round(lon, 6), None if math.isnan(alt) else alt
@@ -5,9 +5,10 @@ Manages OLED/LCD display for MMDVM status information
 
 import logging
 import time
-from datetime import datetime
-from typing import Optional, Dict
-from threading import Lock
+from functools import lru_cache
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional, Dict, Tuple
+from threading import Event, Lock, Thread
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +17,49 @@ try:
     from luma.core.interface.serial import i2c
     from luma.core.render import canvas
     from luma.oled.device import ssd1306
-    from PIL import ImageFont
+    from PIL import Image, ImageDraw, ImageFont
     DISPLAY_AVAILABLE = True
 except ImportError:
     DISPLAY_AVAILABLE = False
     logger.debug("Display libraries not available (luma.oled)")
 
+# Framebuffer that only sends changed regions (luma.core >= 2.0);
+# older versions take the framebuffer name as a string
+try:
+    from luma.core.framebuffer import diff_to_previous
+    DIFF_FRAMEBUFFER = diff_to_previous()
+except ImportError:
+    DIFF_FRAMEBUFFER = "diff_to_previous"
+
+
+class _DisplayStatus(NamedTuple):
+    """Immutable status snapshot; updates replace it as a whole"""
+    slot1_rx: bool = False
+    slot2_rx: bool = False
+    db_connected: bool = False
+    api_connected: bool = False
+    last_dmr_data: str = ''
+    dmr_lines: Tuple[str, ...] = ()  # last_dmr_data wrapped to display lines
+    last_update: Optional[float] = None  # time.monotonic() of the last change
+
+
+@lru_cache(maxsize=128)
+def _render_text(text: str, font) -> "Image.Image":
+    """
+    Rasterize a line of text once and reuse it on later redraws
+    
+    Args:
+        text: Text to render
+        font: PIL font
+        
+    Returns:
+        Mode "1" image of the text, white on black
+    """
+    _, _, right, bottom = font.getbbox(text) if text else (0, 0, 1, 1)
+    image = Image.new('1', (max(1, right), max(1, bottom)))
+    ImageDraw.Draw(image).text((0, 0), text, fill=1, font=font)
+    return image
+
 
 class DisplayManager:
     """Manage OLED/LCD display for system status"""
@@ -36,17 +74,27 @@ class DisplayManager:
         self.enabled = config.get('enabled', False) and DISPLAY_AVAILABLE
         self.device = None
         self.font = None
-        self.lock = Lock()
-        
-        # Status tracking
-        self.status = {
-            'slot1_rx': False,
-            'slot2_rx': False,
-            'db_connected': False,
-            'api_connected': False,
-            'last_dmr_data': '',
-            'last_update': None
-        }
+        self._base_image = None  # Static labels and separator of the status screen
+        self._value_positions = ()  # Where the S1, S2, DB and API values go
+        self.line_chars = 21  # Characters per display line (measured once the font is loaded)
+        self.lock = Lock()  # Serializes status writers; readers need no lock
+        
+        # Status changes only mark the display dirty; a render thread redraws
+        # at most once per refresh_interval
+        self.refresh_interval = config.get('refresh_interval', 0.1)
+        # Wait this long after the first change so a burst of updates
+        # (e.g. slot, data and status at transmission start) is drawn as one frame
+        self.coalesce_window = config.get('coalesce_window', 0.02)
+        self.running = False
+        self._dirty_event = Event()
+        self._render_thread = None
+        
+        # Status shown by the last status frame (None after other screens)
+        self._last_snapshot = None
+        
+        # Status tracking: swapping in a new tuple is atomic, so the render
+        # thread and get_status() read it without locking
+        self._status = _DisplayStatus()
         
         if self.enabled:
             try:
@@ -55,7 +103,8 @@ class DisplayManager:
                 i2c_address = config.get('i2c_address', 0x3C)
                 
                 serial = i2c(port=i2c_port, address=i2c_address)
-                self.device = ssd1306(serial)
+                # Only transmit the parts of the (mode "1") framebuffer that changed
+                self.device = ssd1306(serial, framebuffer=DIFF_FRAMEBUFFER)
                 
                 # Load font
                 try:
@@ -63,9 +112,18 @@ class DisplayManager:
                 except:
                     self.font = ImageFont.load_default()
                 
+                # Monospaced font: one advance width gives the exact line capacity
+                self.line_chars = max(1, int(self.device.width // self.font.getlength('M')))
+                
+                self._build_base_image()
+                
                 logger.info(f"Display initialized (I2C port {i2c_port}, address 0x{i2c_address:02X})")
                 self.show_startup_message()
                 
+                self.running = True
+                self._render_thread = Thread(target=self._render_loop, daemon=True)
+                self._render_thread.start()
+                
             except Exception as e:
                 logger.error(f"Failed to initialize display: {e}", exc_info=True)
                 self.enabled = False
@@ -80,6 +138,7 @@ class DisplayManager:
         if not self.enabled:
             return
         
+        self._last_snapshot = None
         try:
             with canvas(self.device) as draw:
                 draw.text((10, 10), "EasyDispatch", fill="white", font=self.font)
@@ -100,14 +159,15 @@ class DisplayManager:
             logger.warning(f"Invalid slot number: {slot}. Must be 1 or 2.")
             return
         
+        field = 'slot1_rx' if slot == 1 else 'slot2_rx'
+        
         with self.lock:
-            if slot == 1:
-                self.status['slot1_rx'] = active
-            elif slot == 2:
-                self.status['slot2_rx'] = active
-            self.status['last_update'] = datetime.now()
+            # Repeated updates with the same state don't need a redraw
+            if getattr(self._status, field) == active:
+                return
+            self._status = self._status._replace(**{field: active, 'last_update': time.monotonic()})
         
-        self._refresh_display()
+        self._dirty_event.set()
     
     def update_db_status(self, connected: bool):
         """
@@ -117,10 +177,11 @@ class DisplayManager:
             connected: Whether DB is connected
         """
         with self.lock:
-            self.status['db_connected'] = connected
-            self.status['last_update'] = datetime.now()
+            if self._status.db_connected == connected:
+                return
+            self._status = self._status._replace(db_connected=connected, last_update=time.monotonic())
         
-        self._refresh_display()
+        self._dirty_event.set()
     
     def update_api_status(self, connected: bool):
         """
@@ -130,10 +191,11 @@ class DisplayManager:
             connected: Whether API is connected
         """
         with self.lock:
-            self.status['api_connected'] = connected
-            self.status['last_update'] = datetime.now()
+            if self._status.api_connected == connected:
+                return
+            self._status = self._status._replace(api_connected=connected, last_update=time.monotonic())
         
-        self._refresh_display()
+        self._dirty_event.set()
     
     def show_dmr_data(self, data_string: str):
         """
@@ -142,12 +204,92 @@ class DisplayManager:
         Args:
             data_string: DMR data received from network
         """
+        data_string, dmr_lines = self._wrap_dmr_data(data_string)
+        
         with self.lock:
-            # Truncate if too long
-            self.status['last_dmr_data'] = data_string[:60]
-            self.status['last_update'] = datetime.now()
+            self._status = self._status._replace(last_dmr_data=data_string, dmr_lines=dmr_lines,
+                                                 last_update=time.monotonic())
         
-        self._refresh_display()
+        self._dirty_event.set()
+    
+    def show_slot_activity(self, slot: int, active: bool, data_string: str):
+        """
+        Update a slot's receive status and show DMR data in one update
+        
+        Equivalent to update_slot_status followed by show_dmr_data, but
+        publishes a single status snapshot and wakes the renderer once.
+        
+        Args:
+            slot: Slot number (1 or 2)
+            active: Whether slot is receiving
+            data_string: DMR data received from network
+        """
+        if slot not in [1, 2]:
+            logger.warning(f"Invalid slot number: {slot}. Must be 1 or 2.")
+            return
+        
+        field = 'slot1_rx' if slot == 1 else 'slot2_rx'
+        data_string, dmr_lines = self._wrap_dmr_data(data_string)
+        
+        with self.lock:
+            self._status = self._status._replace(**{field: active, 'last_dmr_data': data_string,
+                                                    'dmr_lines': dmr_lines, 'last_update': time.monotonic()})
+        
+        self._dirty_event.set()
+    
+    def _wrap_dmr_data(self, data_string: str) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Truncate DMR data to the three lines available and wrap it
+        
+        Wrapping happens once here rather than on every redraw.
+        
+        Args:
+            data_string: DMR data string
+            
+        Returns:
+            (truncated string, display lines)
+        """
+        line_chars = self.line_chars
+        data_string = data_string[:3 * line_chars]
+        return data_string, tuple(data_string[i:i+line_chars] for i in range(0, len(data_string), line_chars))
+    
+    def _render_loop(self):
+        """Redraw the display whenever the status changes, rate limited"""
+        while self.running:
+            self._dirty_event.wait()
+            if self.coalesce_window and self.running:
+                time.sleep(self.coalesce_window)
+            self._dirty_event.clear()
+            if not self.running:
+                break
+            self._refresh_display()
+            time.sleep(self.refresh_interval)
+    
+    def stop(self):
+        """Stop the render thread"""
+        self.running = False
+        self._dirty_event.set()
+        if self._render_thread:
+            self._render_thread.join(timeout=2)
+    
+    def _build_base_image(self):
+        """Draw the static parts of the status screen once"""
+        self._base_image = Image.new('1', self.device.size)
+        draw = ImageDraw.Draw(self._base_image)
+        
+        # Line 1: "S1:__ S2:__", line 2: "DB:__ API:__"; values are two characters
+        draw.text((0, 0), "S1:", fill="white", font=self.font)
+        draw.text((self.font.getlength("S1:OK "), 0), "S2:", fill="white", font=self.font)
+        draw.text((0, 12), "DB:", fill="white", font=self.font)
+        draw.text((self.font.getlength("DB:OK "), 12), "API:", fill="white", font=self.font)
+        
+        # Line 3: Separator
+        draw.line((0, 24, 127, 24), fill="white")
+        
+        self._value_positions = tuple(
+            (int(self.font.getlength(prefix)), y) for prefix, y in
+            (("S1:", 0), ("S1:OK S2:", 0), ("DB:", 12), ("DB:OK API:", 12))
+        )
     
     def _refresh_display(self):
         """Refresh the display with current status"""
@@ -155,36 +297,39 @@ class DisplayManager:
             return
         
         try:
-            with self.lock:
-                slot1_status = "OK" if self.status['slot1_rx'] else "No"
-                slot2_status = "OK" if self.status['slot2_rx'] else "No"
-                db_status = "OK" if self.status['db_connected'] else "No"
-                api_status = "OK" if self.status['api_connected'] else "No"
-                dmr_data = self.status['last_dmr_data']
+            status = self._status
+            snapshot = (
+                status.slot1_rx,
+                status.slot2_rx,
+                status.db_connected,
+                status.api_connected,
+                status.dmr_lines
+            )
             
-            with canvas(self.device) as draw:
-                # Line 1: Slot statuses
-                draw.text((0, 0), f"S1:{slot1_status} S2:{slot2_status}", fill="white", font=self.font)
-                
-                # Line 2: Connection statuses
-                draw.text((0, 12), f"DB:{db_status} API:{api_status}", fill="white", font=self.font)
-                
-                # Line 3: Separator
-                draw.line((0, 24, 127, 24), fill="white")
-                
-                # Lines 4-6: DMR data (scrolling if needed)
-                if dmr_data:
-                    # Split into multiple lines if needed (approximately 21 chars per line)
-                    lines = []
-                    for i in range(0, len(dmr_data), 21):
-                        lines.append(dmr_data[i:i+21])
-                    
-                    y_pos = 28
-                    for line in lines[:3]:  # Max 3 lines
-                        draw.text((0, y_pos), line, fill="white", font=self.font)
-                        y_pos += 12
-                else:
-                    draw.text((0, 28), "Waiting for data...", fill="white", font=self.font)
+            # Nothing visible changed since the last frame
+            if snapshot == self._last_snapshot:
+                return
+            
+            # Draw from the snapshot; status updates never wait for the I2C transfer.
+            # Start from the static labels and separator, then paste cached text images.
+            image = self._base_image.copy()
+            
+            # Lines 1-2: Slot and connection status values
+            for connected, position in zip(snapshot[:4], self._value_positions):
+                image.paste(_render_text("OK" if connected else "No", self.font), position)
+            
+            # Lines 4-6: DMR data, wrapped by show_dmr_data
+            dmr_lines = snapshot[4]
+            if dmr_lines:
+                y_pos = 28
+                for line in dmr_lines:
+                    image.paste(_render_text(line, self.font), (0, y_pos))
+                    y_pos += 12
+            else:
+                image.paste(_render_text("Waiting for data...", self.font), (0, 28))
+            
+            self.device.display(image)
+            self._last_snapshot = snapshot
                     
         except Exception as e:
             logger.error(f"Error refreshing display: {e}")
@@ -199,6 +344,7 @@ class DisplayManager:
         if not self.enabled:
             return
         
+        self._last_snapshot = None
         try:
             with canvas(self.device) as draw:
                 draw.text((0, 10), "ERROR:", fill="white", font=self.font)
@@ -210,7 +356,7 @@ class DisplayManager:
                 
                 for word in words:
                     test_line = current_line + " " + word if current_line else word
-                    if len(test_line) <= 21:
+                    if len(test_line) <= self.line_chars:
                         current_line = test_line
                     else:
                         if current_line:
@@ -233,6 +379,7 @@ class DisplayManager:
         if not self.enabled:
             return
         
+        self._last_snapshot = None
         try:
             self.device.clear()
         except Exception as e:
@@ -245,5 +392,10 @@ class DisplayManager:
         Returns:
             Status dictionary
         """
-        with self.lock:
-            return self.status.copy()
+        status = self._status._asdict()
+        
+        # Updates store a monotonic timestamp; convert to wall-clock time only here
+        if status['last_update'] is not None:
+            status['last_update'] = datetime.now() - timedelta(seconds=time.monotonic() - status['last_update'])
+        
+        return status
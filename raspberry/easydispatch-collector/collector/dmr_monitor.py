@@ -3,7 +3,11 @@ DMR Monitor Module
 Monitors MMDVM log files in real-time to detect DMR transmissions
 """
 
+import mmap
+import os
 import re
+import selectors
+import signal
 import time
 import logging
 from datetime import datetime
@@ -12,44 +16,88 @@ from typing import Optional, Dict, Callable
 
 logger = logging.getLogger(__name__)
 
+# Try to import inotify for event-driven log following (optional)
+try:
+    from inotify_simple import INotify, flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
 
 class DMRMonitor:
     """Monitor DMR traffic from MMDVMHost logs"""
     
-    # Regex patterns for log parsing
+    # Regex patterns for log parsing; group names are unique across patterns
+    # so they can be combined into one alternation
     PATTERNS = {
         'voice_header': re.compile(
-            r'M:\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (\d+),\s+received voice header from (\d+) to (TG|PC) (\d+)'
+            r'M:\s+(?P<vh_time>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (?P<vh_slot>\d+),\s+received voice header from (?P<vh_radio>\d+) to (?P<vh_dest_type>TG|PC) (?P<vh_dest>\d+)'
         ),
         'voice_end': re.compile(
-            r'M:\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (\d+),\s+received voice end of transmission,\s+(\d+\.\d+)s,\s+BER: (\d+\.\d+)%'
+            r'M:\s+(?P<ve_time>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (?P<ve_slot>\d+),\s+received voice end of transmission,\s+(?P<ve_duration>\d+\.\d+)s,\s+BER: (?P<ve_ber>\d+\.\d+)%'
         ),
         'rssi': re.compile(
-            r'DMR Slot (\d+),\s+.*?RSSI:\s+(-?\d+)'
+            r'DMR Slot (?P<rssi_slot>\d+),\s+.*?RSSI:\s+(?P<rssi_value>-?\d+)'
         ),
         'data_header': re.compile(
-            r'M:\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (\d+),\s+received data header from (\d+) to (TG|PC) (\d+)'
+            r'M:\s+(?P<dh_time>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (?P<dh_slot>\d+),\s+received data header from (?P<dh_radio>\d+) to (?P<dh_dest_type>TG|PC) (?P<dh_dest>\d+)'
         ),
         'gps_data': re.compile(
-            r'DMR Slot (\d+),.*?GPS data'
+            r'DMR Slot (?P<gps_slot>\d+),.*?GPS data'
         ),
         'emergency': re.compile(
-            r'M:\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (\d+),.*?Emergency'
+            r'M:\s+(?P<em_time>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+DMR Slot (?P<em_slot>\d+),.*?Emergency'
         ),
     }
     
-    def __init__(self, log_path: str, callback: Optional[Callable] = None):
+    # Events handled by _process_line, in priority order
+    EVENTS = ('voice_header', 'voice_end', 'rssi', 'data_header', 'emergency')
+    
+    # Bytes read from the log per read call
+    READ_SIZE = 65536
+    
+    def __init__(self, log_path: str, callback: Optional[Callable] = None, backfill_bytes: int = 0):
         """
         Initialize DMR Monitor
         
         Args:
             log_path: Path to MMDVM log file
             callback: Callback function for transmission events
+            backfill_bytes: Rebuild ongoing transmissions from this many
+                trailing bytes of the log before following it (0 to start
+                at the end)
         """
         self.log_path = Path(log_path)
         self.callback = callback
+        self.backfill_bytes = backfill_bytes
         self.running = False
-        self.current_transmissions = {}  # Track ongoing transmissions
+        self._log_fd = None
+        self._log_watch = None  # inotify watch descriptor of the log file
+        self._pending = bytearray()  # Unterminated last line of the log
+        self.current_transmissions = {}  # Ongoing transmissions by slot (one per slot)
+        self._replaying = False  # Set during backfill: update state, but emit no events
+        
+        # Self-pipe that wakes the monitoring loop on stop()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._signal_wakeup = False  # Set while signals write to the wakeup pipe
+        
+        # All event patterns in one alternation, so each line is scanned once;
+        # the name of the matching alternative selects the handler. Compiled
+        # for bytes so log lines are never decoded as a whole.
+        self._combined = re.compile('|'.join(
+            f'(?P<{event}>{self.PATTERNS[event].pattern})' for event in self.EVENTS
+        ).encode())
+        
+        # Handler for each event, keyed by the alternative's group name
+        self._handlers = {
+            'voice_header': self._handle_voice_header,
+            'voice_end': self._handle_voice_end,
+            'rssi': self._handle_rssi,
+            'data_header': self._handle_data_header,
+            'emergency': self._handle_emergency,
+        }
         
         logger.info(f"Initialized DMR Monitor for log: {log_path}")
     
@@ -68,80 +116,268 @@ class DMRMonitor:
             self.stop()
     
     def stop(self):
-        """Stop monitoring"""
+        """Stop monitoring (safe to call from signal handlers and other threads)"""
         self.running = False
+        if self._wakeup_w is not None:
+            try:
+                os.write(self._wakeup_w, b'\0')
+            except (BlockingIOError, OSError):
+                pass  # Already woken
         logger.info("DMR monitoring stopped")
     
+    def close(self):
+        """
+        Release the wakeup pipe once monitoring has returned
+        
+        Signals stop writing to the pipe before it is closed. Must be
+        called from the main thread if stop_on_signals() was used.
+        """
+        if self._signal_wakeup:
+            signal.set_wakeup_fd(-1)
+            self._signal_wakeup = False
+        
+        if self._wakeup_r is not None:
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            self._wakeup_r = self._wakeup_w = None
+    
+    def stop_on_signals(self):
+        """
+        Stop monitoring as soon as a signal with a Python handler arrives
+        
+        The kernel-level signal handler writes the signal number to the
+        wakeup pipe, so the monitoring loop wakes at once instead of when
+        the interpreter next runs Python signal handlers. Must be called
+        from the main thread.
+        """
+        signal.set_wakeup_fd(self._wakeup_w, warn_on_full_buffer=False)
+        self._signal_wakeup = True
+    
     def _monitor_log(self):
         """Main monitoring loop using tail-like functionality"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_r, selectors.EVENT_READ, 'wakeup')
         
-        # Wait for log file to exist
-        while not self.log_path.exists() and self.running:
-            logger.warning(f"Log file not found: {self.log_path}, waiting...")
-            time.sleep(5)
+        try:
+            # Wait for log file to exist
+            while not self.log_path.exists() and self.running:
+                logger.warning(f"Log file not found: {self.log_path}, waiting...")
+                self._wait(selector, 5)
+            
+            if not self.running:
+                return
+            
+            logger.info(f"Monitoring log file: {self.log_path}")
+            
+            self._log_fd = os.open(str(self.log_path), os.O_RDONLY | os.O_NONBLOCK)
+            self._pending = bytearray()
+            
+            try:
+                # Seek to end of file, replaying recent events up to there first
+                end = os.lseek(self._log_fd, 0, os.SEEK_END)
+                if self.backfill_bytes:
+                    self.backfill(self.backfill_bytes, end)
+                
+                self._follow(selector)
+            finally:
+                os.close(self._log_fd)
+        finally:
+            selector.close()
+    
+    def _wait(self, selector: selectors.BaseSelector, timeout: float):
+        """Sleep up to timeout seconds, waking early on stop()"""
+        deadline = time.monotonic() + timeout
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            
+            for key, _ in selector.select(remaining):
+                if key.data == 'wakeup':
+                    self._drain_wakeup()
+    
+    def _drain_wakeup(self):
+        """Empty the wakeup pipe; any wakeup (stop() or a signal) ends monitoring"""
+        try:
+            while os.read(self._wakeup_r, 64):
+                pass
+        except BlockingIOError:
+            pass
+        self.running = False
+    
+    def _follow(self, selector: selectors.BaseSelector):
+        """
+        Follow the log file in one selector loop with stop wakeups
         
-        if not self.running:
-            return
+        With inotify the loop only reads when the kernel reports writes to
+        the log file itself, so writes to other files in the log directory
+        cause no wakeups. The directory is watched only for a rotated log
+        (created or moved into place under the same name), which is picked
+        up and read from the start. Without inotify the log is polled every
+        0.1s.
         
-        logger.info(f"Monitoring log file: {self.log_path}")
+        Args:
+            selector: Selector with the wakeup pipe registered
+        """
+        inotify = None
+        if INOTIFY_AVAILABLE:
+            inotify = INotify()
+            inotify.add_watch(str(self.log_path.parent), flags.CREATE | flags.MOVED_TO)
+            self._log_watch = inotify.add_watch(str(self.log_path), flags.MODIFY)
+            selector.register(inotify.fd, selectors.EVENT_READ, 'inotify')
         
-        with open(self.log_path, 'r') as f:
-            # Seek to end of file
-            f.seek(0, 2)
-            
+        try:
             while self.running:
-                line = f.readline()
+                for key, _ in selector.select(None if inotify is not None else 0.1):
+                    if key.data == 'wakeup':
+                        self._drain_wakeup()
+                    elif key.data == 'inotify':
+                        self._handle_inotify(inotify, inotify.read(timeout=0))
                 
-                if not line:
-                    # No new data, wait a bit
-                    time.sleep(0.1)
-                    continue
-                
-                # Process the line
-                self._process_line(line.strip())
+                if inotify is None:
+                    self._read_new_lines()
+        finally:
+            if inotify is not None:
+                selector.unregister(inotify.fd)
+                inotify.close()
     
-    def _process_line(self, line: str):
-        """Process a single log line"""
+    def _handle_inotify(self, inotify, events: list):
+        """
+        Read new lines and reopen the log after rotation
         
-        # Check for voice header (start of transmission)
-        match = self.PATTERNS['voice_header'].search(line)
-        if match:
-            self._handle_voice_header(match)
-            return
+        All events read in one wakeup are handled with a single read of the
+        log, however many writes they report.
         
-        # Check for voice end (end of transmission)
-        match = self.PATTERNS['voice_end'].search(line)
-        if match:
-            self._handle_voice_end(match)
+        Args:
+            inotify: INotify instance watching the log and its directory
+            events: inotify events for the log file and its directory
+        """
+        modified = any(e.wd == self._log_watch for e in events)
+        rotated = any(e.wd != self._log_watch and e.name == self.log_path.name for e in events)
+        if not (modified or rotated):
             return
         
-        # Check for RSSI updates
-        match = self.PATTERNS['rssi'].search(line)
-        if match:
-            self._handle_rssi(match)
-            return
+        self._read_new_lines()
         
-        # Check for data header
-        match = self.PATTERNS['data_header'].search(line)
-        if match:
-            self._handle_data_header(match)
+        if rotated:
+            logger.info(f"Log file rotated, reopening: {self.log_path}")
+            try:
+                # Move the file watch to the new log before opening it, so no write is missed
+                try:
+                    inotify.rm_watch(self._log_watch)
+                except OSError:
+                    pass  # Watch already removed with the old log
+                self._log_watch = inotify.add_watch(str(self.log_path), flags.MODIFY)
+                fd = os.open(str(self.log_path), os.O_RDONLY | os.O_NONBLOCK)
+            except OSError as e:
+                logger.warning(f"Failed to reopen log file: {e}")
+                return
+            
+            # The old log's unterminated last line is complete now
+            if self._pending:
+                self._process_line(bytes(self._pending).strip())
+                self._pending = bytearray()
+            
+            os.close(self._log_fd)
+            self._log_fd = fd
+            self._read_new_lines()
+    
+    def _read_new_lines(self) -> bool:
+        """
+        Process all complete lines appended since the last read
+        
+        The log is read in large chunks and split into lines here; an
+        unterminated last line is kept until the rest of it arrives.
+        
+        Returns:
+            True if any data was read
+        """
+        got_data = False
+        
+        while True:
+            data = os.read(self._log_fd, self.READ_SIZE)
+            if not data:
+                return got_data
+            got_data = True
+            
+            self._pending += data
+            *lines, self._pending = self._pending.split(b'\n')
+            for line in lines:
+                self._process_line(line.strip())
+    
+    def _process_line(self, line: bytes):
+        """Process a single log line"""
+        # Every event line names a slot; skip the rest without a regex search
+        if b'DMR Slot' not in line:
             return
         
-        # Check for emergency
-        match = self.PATTERNS['emergency'].search(line)
+        match = self._combined.search(line)
         if match:
-            self._handle_emergency(match)
-            return
+            self._dispatch(match)
     
-    def _handle_voice_header(self, match):
-        """Handle voice transmission start"""
-        timestamp_str, slot, radio_id, dest_type, dest_id = match.groups()
+    def _dispatch(self, match):
+        """Pass a combined pattern match to the handler for its event"""
+        self._handlers[match.lastgroup](match)
+    
+    def _emit(self, event_type: str, data: dict):
+        """Pass an event to the callback, unless replaying history"""
+        if self.callback and not self._replaying:
+            self.callback(event_type, data)
+    
+    def backfill(self, bytes_back: int, end: Optional[int] = None) -> int:
+        """
+        Rebuild monitor state from the tail of the log, e.g. after a restart
+        
+        Historic events only update state such as current_transmissions;
+        they are not passed to the callback, so transmissions that were
+        already reported are not sent, recorded or displayed again. A call
+        still in progress is reported when its end is logged.
         
-        slot = int(slot)
-        radio_id = int(radio_id)
-        dest_id = int(dest_id)
+        The log is memory-mapped and the combined pattern is swept over the
+        region in one pass, without reading it line by line.
         
-        key = f"{slot}_{radio_id}"
+        Args:
+            bytes_back: Number of bytes before end to scan
+            end: Offset to stop at (defaults to the current file size)
+            
+        Returns:
+            Number of events read from the log
+        """
+        count = 0
+        
+        with open(self.log_path, 'rb') as f:
+            if end is None:
+                end = os.fstat(f.fileno()).st_size
+            if not end:
+                return 0  # Empty files cannot be mapped
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = min(end, len(mm))
+                
+                # Start at the first full line in the region
+                start = max(0, end - bytes_back)
+                if start:
+                    start = mm.find(b'\n', start - 1, end) + 1 or end
+                
+                self._replaying = True
+                try:
+                    for match in self._combined.finditer(mm, start, end):
+                        self._dispatch(match)
+                        count += 1
+                finally:
+                    self._replaying = False
+        
+        logger.info(f"Backfilled {count} DMR events from the last {end - start} bytes of the log "
+                    f"({len(self.current_transmissions)} transmissions in progress)")
+        return count
+    
+    def _handle_voice_header(self, match):
+        """Handle voice transmission start"""
+        timestamp_str = match.group('vh_time').decode('ascii')
+        slot = int(match.group('vh_slot'))
+        radio_id = int(match.group('vh_radio'))
+        dest_type = match.group('vh_dest_type').decode('ascii')
+        dest_id = int(match.group('vh_dest'))
         
         transmission = {
             'type': 'voice',
@@ -154,59 +390,51 @@ class DMRMonitor:
             'ber': None,
         }
         
-        self.current_transmissions[key] = transmission
+        self.current_transmissions[slot] = transmission
         
         logger.info(f"Voice transmission started: Slot {slot}, Radio {radio_id} -> {dest_type} {dest_id}")
         
         # Trigger callback for transmission start
-        if self.callback:
-            self.callback('transmission_start', transmission)
+        self._emit('transmission_start', transmission)
     
     def _handle_voice_end(self, match):
         """Handle voice transmission end"""
-        timestamp_str, slot, duration, ber = match.groups()
-        
-        slot = int(slot)
-        duration = float(duration)
-        ber = float(ber)
-        
-        # Find the transmission in current_transmissions
-        for key, transmission in list(self.current_transmissions.items()):
-            if transmission['slot'] == slot and transmission['type'] == 'voice':
-                transmission['end_time'] = self._parse_timestamp(timestamp_str)
-                transmission['duration'] = duration
-                transmission['ber'] = ber
-                
-                logger.info(f"Voice transmission ended: Slot {slot}, Duration {duration}s, BER {ber}%")
-                
-                # Trigger callback for transmission end
-                if self.callback:
-                    self.callback('transmission_end', transmission)
-                
-                # Remove from current transmissions
-                del self.current_transmissions[key]
-                break
+        timestamp_str = match.group('ve_time').decode('ascii')
+        slot = int(match.group('ve_slot'))
+        duration = float(match.group('ve_duration'))
+        ber = float(match.group('ve_ber'))
+        
+        # Remove the slot's transmission from current transmissions
+        transmission = self.current_transmissions.pop(slot, None)
+        if not transmission or transmission['type'] != 'voice':
+            return
+        
+        transmission['end_time'] = self._parse_timestamp(timestamp_str)
+        transmission['duration'] = duration
+        transmission['ber'] = ber
+        
+        logger.info(f"Voice transmission ended: Slot {slot}, Duration {duration}s, BER {ber}%")
+        
+        # Trigger callback for transmission end
+        self._emit('transmission_end', transmission)
     
     def _handle_rssi(self, match):
         """Handle RSSI update"""
-        slot, rssi = match.groups()
-        
-        slot = int(slot)
-        rssi = int(rssi)
+        slot = int(match.group('rssi_slot'))
+        rssi = int(match.group('rssi_value'))
         
         # Update RSSI in current transmission
-        for transmission in self.current_transmissions.values():
-            if transmission['slot'] == slot:
-                transmission['rssi'] = rssi
-                break
+        transmission = self.current_transmissions.get(slot)
+        if transmission:
+            transmission['rssi'] = rssi
     
     def _handle_data_header(self, match):
         """Handle data transmission start"""
-        timestamp_str, slot, radio_id, dest_type, dest_id = match.groups()
-        
-        slot = int(slot)
-        radio_id = int(radio_id)
-        dest_id = int(dest_id)
+        timestamp_str = match.group('dh_time').decode('ascii')
+        slot = int(match.group('dh_slot'))
+        radio_id = int(match.group('dh_radio'))
+        dest_type = match.group('dh_dest_type').decode('ascii')
+        dest_id = int(match.group('dh_dest'))
         
         data_transmission = {
             'type': 'data',
@@ -220,14 +448,12 @@ class DMRMonitor:
         logger.info(f"Data transmission: Slot {slot}, Radio {radio_id} -> {dest_type} {dest_id}")
         
         # Trigger callback for data transmission
-        if self.callback:
-            self.callback('data_transmission', data_transmission)
+        self._emit('data_transmission', data_transmission)
     
     def _handle_emergency(self, match):
         """Handle emergency alert"""
-        timestamp_str, slot = match.groups()
-        
-        slot = int(slot)
+        timestamp_str = match.group('em_time').decode('ascii')
+        slot = int(match.group('em_slot'))
         
         emergency = {
             'type': 'emergency',
@@ -238,11 +464,16 @@ class DMRMonitor:
         logger.warning(f"EMERGENCY detected on Slot {slot}!")
         
         # Trigger callback for emergency
-        if self.callback:
-            self.callback('emergency', emergency)
+        self._emit('emergency', emergency)
     
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse MMDVM log timestamp"""
+        try:
+            # MMDVM's "YYYY-MM-DD HH:MM:SS.mmm" is ISO 8601 with a space separator
+            return datetime.fromisoformat(timestamp_str)
+        except ValueError:
+            pass
+        
         try:
             return datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S.%f')
         except ValueError:
@@ -0,0 +1,87 @@
+"""
+Scheduler Module
+Runs periodic tasks on a single thread, ordered by deadline
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from threading import Event, Thread
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Run periodic callbacks from one thread using a heap of deadlines"""
+    
+    def __init__(self):
+        """Initialize an empty scheduler"""
+        # Entries: (deadline, sequence, interval, callback); the sequence
+        # keeps ordering stable for equal deadlines
+        self._tasks: List[Tuple[float, int, float, Callable]] = []
+        self._sequence = itertools.count()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+    
+    def add(self, interval: float, callback: Callable) -> 'Scheduler':
+        """
+        Add a periodic task (before the scheduler is started)
+        
+        The first call is immediate; later calls follow interval seconds
+        after the previous call returned.
+        
+        Args:
+            interval: Seconds between calls
+            callback: Function called without arguments
+        
+        Returns:
+            The scheduler, so calls can be chained
+        """
+        heapq.heappush(self._tasks, (time.monotonic(), next(self._sequence), interval, callback))
+        return self
+    
+    def start_thread(self) -> 'Scheduler':
+        """
+        Run the scheduler on a background thread
+        
+        Returns:
+            The scheduler
+        """
+        self._stop_event.clear()
+        self._thread = Thread(target=self.run, name='scheduler', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: float = 5):
+        """
+        Stop the scheduler and wait for a running task to finish
+        
+        Args:
+            timeout: Max seconds to wait for the scheduler thread
+        """
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+    
+    def run(self):
+        """Call due tasks until stopped"""
+        while not self._stop_event.is_set():
+            if not self._tasks:
+                self._stop_event.wait()
+                continue
+            
+            delay = self._tasks[0][0] - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+                continue
+            
+            _, sequence, interval, callback = heapq.heappop(self._tasks)
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in scheduled task {getattr(callback, '__name__', callback)}: {e}",
+                             exc_info=True)
+            
+            heapq.heappush(self._tasks, (time.monotonic() + interval, sequence, interval, callback))
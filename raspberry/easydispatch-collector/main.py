@@ -3,35 +3,41 @@ EasyDispatch Collector - Main Entry Point
 Monitors DMR traffic and sends data to backend API
 """
 
+import os
 import sys
+import copy
 import signal
+import shutil
+import subprocess
 import time
 import logging
 import logging.config
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C extension
+except ImportError:
+    from yaml import SafeLoader
+from functools import lru_cache
 from pathlib import Path
-from threading import Thread, Event
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Semaphore, Thread
 
-from collector import DMRMonitor, AudioCapture, DataParser, APIClient, CommandHandler, DisplayManager
-try:
-    from collector.audio_streamer import AudioStreamer
-    AUDIO_STREAMING_AVAILABLE = True
-except ImportError as e:
-    AUDIO_STREAMING_AVAILABLE = False
-    AudioStreamer = None
-    import logging
-    logging.getLogger(__name__).debug(f"Audio streaming not available: {e}")
+# Optional components (audio streaming) are imported when used
+from collector import DMRMonitor, AudioCapture, APIClient, CommandHandler, DisplayManager, Scheduler
+from collector.affinity import pin_current_thread, reserve_cpu
+from collector.logging_config import LOGGING_DEFAULT
 
 
-# Global stop event
-stop_event = Event()
+# Marker recording a successful FFmpeg probe, so service restarts skip it
+FFMPEG_PROBE_MARKER = Path('/run/easydispatch/.ffmpeg_ok')
 
 
 def load_config(config_path: str) -> dict:
     """Load configuration from YAML file"""
     try:
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        with open(config_path, 'rb') as f:
+            return yaml.load(f, Loader=SafeLoader)
     except Exception as e:
         print(f"Error loading configuration: {e}")
         sys.exit(1)
@@ -40,47 +46,115 @@ def load_config(config_path: str) -> dict:
 def setup_logging(config: dict):
     """Setup logging configuration"""
     try:
-        log_config_path = Path(__file__).parent / 'config' / 'logging.yaml'
-        
-        if log_config_path.exists():
-            with open(log_config_path, 'r') as f:
-                log_config = yaml.safe_load(f)
-                
-            # Update log file path from main config if specified
-            if 'logging' in config and 'file' in config['logging']:
-                log_config['handlers']['file']['filename'] = config['logging']['file']
-            
-            # Update log level from main config if specified
-            if 'logging' in config and 'level' in config['logging']:
-                log_config['root']['level'] = config['logging']['level']
-            
-            logging.config.dictConfig(log_config)
-        else:
-            # Fallback to basic config
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
+        log_config = copy.deepcopy(LOGGING_DEFAULT)
+        log_settings = config.get('logging', {})
+        file_handler = log_config['handlers']['file']
+        
+        # Update log file path and rotation from main config if specified
+        if 'file' in log_settings:
+            file_handler['filename'] = log_settings['file']
+        if 'max_bytes' in log_settings:
+            file_handler['maxBytes'] = log_settings['max_bytes']
+        if 'backup_count' in log_settings:
+            file_handler['backupCount'] = log_settings['backup_count']
+        
+        # Update log level from main config if specified
+        if 'level' in log_settings:
+            log_config['root']['level'] = log_settings['level']
+        
+        logging.config.dictConfig(log_config)
     except Exception as e:
         print(f"Error setting up logging: {e}")
         logging.basicConfig(level=logging.INFO)
 
 
+@lru_cache(maxsize=1)
+def ffmpeg_available() -> bool:
+    """
+    Check whether a working FFmpeg is installed
+    
+    The binary is located with shutil.which and only executed when it
+    changed since the last successful probe recorded in FFMPEG_PROBE_MARKER.
+    
+    Returns:
+        True if FFmpeg can be run
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        return False
+    
+    fingerprint = f"{ffmpeg}:{os.stat(ffmpeg).st_mtime_ns}"
+    try:
+        if FFMPEG_PROBE_MARKER.read_text() == fingerprint:
+            return True
+    except OSError:
+        pass
+    
+    try:
+        result = subprocess.run([ffmpeg, '-version'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.getLogger(__name__).error("FFmpeg check failed: %s", e)
+        return False
+    
+    if result.returncode != 0:
+        return False
+    
+    try:
+        FFMPEG_PROBE_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        FFMPEG_PROBE_MARKER.write_text(fingerprint)
+    except OSError:
+        pass  # Probe again on the next start
+    
+    return True
+
+
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
     logger = logging.getLogger(__name__)
-    logger.info(f"Received signal {signum}, shutting down...")
-    stop_event.set()
+    logger.info("Received signal %s, shutting down...", signum)
+
+
+class Recording:
+    """Audio recording state of one DMR slot, reset in place for every transmission"""
+    
+    __slots__ = ('recording_id', 'radio_id', 'destination_id', 'start_time', 'in_use')
+    
+    def __init__(self):
+        """Initialize an unused recording slot"""
+        self.reset()
+    
+    def reset(self):
+        """Mark the slot unused"""
+        self.recording_id = None
+        self.radio_id = None
+        self.destination_id = None
+        self.start_time = None
+        self.in_use = False
 
 
 class EasyDispatchCollector:
     """Main collector application"""
     
+    # Display line templates, filled from DMR event data
+    _TX_START_FMT = "RX S{slot}: {radio_id} -> TG{destination_id}".format_map
+    _TX_END_FMT = "END S{slot}: {duration}s, BER:{ber:.1f}%".format_map
+    _DATA_FMT = "DATA S{slot}: {radio_id} -> {destination_type}{destination_id}".format_map
+    _EMERGENCY_FMT = "!!! EMERGENCY !!! Slot {slot}".format_map
+    
     def __init__(self, config: dict):
         """Initialize collector with configuration"""
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # On 4+ core Pis the last core is reserved for the DMR monitor and
+        # event threads, before components start threads that would inherit it
+        self.monitor_nice = config['mmdvm'].get('monitor_nice', -5)
+        self.monitor_cpu = None
+        cpu_count = os.cpu_count() or 1
+        if config['mmdvm'].get('dedicated_cpu', True) and cpu_count >= 4 and reserve_cpu(cpu_count - 1):
+            self.monitor_cpu = cpu_count - 1
+        
         # Initialize display manager first
         display_config = config.get('display', {'enabled': False})
         self.display_manager = DisplayManager(display_config)
@@ -88,51 +162,64 @@ class EasyDispatchCollector:
         # Initialize components
         self.api_client = APIClient(config['api'])
         self.audio_capture = AudioCapture(config['audio'])
-        self.data_parser = DataParser()
         self.command_handler = CommandHandler({
             'mmdvm_config_path': config['mmdvm']['config_path'],
-            'dmr_id': config['raspberry']['dmr_id']
+            'dmr_id': config['raspberry']['dmr_id'],
+            'persistent_tools': config['mmdvm'].get('persistent_tools', False)
         })
         
         # Initialize audio streaming if enabled
         self.audio_streamer = None
-        if AUDIO_STREAMING_AVAILABLE and config.get('audio_streaming', {}).get('enabled', False):
+        if config.get('audio_streaming', {}).get('enabled', False):
             try:
-                # Check if FFmpeg is available
-                import subprocess
-                result = subprocess.run(['ffmpeg', '-version'], 
-                                      capture_output=True, timeout=5)
-                if result.returncode == 0:
+                from collector.audio_streamer import AudioStreamer
+            except ImportError as e:
+                self.logger.warning("Audio streaming not available (missing dependencies): %s", e)
+            else:
+                if ffmpeg_available():
                     self.logger.info("Audio streaming is enabled")
-                    self.audio_streamer = AudioStreamer(config['audio_streaming'], self.api_client)
+                    # Fed by the recorder's capture, so only one process opens the device
+                    self.audio_streamer = AudioStreamer(config['audio_streaming'], self.api_client,
+                                                        audio_source=self.audio_capture)
                 else:
                     self.logger.error("FFmpeg not available, audio streaming disabled")
-            except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-                self.logger.error(f"FFmpeg check failed: {e}. Audio streaming disabled.")
         else:
-            if not AUDIO_STREAMING_AVAILABLE:
-                self.logger.warning("Audio streaming not available (missing dependencies)")
-            else:
-                self.logger.info("Audio streaming is disabled in configuration")
+            self.logger.info("Audio streaming is disabled in configuration")
+        
+        # Audio recording of each DMR slot (index slot - 1), allocated once
+        self.active_recordings = (Recording(), Recording())
+        
+        # Handler for each DMR event type
+        self._handlers = {
+            'transmission_start': self.handle_transmission_start,
+            'transmission_end': self.handle_transmission_end,
+            'data_transmission': self.handle_data_transmission,
+            'emergency': self.handle_emergency,
+        }
         
-        # Track active audio recordings
-        self.active_recordings = {}
+        # Bounded ring buffer between the DMR monitor (producer) and the
+        # event thread (consumer), so slow handlers never stall log reading
+        self.event_buffer_size = config['mmdvm'].get('event_buffer', 1024)
+        self._event_ring = deque()
+        self._event_semaphore = Semaphore(0)
+        self._event_thread = None
+        self.dropped_events = 0
         
         # Initialize DMR monitor with callback
         self.dmr_monitor = DMRMonitor(
             config['mmdvm']['log_path'],
-            callback=self.handle_dmr_event
+            callback=self.handle_dmr_event,
+            backfill_bytes=config['mmdvm'].get('backfill_bytes', 0)
         )
         
         # Polling intervals
         self.commands_interval = config['polling']['commands_interval']
         self.status_interval = config['polling']['status_update_interval']
         self.cleanup_interval = config['polling'].get('cleanup_interval', 3600)
+        self.command_workers = config['polling'].get('command_workers', 4)
         
-        # Background threads
-        self.command_thread = None
-        self.cleanup_thread = None
-        self.status_thread = None
+        # Periodic tasks share one scheduler thread
+        self.scheduler = None
         
         self.logger.info("EasyDispatch Collector initialized")
     
@@ -140,22 +227,27 @@ class EasyDispatchCollector:
         """Start the collector"""
         self.logger.info("Starting EasyDispatch Collector...")
         
+        # Keep capturing from now on, so recordings start without delay
+        if not self.audio_capture.start():
+            self.logger.error("Audio recorder not running, retrying on the next transmission")
+        
         # Start API client queue processor
         self.api_client.start_queue_processor()
         
-        # Start command polling thread
-        self.command_thread = Thread(target=self.command_polling_loop, daemon=True)
-        self.command_thread.start()
-        
-        # Start cleanup thread
-        self.cleanup_thread = Thread(target=self.cleanup_loop, daemon=True)
-        self.cleanup_thread.start()
+        # Start command polling, status monitoring and cleanup
+        self.scheduler = (Scheduler()
+                          .add(self.commands_interval, self.poll_commands)
+                          .add(self.status_interval, self.check_status)
+                          .add(self.cleanup_interval, self.cleanup_old_audio)
+                          .start_thread())
         
-        # Start status monitoring thread
-        self.status_thread = Thread(target=self.status_monitoring_loop, daemon=True)
-        self.status_thread.start()
+        # Start DMR event processing
+        self._event_thread = Thread(target=self._process_events, name='dmr-events', daemon=True)
+        self._event_thread.start()
         
-        # Start DMR monitoring (blocking)
+        # Start DMR monitoring (blocking) on the reserved core
+        if self._pin_to_monitor_cpu():
+            self.logger.info("DMR monitoring pinned to CPU %d", self.monitor_cpu)
         try:
             self.dmr_monitor.start()
         except KeyboardInterrupt:
@@ -170,15 +262,34 @@ class EasyDispatchCollector:
         # Stop DMR monitor
         self.dmr_monitor.stop()
         
+        # Finish handling buffered DMR events
+        if self._event_thread and self._event_thread.is_alive():
+            self._event_ring.append(None)
+            self._event_semaphore.release()
+            self._event_thread.join(timeout=10)
+        
+        # Stop periodic tasks
+        if self.scheduler:
+            self.scheduler.stop()
+        
         # Stop audio streaming if active
         if self.audio_streamer:
             self.audio_streamer.cleanup_all()
         
+        # Stop audio recorder
+        self.audio_capture.close()
+        
+        # Stop persistent DMR tool helpers
+        self.command_handler.close()
+        
+        # Stop display updates
+        self.display_manager.stop()
+        
         # Stop API client
         self.api_client.stop_queue_processor()
         
-        # Set stop event for threads
-        stop_event.set()
+        # Release the DMR monitor's wakeup pipe and signal wakeups
+        self.dmr_monitor.close()
         
         self.logger.info("EasyDispatch Collector stopped")
     
@@ -186,32 +297,54 @@ class EasyDispatchCollector:
         """
         Handle DMR events from monitor
         
+        Events are buffered for the event thread; when the buffer is full
+        the new event is dropped rather than blocking the monitor.
+        
         Args:
             event_type: Type of event
             data: Event data
         """
-        try:
-            if event_type == 'transmission_start':
-                self.handle_transmission_start(data)
-            elif event_type == 'transmission_end':
-                self.handle_transmission_end(data)
-            elif event_type == 'data_transmission':
-                self.handle_data_transmission(data)
-            elif event_type == 'emergency':
-                self.handle_emergency(data)
-        except Exception as e:
-            self.logger.error(f"Error handling DMR event: {e}", exc_info=True)
+        if len(self._event_ring) >= self.event_buffer_size:
+            self.dropped_events += 1
+            self.logger.warning("DMR event buffer full, dropped %s (total dropped: %d)",
+                                event_type, self.dropped_events)
+            return
+        
+        self._event_ring.append((event_type, data))
+        self._event_semaphore.release()
+    
+    def _pin_to_monitor_cpu(self) -> bool:
+        """Pin the calling thread to the reserved core, if any, at monitoring priority"""
+        return self.monitor_cpu is not None and pin_current_thread({self.monitor_cpu}, self.monitor_nice)
+    
+    def _process_events(self):
+        """Handle buffered DMR events in order until the stop sentinel"""
+        # Threads and subprocesses started by the handlers move back to the shared cores
+        self._pin_to_monitor_cpu()
+        
+        while True:
+            self._event_semaphore.acquire()
+            event = self._event_ring.popleft()
+            if event is None:
+                return
+            
+            event_type, data = event
+            handler = self._handlers.get(event_type)
+            if not handler:
+                continue
+            
+            try:
+                handler(data)
+            except Exception as e:
+                self.logger.error("Error handling DMR event: %s", e, exc_info=True)
     
     def handle_transmission_start(self, transmission: dict):
         """Handle start of voice transmission"""
-        self.logger.info(f"Transmission started: Slot {transmission['slot']}, Radio {transmission['radio_id']}")
-        
-        # Update display - slot is receiving
-        self.display_manager.update_slot_status(transmission['slot'], True)
+        self.logger.info("Transmission started: Slot %s, Radio %s", transmission['slot'], transmission['radio_id'])
         
-        # Format DMR data string for display
-        dmr_string = f"RX S{transmission['slot']}: {transmission['radio_id']} -> TG{transmission['destination_id']}"
-        self.display_manager.show_dmr_data(dmr_string)
+        # Update display - slot is receiving (skip formatting when there is no display)
+        if self.display_manager.enabled:
+            self.display_manager.show_slot_activity(transmission['slot'], True, self._TX_START_FMT(transmission))
         
         # Start audio recording
         recording_id = self.audio_capture.start_recording(
@@ -221,10 +354,12 @@ class EasyDispatchCollector:
         )
         
         if recording_id:
-            self.active_recordings[f"{transmission['slot']}_{transmission['radio_id']}"] = {
-                'recording_id': recording_id,
-                'transmission': transmission
-            }
+            recording = self.active_recordings[transmission['slot'] - 1]
+            recording.recording_id = recording_id
+            recording.radio_id = transmission['radio_id']
+            recording.destination_id = transmission['destination_id']
+            recording.start_time = transmission['start_time']
+            recording.in_use = True
         
         # Start audio streaming if enabled
         if self.audio_streamer:
@@ -235,7 +370,7 @@ class EasyDispatchCollector:
                     transmission['destination_id']
                 )
             except Exception as e:
-                self.logger.error(f"Failed to start audio streaming: {e}", exc_info=True)
+                self.logger.error("Failed to start audio streaming: %s", e, exc_info=True)
         
         # Update radio status to online
         self.api_client.post_radio_status(
@@ -247,45 +382,40 @@ class EasyDispatchCollector:
     
     def handle_transmission_end(self, transmission: dict):
         """Handle end of voice transmission"""
-        self.logger.info(f"Transmission ended: Slot {transmission['slot']}, Duration {transmission['duration']}s")
+        self.logger.info("Transmission ended: Slot %s, Duration %ss", transmission['slot'], transmission['duration'])
         
         # Update display - slot is no longer receiving
-        self.display_manager.update_slot_status(transmission['slot'], False)
-        
-        # Format DMR data string for display
-        dmr_string = f"END S{transmission['slot']}: {transmission['duration']}s, BER:{transmission.get('ber', 0):.1f}%"
-        self.display_manager.show_dmr_data(dmr_string)
+        if self.display_manager.enabled:
+            self.display_manager.show_slot_activity(transmission['slot'], False, self._TX_END_FMT(transmission))
         
         # Stop audio streaming if enabled
         if self.audio_streamer:
             try:
                 self.audio_streamer.stop_stream(transmission['slot'])
             except Exception as e:
-                self.logger.error(f"Failed to stop audio streaming: {e}", exc_info=True)
+                self.logger.error("Failed to stop audio streaming: %s", e, exc_info=True)
         
         # Stop audio recording
-        key = f"{transmission['slot']}_{transmission['radio_id']}"
-        if key in self.active_recordings:
-            recording_info = self.active_recordings[key]
-            recording_id = recording_info['recording_id']
+        recording = self.active_recordings[transmission['slot'] - 1]
+        if recording.in_use:
+            recording_id = recording.recording_id
+            recording.reset()
             
             audio_file = self.audio_capture.stop_recording(recording_id)
             
-            # Post transmission to API
-            self.api_client.post_transmission(transmission, audio_file)
-            
-            del self.active_recordings[key]
+            # Upload transmission in the background
+            self.api_client.enqueue('transmission', transmission, audio_file)
         else:
-            # Post transmission without audio
-            self.api_client.post_transmission(transmission)
+            # Queue transmission without audio for the next batch
+            self.api_client.enqueue('transmission', transmission)
     
     def handle_data_transmission(self, data: dict):
         """Handle data transmission (SMS, GPS, etc.)"""
-        self.logger.info(f"Data transmission: Slot {data['slot']}, Radio {data['radio_id']}")
+        self.logger.info("Data transmission: Slot %s, Radio %s", data['slot'], data['radio_id'])
         
-        # Format DMR data string for display
-        dmr_string = f"DATA S{data['slot']}: {data['radio_id']} -> {data['destination_type']}{data['destination_id']}"
-        self.display_manager.show_dmr_data(dmr_string)
+        # Show DMR data on display
+        if self.display_manager.enabled:
+            self.display_manager.show_dmr_data(self._DATA_FMT(data))
         
         # Try to parse as SMS
         # Note: In real implementation, raw data would be available from MMDVM
@@ -296,11 +426,11 @@ class EasyDispatchCollector:
     
     def handle_emergency(self, emergency: dict):
         """Handle emergency alert"""
-        self.logger.warning(f"EMERGENCY: Slot {emergency['slot']}")
+        self.logger.warning("EMERGENCY: Slot %s", emergency['slot'])
         
         # Show emergency on display
-        dmr_string = f"!!! EMERGENCY !!! Slot {emergency['slot']}"
-        self.display_manager.show_dmr_data(dmr_string)
+        if self.display_manager.enabled:
+            self.display_manager.show_dmr_data(self._EMERGENCY_FMT(emergency))
         
         # Find the radio ID from current transmissions
         # In real implementation, this would be parsed from the emergency packet
@@ -311,74 +441,63 @@ class EasyDispatchCollector:
             'triggered_at': emergency['timestamp']
         }
         
-        self.api_client.post_emergency(emergency_data)
+        self.api_client.enqueue('emergency', emergency_data)
     
-    def command_polling_loop(self):
-        """Poll for pending commands from API"""
-        self.logger.info("Started command polling loop")
-        
-        while not stop_event.is_set():
-            try:
-                # Get pending commands
-                commands = self.api_client.get_pending_commands()
-                
-                for command in commands:
-                    command_id = command['id']
-                    self.logger.info(f"Executing command {command_id}: {command['command_type']}")
-                    
-                    # Execute command
-                    success, error_message = self.command_handler.execute_command(command)
-                    
-                    # Post result
-                    status = 'completed' if success else 'failed'
-                    self.api_client.post_command_result(command_id, status, error_message)
-                
-            except Exception as e:
-                self.logger.error(f"Error in command polling: {e}", exc_info=True)
+    def poll_commands(self):
+        """Poll for pending commands from API and execute them"""
+        try:
+            # Get pending commands
+            commands = self.api_client.get_pending_commands()
+            outcomes = []
             
-            # Wait before next poll
-            stop_event.wait(self.commands_interval)
+            for command in commands:
+                self.logger.info("Executing command %s: %s", command['id'], command['command_type'])
+            
+            # Execute commands in parallel
+            if commands:
+                workers = max(1, min(self.command_workers, len(commands)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='command') as executor:
+                    outcomes = list(executor.map(self.command_handler.execute_command, commands))
+            
+            # Post all results together, with any that failed to post last time
+            self.api_client.post_command_results([
+                (command['id'], 'completed' if success else 'failed', error_message)
+                for command, (success, error_message) in zip(commands, outcomes)
+            ])
+            
+        except Exception as e:
+            self.logger.error("Error in command polling: %s", e, exc_info=True)
     
-    def cleanup_loop(self):
+    def cleanup_old_audio(self):
         """Periodic cleanup of old audio files"""
-        self.logger.info("Started cleanup loop")
-        
-        while not stop_event.is_set():
-            try:
-                self.audio_capture.cleanup_old_files(max_age_hours=24)
-            except Exception as e:
-                self.logger.error(f"Error in cleanup: {e}", exc_info=True)
-            
-            # Wait before next cleanup
-            stop_event.wait(self.cleanup_interval)
+        try:
+            self.audio_capture.cleanup_old_files(max_age_hours=24)
+        except Exception as e:
+            self.logger.error("Error in cleanup: %s", e, exc_info=True)
     
-    def status_monitoring_loop(self):
-        """Periodic monitoring of system status and display updates"""
-        self.logger.info("Started status monitoring loop")
-        
-        while not stop_event.is_set():
-            try:
-                # Check API connectivity
-                api_connected = self.api_client.check_api_connection()
-                self.display_manager.update_api_status(api_connected)
-                
-                # Check DB connectivity
-                db_connected = self.api_client.check_db_connection()
-                self.display_manager.update_db_status(db_connected)
-                
-                if not api_connected:
-                    self.logger.warning("API connection check failed")
-                
-                if not db_connected:
-                    self.logger.warning("DB connection check failed")
-                    
-            except Exception as e:
-                self.logger.error(f"Error in status monitoring: {e}", exc_info=True)
-                self.display_manager.update_api_status(False)
-                self.display_manager.update_db_status(False)
+    def check_status(self):
+        """Check system status and update the display"""
+        try:
+            # Recent API traffic already proves connectivity; otherwise check
+            # the API and DB with one request
+            if self.api_client.succeeded_within(self.status_interval):
+                api_connected = db_connected = True
+            else:
+                api_connected, db_connected = self.api_client.check_connections()
+            
+            self.display_manager.update_api_status(api_connected)
+            self.display_manager.update_db_status(db_connected)
+            
+            if not api_connected:
+                self.logger.warning("API connection check failed")
             
-            # Wait before next check
-            stop_event.wait(self.status_interval)
+            if not db_connected:
+                self.logger.warning("DB connection check failed")
+                
+        except Exception as e:
+            self.logger.error("Error in status monitoring: %s", e, exc_info=True)
+            self.display_manager.update_api_status(False)
+            self.display_manager.update_db_status(False)
 
 
 def main():
@@ -419,12 +538,16 @@ def main():
     logger.info("EasyDispatch Collector Starting")
     logger.info("=" * 60)
     
-    # Register signal handlers
+    # Create collector
+    collector = EasyDispatchCollector(config)
+    
+    # Register signal handlers; the signals themselves wake the DMR monitor
+    # through its wakeup pipe, so start() returns and stops the collector
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    collector.dmr_monitor.stop_on_signals()
     
-    # Create and start collector
-    collector = EasyDispatchCollector(config)
+    # Start collector
     collector.start()
 
 
@@ -3,6 +3,12 @@ from setuptools import setup, find_packages
 with open("requirements.txt") as f:
     requirements = f.read().splitlines()
 
+with open("requirements-optional.txt") as f:
+    optional_requirements = [line for line in f.read().splitlines() if line and not line.startswith("#")]
+
+with open("requirements-dev.txt") as f:
+    test_requirements = [line for line in f.read().splitlines() if line and not line.startswith("#")]
+
 setup(
     name="easydispatch-collector",
     version="1.0.0",
@@ -12,6 +18,10 @@ setup(
     url="https://github.com/cris-deitos/EasyDispatch",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={
+        'speedups': optional_requirements,
+        'test': test_requirements,
+    },
     entry_points={
         'console_scripts': [
             'easydispatch-collector=main:main',
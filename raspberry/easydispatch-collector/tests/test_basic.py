@@ -1,22 +1,41 @@
 #!/usr/bin/env python3
 """
 Basic unit tests for EasyDispatch collector
-Tests display manager, API client, and audio management
+Tests display manager, API client, audio management, and data parsing
 """
 
 import sys
 import os
+import struct
+import shutil
+import signal
 import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 from pathlib import Path
 from datetime import datetime
 
+# Optional: in-memory filesystem for file-based tests
+try:
+    from pyfakefs import fake_filesystem_unittest
+    PYFAKEFS_AVAILABLE = True
+except ImportError:
+    PYFAKEFS_AVAILABLE = False
+
 # Add collector to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from collector import affinity
 from collector.display_manager import DisplayManager
 from collector.api_client import APIClient
-from collector.audio_capture import AudioCapture
+from collector.audio_capture import AudioCapture, InMemoryRecording
+from collector.audio_streamer import AudioStreamer, _ChunkBatch
+from collector.command_handler import CommandHandler
+from collector.data_parser import DataParser
+from collector.dmr_monitor import DMRMonitor
+from collector.scheduler import Scheduler
 
 
 class TestDisplayManager(unittest.TestCase):
@@ -61,6 +80,14 @@ class TestDisplayManager(unittest.TestCase):
         status = self.display.get_status()
         self.assertEqual(status['last_dmr_data'], test_data)
     
+    def test_slot_activity_display(self):
+        """Test combined slot status and DMR data update"""
+        self.display.show_slot_activity(2, True, "RX S2: 2222000 -> TG1")
+        
+        status = self.display.get_status()
+        self.assertTrue(status['slot2_rx'])
+        self.assertEqual(status['last_dmr_data'], "RX S2: 2222000 -> TG1")
+    
     def test_invalid_slot_number(self):
         """Test handling of invalid slot numbers"""
         # Invalid slot numbers should be logged but not crash
@@ -97,14 +124,192 @@ class TestAPIClient(unittest.TestCase):
         """Test offline queue is initialized"""
         self.assertIsNotNone(self.client.offline_queue)
         self.assertTrue(hasattr(self.client, 'queue_file'))
+    
+    def test_submit_batch_uses_bulk_endpoint(self):
+        """Test queued items of the same type are posted in one request"""
+        items = [{'type': 'gps', 'data': {'radio_id': i}, 'audio_file': None} for i in range(3)]
+        
+        with mock.patch.object(self.client, '_post_bulk', return_value=201) as request:
+            failed = self.client._submit_batch(items)
+        
+        self.assertEqual(failed, [])
+        request.assert_called_once_with(
+            'https://example.com/api/v1/gps/bulk', [{'radio_id': 0}, {'radio_id': 1}, {'radio_id': 2}]
+        )
+    
+    def test_submit_batch_falls_back_per_item(self):
+        """Test a missing bulk endpoint falls back to per-item posts"""
+        items = [{'type': 'sms', 'data': {'message': str(i)}, 'audio_file': None} for i in range(2)]
+        
+        with mock.patch.object(self.client, '_post_bulk', return_value=404), \
+                mock.patch.object(self.client, '_make_request', return_value={'success': True}) as request:
+            failed = self.client._submit_batch(items)
+        
+        self.assertEqual(failed, [])
+        self.assertEqual(request.call_count, 2)
+        self.assertFalse(self.client.bulk_supported)
+    
+    def test_submit_batch_keeps_bulk_after_server_error(self):
+        """Test transient bulk failures do not disable bulk mode"""
+        items = [{'type': 'sms', 'data': {'message': str(i)}, 'audio_file': None} for i in range(2)]
+        
+        with mock.patch.object(self.client, '_post_bulk', return_value=503), \
+                mock.patch.object(self.client, '_make_request', return_value={'success': True}):
+            self.client._submit_batch(items)
+        
+        self.assertTrue(self.client.bulk_supported)
 
+    def test_telemetry_buffered_until_flush(self):
+        """Test GPS and radio status updates are sent together on flush"""
+        with mock.patch.object(self.client, '_post_bulk', return_value=200) as request:
+            self.client.post_gps({'radio_id': 1001, 'latitude': 45.0, 'longitude': 9.0})
+            self.client.post_radio_status(1001, 'online')
+            request.assert_not_called()
 
-class TestAudioCapture(unittest.TestCase):
+            self.assertTrue(self.client.flush_telemetry())
+
+        request.assert_called_once_with(
+            'https://example.com/api/v1/telemetry/bulk',
+            [
+                {'type': 'gps', 'data': {'radio_id': 1001, 'latitude': 45.0, 'longitude': 9.0}},
+                {'type': 'radio_status', 'data': {'radio_id': 1001, 'status': 'online'}},
+            ]
+        )
+
+    def test_in_memory_recording_upload_keeps_file_name(self):
+        """Test in-memory recordings are uploaded under their file name"""
+        recording = InMemoryRecording(Path('/tmp/rec_1_1001_20240101_120000.mp3'), b'ID3')
+        response = mock.Mock(status_code=200)
+        
+        with mock.patch('collector.api_client.MULTIPART_ENCODER_AVAILABLE', False), \
+                mock.patch.object(self.client.session, 'post', return_value=response) as post:
+            self.client._post_audio('https://example.com/api/v1/transmissions', {'slot': 1}, recording)
+        
+        name, f, content_type = post.call_args.kwargs['files']['audio']
+        self.assertEqual(name, 'rec_1_1001_20240101_120000.mp3')
+        self.assertEqual(content_type, 'audio/mp3')
+    
+    def test_recent_success_tracked(self):
+        """Test successful requests are recorded for skipping health checks"""
+        self.assertFalse(self.client.succeeded_within(60))
+        
+        response = mock.Mock(status_code=200, content=b'{"radios": []}')
+        with mock.patch.object(self.client.session, 'request', return_value=response) as request:
+            self.assertEqual(self.client.check_connections(), (True, True))
+        
+        request.assert_called_once()
+        self.assertTrue(self.client.succeeded_within(60))
+    
+    def test_command_results_batch_falls_back_per_command(self):
+        """Test command results are posted together, or per command if rejected"""
+        results = [(1, 'completed', None), (2, 'failed', 'Unknown command type')]
+        
+        with mock.patch.object(self.client, '_post_bulk', return_value=405), \
+                mock.patch.object(self.client, '_make_request', return_value={'success': True}) as request:
+            self.assertTrue(self.client.post_command_results(results))
+        
+        self.assertEqual(request.call_count, 2)
+        self.assertFalse(self.client.command_results_batch_supported)
+    
+    def test_unposted_command_result_retried_next_call(self):
+        """Test a command result that fails to post is sent with the next results, not retried inline"""
+        self.client.retry_attempts = 2
+        self.client.command_results_batch_supported = False
+        
+        with mock.patch.object(self.client, '_make_request', return_value=None) as request, \
+                mock.patch('collector.api_client.time.sleep') as sleep:
+            self.assertFalse(self.client.post_command_results([(1, 'completed', None)]))
+        request.assert_called_once()
+        sleep.assert_not_called()
+        
+        with mock.patch.object(self.client, '_make_request', return_value={'success': True}) as request:
+            self.assertTrue(self.client.post_command_results([(2, 'completed', None)]))
+        self.assertEqual([call.args[1] for call in request.call_args_list],
+                         [f'{self.client.endpoint}/commands/1/complete', f'{self.client.endpoint}/commands/2/complete'])
+        self.assertTrue(self.client.post_command_results([]))
+    
+    def test_enqueue_defers_to_queue_processor(self):
+        """Test enqueued records are queued instead of posted right away"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.client.queue_file = Path(temp_dir) / 'offline_queue.jsonl'
+        
+        with mock.patch.object(self.client, '_make_request') as request:
+            self.client.enqueue('sms', {'from_radio_id': 1001, 'message': 'hello'})
+            request.assert_not_called()
+        
+        item = self.client.offline_queue.get_nowait()
+        self.assertEqual(item['type'], 'sms')
+        self.assertEqual(item['data']['from_radio_id'], 1001)
+        self.client.close()
+    
+    def test_emergency_posted_immediately(self):
+        """Test emergencies skip the offline queue unless posting fails"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.client.queue_file = Path(temp_dir) / 'offline_queue.jsonl'
+        
+        with mock.patch.object(self.client, '_send', return_value=True) as send:
+            self.client.enqueue('emergency', {'radio_id': 1001, 'emergency_type': 'emergency_button'})
+            self.client._upload_executor.shutdown(wait=True)
+        
+        send.assert_called_once()
+        self.assertEqual(send.call_args.args[0], 'emergency')
+        self.assertTrue(self.client.offline_queue.empty())
+        self.client.close()
+    
+    def test_full_queue_never_evicts_emergency(self):
+        """Test a full offline queue drops other items, not emergencies"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        client = APIClient(dict(self.config, max_offline_queue=3))
+        client.queue_file = Path(temp_dir) / 'offline_queue.jsonl'
+        
+        client._queue_for_retry('emergency', {'radio_id': 1001, 'emergency_type': 'emergency_button'})
+        for i in range(5):
+            client._queue_for_retry('sms', {'message': str(i)})
+        client._queue_for_retry('emergency', {'radio_id': 1002, 'emergency_type': 'emergency_button'})
+        client._queue_for_retry('emergency', {'radio_id': 1003, 'emergency_type': 'emergency_button'})
+        client._queue_for_retry('sms', {'message': 'dropped'})
+        
+        items = [client.offline_queue.get_nowait() for _ in range(client.offline_queue.qsize())]
+        self.assertEqual([item['type'] for item in items], ['emergency'] * 3)
+        self.assertEqual([item['data']['radio_id'] for item in items], [1001, 1002, 1003])
+        client.close()
+    
+    def test_offline_queue_journal_replay(self):
+        """Test acknowledged items are not restored from the journal"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.client.queue_file = Path(temp_dir) / 'offline_queue.jsonl'
+        self.client.legacy_queue_file = Path(temp_dir) / 'offline_queue.json'
+        
+        self.client._queue_for_retry('sms', {'message': 'first'})
+        self.client._queue_for_retry('sms', {'message': 'second'})
+        first = self.client.offline_queue.get_nowait()
+        self.client._append_journal([{'ack': first['id']}])
+        self.client.close()
+        
+        client = APIClient(self.config)
+        client.queue_file = self.client.queue_file
+        client.legacy_queue_file = self.client.legacy_queue_file
+        client._load_offline_queue()
+        
+        self.assertEqual(client.offline_queue.qsize(), 1)
+        self.assertEqual(client.offline_queue.get_nowait()['data']['message'], 'second')
+
+
+class TestAudioCapture(fake_filesystem_unittest.TestCase if PYFAKEFS_AVAILABLE else unittest.TestCase):
     """Test Audio Capture functionality"""
     
     def setUp(self):
-        """Set up test audio capture"""
-        self.temp_dir = tempfile.mkdtemp()
+        """Set up test audio capture on an in-memory filesystem when available"""
+        if PYFAKEFS_AVAILABLE:
+            self.setUpPyfakefs()
+            self.temp_dir = '/tmp/audio'
+        else:
+            self.temp_dir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, self.temp_dir)
         self.config = {
             'capture_device': 'plughw:0,0',
             'sample_rate': 8000,
@@ -114,12 +319,7 @@ class TestAudioCapture(unittest.TestCase):
             'recording_dir': self.temp_dir
         }
         self.audio = AudioCapture(self.config)
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        import shutil
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self.addCleanup(self.audio.close)
     
     def test_initialization(self):
         """Test audio capture initializes correctly"""
@@ -139,7 +339,6 @@ class TestAudioCapture(unittest.TestCase):
         test_file.touch()
         
         # Modify time to be old (25 hours ago)
-        import time
         old_time = time.time() - (25 * 3600)
         os.utime(test_file, (old_time, old_time))
         
@@ -148,6 +347,408 @@ class TestAudioCapture(unittest.TestCase):
         
         # File should be deleted
         self.assertFalse(test_file.exists())
+    
+    def test_cleanup_skips_unchanged_directory(self):
+        """Test cleanup does not rescan a directory with nothing to delete"""
+        recent_file = Path(self.temp_dir) / 'recent.mp3'
+        recent_file.touch()
+        self.audio.cleanup_old_files(max_age_hours=24)
+        
+        with mock.patch('collector.audio_capture.os.scandir', wraps=os.scandir) as scandir:
+            self.audio.cleanup_old_files(max_age_hours=24)
+            scandir.assert_not_called()
+            
+            # A new file changes the directory and triggers a scan
+            (Path(self.temp_dir) / 'new.mp3').touch()
+            os.utime(self.temp_dir, ns=(0, 1))
+            self.audio.cleanup_old_files(max_age_hours=24)
+            scandir.assert_called_once()
+        
+        self.assertTrue(recent_file.exists())
+    
+    def test_recording_uses_encoder_started_ahead(self):
+        """Test a recording takes the waiting encoder and the next one starts in the background"""
+        spare, replacement = mock.Mock(), mock.Mock()
+        spare.poll.return_value = replacement.poll.return_value = None
+        
+        with mock.patch.object(self.audio, '_start_encoder', side_effect=[spare, replacement]) as start_encoder:
+            self.audio._refill_encoder()
+            self.assertIs(self.audio._take_encoder(), spare)
+            
+            deadline = time.monotonic() + 2
+            while self.audio._spare_encoder is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        
+        self.assertIs(self.audio._spare_encoder, replacement)
+        self.assertEqual(start_encoder.call_count, 2)
+
+
+def ogg_page(payload: bytes) -> bytes:
+    """Build an Ogg page carrying payload as one packet"""
+    segments = [255] * (len(payload) // 255) + [len(payload) % 255]
+    header = b'OggS' + bytes(22) + bytes([len(segments)])
+    return header + bytes(segments) + payload
+
+
+class TestChunkBatch(unittest.TestCase):
+    """Test splitting encoder output into Ogg pages and batch bodies"""
+    
+    def setUp(self):
+        """Set up an empty batch"""
+        self.batch = _ChunkBatch(max_chunks=5, chunk_size=64)
+    
+    def read(self, data: bytes):
+        """Feed data as if read from the encoder pipe"""
+        self.batch.reserve(len(data))[:] = data
+        self.batch.add(len(data))
+    
+    def test_single_page(self):
+        """Test one full page is one chunk, sent as the body unchanged"""
+        page = ogg_page(b'opus' * 10)
+        self.read(page)
+        
+        self.assertEqual(len(self.batch), 1)
+        self.assertEqual(self.batch.body(), page)
+    
+    def test_page_split_across_reads(self):
+        """Test a page is only complete once its last byte is read"""
+        page = ogg_page(b'x' * 300)  # Two lacing values
+        self.read(page[:20])  # Inside the page header
+        self.assertEqual(len(self.batch), 0)
+        self.read(page[20:100])
+        self.assertEqual(len(self.batch), 0)
+        self.read(page[100:])
+        
+        self.assertEqual(len(self.batch), 1)
+        self.assertEqual([bytes(p) for p in self.batch.pages()], [page])
+    
+    def test_several_pages_in_one_read(self):
+        """Test pages read together are split, and a trailing partial page is kept"""
+        pages = [ogg_page(bytes([i]) * (20 + i)) for i in range(3)]
+        following = ogg_page(b'next')
+        self.read(b''.join(pages) + following[:10])
+        
+        self.assertEqual([bytes(p) for p in self.batch.pages()], pages)
+        
+        self.batch.clear()
+        self.assertEqual(len(self.batch), 0)
+        self.read(following[10:])
+        self.assertEqual(self.batch.body(), following)
+    
+    def test_batch_body_layout(self):
+        """Test a batch body is the big-endian 16-bit page lengths, then the pages"""
+        pages = [ogg_page(b'a' * 10), ogg_page(b'b' * 300), ogg_page(b'c')]
+        for page in pages:
+            self.read(page)
+        
+        body = self.batch.body()
+        lengths = struct.unpack('>3H', body[:6])
+        self.assertEqual(list(lengths), [len(page) for page in pages])
+        self.assertEqual(body[6:], b''.join(pages))
+        
+        # Parsed the way stream-audio.php does for X-Chunk-Count: 3
+        offset, chunks = 6, []
+        for length in lengths:
+            chunks.append(body[offset:offset + length])
+            offset += length
+        self.assertEqual(chunks, pages)
+        self.assertEqual(offset, len(body))
+
+
+class TestAudioStreamerSending(unittest.TestCase):
+    """Test per-slot sending of stream batches"""
+    
+    def setUp(self):
+        """Set up a streamer whose API client is a stub"""
+        self.api_client = mock.Mock()
+        self.sent = []
+        self.results = []
+        self.api_client.post_binary.side_effect = self.post_binary
+        
+        patcher = mock.patch('collector.audio_streamer.random.random', return_value=0)  # No jitter
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.streamer = AudioStreamer({'max_retries': 3, 'retry_delay': 0.01, 'max_pending_sends': 2},
+                                      self.api_client)
+        self.addCleanup(self.streamer.cleanup_all)
+        self.stream_info = {'radio_id': 1001, 'talkgroup_id': 9, 'chunk_count': 0, 'failed_sends': 0}
+    
+    def post_binary(self, path, body, headers):
+        """Record the request and answer with the next queued result"""
+        self.sent.append(int(headers['X-Sequence']))
+        result = self.results.pop(0) if self.results else True
+        if isinstance(result, threading.Event):
+            result.wait(5)
+            result = True
+        return {'success': True} if result else None
+    
+    def submit(self):
+        """Queue one single-page batch for slot 1"""
+        batch = _ChunkBatch(5, 64)
+        page = ogg_page(b'opus')
+        batch.reserve(len(page))[:] = page
+        batch.add(len(page))
+        self.streamer._submit_chunks(1, self.stream_info, batch)
+    
+    def wait_for(self, condition):
+        """Wait up to 2 seconds for condition to hold"""
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+    
+    def test_failed_send_retried_in_order(self):
+        """Test a failed batch is retried before the slot's next batch"""
+        self.results = [False, True, True]
+        self.submit()
+        self.submit()
+        
+        self.wait_for(lambda: len(self.sent) == 3)
+        self.assertEqual(self.sent, [0, 0, 1])
+        self.assertEqual(self.stream_info['failed_sends'], 0)
+    
+    def test_batch_dropped_after_max_retries(self):
+        """Test a batch is dropped after max_retries failures and sending moves on"""
+        self.results = [False, False, False, True]
+        self.submit()
+        self.wait_for(lambda: len(self.sent) == 3)
+        self.submit()
+        
+        self.wait_for(lambda: len(self.sent) == 4)
+        self.assertEqual(self.sent, [0, 0, 0, 1])
+    
+    def test_full_queue_drops_oldest_batch(self):
+        """Test the oldest waiting batch is dropped when the slot's queue is full"""
+        release = threading.Event()
+        self.results = [release]
+        self.submit()
+        self.wait_for(lambda: self.sent == [0])  # Sender busy with batch 0
+        
+        self.submit()
+        self.submit()
+        self.submit()  # Queue full: batch 1 is dropped
+        release.set()
+        
+        self.wait_for(lambda: len(self.sent) == 3)
+        self.assertEqual(self.sent, [0, 2, 3])
+    
+    def test_shutdown_stops_retrying(self):
+        """Test cleanup ends the send threads without waiting out the backoff"""
+        self.streamer.retry_delay = 30
+        self.results = [False]
+        self.submit()
+        self.wait_for(lambda: self.sent == [0])
+        
+        started = time.monotonic()
+        self.streamer.cleanup_all()
+        
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(any(thread.is_alive() for thread in self.streamer._send_threads))
+        self.assertEqual(self.sent, [0])
+
+
+class TestCommandHandler(unittest.TestCase):
+    """Test Command Handler functionality"""
+    
+    def setUp(self):
+        """Set up test command handler"""
+        self.handler = CommandHandler({'persistent_tools': True})
+        self.addCleanup(self.handler.close)
+    
+    def test_tool_without_daemon_mode_falls_back(self):
+        """Test a tool that prints usage for --daemon is run per command"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        tool = Path(temp_dir) / 'dmr-tool'
+        tool.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "if '--daemon' in sys.argv:\n"
+            "    print('usage: dmr-tool --target ID')\n"
+            "    sys.exit(2)\n"
+        )
+        tool.chmod(0o755)
+        
+        result = self.handler._run_tool([str(tool), '--target', '1001'], timeout=5)
+        
+        self.assertEqual(result.returncode, 0)
+        self.assertIn(str(tool), self.handler._no_daemon)
+    
+    def test_tool_waiting_on_stdin_falls_back(self):
+        """Test a tool that ignores --daemon and waits on stdin is run per command"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        tool = Path(temp_dir) / 'dmr-tool'
+        tool.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "sys.stdin.read()\n"
+            "print('sent')\n"
+        )
+        tool.chmod(0o755)
+        
+        result = self.handler._run_tool([str(tool), '--target', '1001'], timeout=1)
+        
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, 'sent\n')
+        self.assertIn(str(tool), self.handler._no_daemon)
+        self.assertNotIn(str(tool), self.handler._persistent_procs)
+
+
+class TestDataParser(unittest.TestCase):
+    """Test Data Parser functionality"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.parser = DataParser()
+    
+    def test_parse_sms_blanks_non_printables(self):
+        """Test control characters, ASCII or not, are replaced by spaces"""
+        sms = self.parser.parse_sms(b'\x00Hello\x07world\tok\n')
+        self.assertEqual(sms['message'], 'Hello world\tok')
+        
+        sms = self.parser.parse_sms('Ciao\x85caf\u00e9\u2028a\u202eb'.encode())
+        self.assertEqual(sms['message'], 'Ciao caf\u00e9 a b')
+    
+    def test_parse_gps_aprs(self):
+        """Test APRS positions with and without altitude"""
+        gps = self.parser.parse_gps(b'!4903.50N/07201.75W>')
+        self.assertEqual((gps['latitude'], gps['longitude'], gps['altitude']), (49.058333, -72.029167, None))
+        
+        gps = self.parser.parse_gps(b'4500.00S/00930.00E/A=001000')
+        self.assertEqual((gps['latitude'], gps['longitude'], gps['altitude']), (-45.0, 9.5, 304))
+    
+    def test_parse_gps_decimal(self):
+        """Test raw decimal coordinates"""
+        gps = self.parser.parse_gps(b'45.4642, 9.1900')
+        self.assertEqual((gps['latitude'], gps['longitude']), (45.4642, 9.19))
+        self.assertIsNone(self.parser.parse_gps(b'no position'))
+
+
+class TestDMRMonitor(unittest.TestCase):
+    """Test DMR Monitor log parsing"""
+    
+    def setUp(self):
+        """Set up monitor with a recording callback"""
+        self.events = []
+        self.monitor = DMRMonitor('/nonexistent/MMDVM.log',
+                                  callback=lambda event, data: self.events.append((event, dict(data))))
+        self.addCleanup(self.monitor.close)
+    
+    def test_close_releases_signal_wakeup(self):
+        """Test close resets the signal wakeup fd and closes the wakeup pipe"""
+        wakeup_r, wakeup_w = self.monitor._wakeup_r, self.monitor._wakeup_w
+        self.monitor.stop_on_signals()
+        self.monitor.close()
+        
+        self.assertEqual(signal.set_wakeup_fd(-1), -1)
+        for fd in (wakeup_r, wakeup_w):
+            with self.assertRaises(OSError):
+                os.fstat(fd)
+        self.monitor.stop()  # Still safe once closed
+    
+    def test_voice_transmission(self):
+        """Test voice header, RSSI and voice end lines"""
+        self.monitor._process_line(b'M: 2024-01-15 10:30:00.123 DMR Slot 2, received voice header from 2222001 to TG 91')
+        self.monitor._process_line(b'D: 2024-01-15 10:30:01.000 DMR Slot 2, frame, RSSI: -85/-80/-83 dBm')
+        self.monitor._process_line(b'M: 2024-01-15 10:30:05.623 DMR Slot 2, received voice end of transmission, 5.5s, BER: 0.3%')
+        self.monitor._process_line(b'I: 2024-01-15 10:30:06.000 MMDVM protocol version: 1')
+        
+        self.assertEqual([event for event, _ in self.events], ['transmission_start', 'transmission_end'])
+        start, end = self.events[0][1], self.events[1][1]
+        self.assertEqual((start['slot'], start['radio_id'], start['destination_type'], start['destination_id']),
+                         (2, 2222001, 'TG', 91))
+        self.assertEqual(start['start_time'], datetime(2024, 1, 15, 10, 30, 0, 123000))
+        self.assertEqual((end['rssi'], end['duration'], end['ber']), (-85, 5.5, 0.3))
+        self.assertEqual(self.monitor.current_transmissions, {})
+    
+    def test_data_and_emergency(self):
+        """Test data header and emergency lines"""
+        self.monitor._process_line(b'M: 2024-01-15 10:31:00.000 DMR Slot 1, received data header from 2222002 to PC 2222000')
+        self.monitor._process_line(b'M: 2024-01-15 10:32:00.000 DMR Slot 1, Emergency from 2222002')
+        
+        self.assertEqual([event for event, _ in self.events], ['data_transmission', 'emergency'])
+        self.assertEqual(self.events[0][1]['destination_id'], 2222000)
+        self.assertEqual(self.events[1][1]['slot'], 1)
+    
+    def test_backfill_rebuilds_state_only(self):
+        """Test backfilled events track ongoing calls without emitting events"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        log_path = Path(temp_dir) / 'MMDVM.log'
+        log_path.write_bytes(
+            b'M: 2024-01-15 10:30:00.123 DMR Slot 2, received voice header from 2222001 to TG 91\n'
+            b'M: 2024-01-15 10:30:05.623 DMR Slot 2, received voice end of transmission, 5.5s, BER: 0.3%\n'
+            b'M: 2024-01-15 10:31:00.000 DMR Slot 1, received voice header from 2222002 to TG 91\n'
+        )
+        self.monitor.log_path = log_path
+        
+        self.assertEqual(self.monitor.backfill(4096), 3)
+        self.assertEqual(self.events, [])
+        self.assertEqual(list(self.monitor.current_transmissions), [1])
+        
+        # The call in progress is reported once its end is logged
+        self.monitor._process_line(b'M: 2024-01-15 10:31:04.000 DMR Slot 1, received voice end of transmission, 4.0s, BER: 0.1%')
+        self.assertEqual([event for event, _ in self.events], ['transmission_end'])
+
+
+class TestScheduler(unittest.TestCase):
+    """Test periodic task scheduling"""
+    
+    def test_tasks_run_by_deadline(self):
+        """Test tasks run immediately, then by interval, on one thread"""
+        calls = []
+        scheduler = Scheduler()
+        scheduler.add(0.05, lambda: calls.append('fast')).add(60, lambda: calls.append('slow'))
+        scheduler.start_thread()
+        time.sleep(0.18)
+        scheduler.stop()
+        
+        self.assertEqual(calls[:2], ['fast', 'slow'])
+        self.assertEqual(calls.count('slow'), 1)
+        self.assertGreaterEqual(calls.count('fast'), 3)
+        
+        # A failing task is logged and does not stop the others
+        scheduler = Scheduler().add(60, lambda: 1 / 0).add(60, lambda: calls.append('after'))
+        scheduler.start_thread()
+        time.sleep(0.05)
+        scheduler.stop()
+        self.assertEqual(calls[-1], 'after')
+
+
+class TestAffinity(unittest.TestCase):
+    """Test reserving a CPU core for DMR monitoring"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.addCleanup(setattr, affinity, '_shared_cpus', None)
+        self.addCleanup(setattr, affinity, '_shared_nice', 0)
+    
+    def test_release_without_reserved_core(self):
+        """Test threads and subprocesses are left alone without a reserved core"""
+        self.assertIsNone(affinity.subprocess_preexec_fn())
+        
+        with mock.patch.object(affinity.os, 'sched_setaffinity', create=True) as setaffinity:
+            affinity.release_current_thread()
+        setaffinity.assert_not_called()
+    
+    def test_release_returns_to_shared_cores(self):
+        """Test work started from a pinned thread moves back to the shared cores and priority"""
+        with mock.patch.object(affinity.os, 'sched_getaffinity', return_value={0, 1, 2, 3}, create=True), \
+                mock.patch.object(affinity.os, 'sched_setaffinity', create=True) as setaffinity, \
+                mock.patch.object(affinity.os, 'getpriority', return_value=0), \
+                mock.patch.object(affinity.os, 'setpriority') as setpriority:
+            self.assertTrue(affinity.reserve_cpu(3))
+            setaffinity.assert_called_once_with(0, {0, 1, 2})
+            
+            self.assertTrue(affinity.pin_current_thread({3}, -5))
+            self.assertIs(affinity.subprocess_preexec_fn(), affinity.release_current_thread)
+            
+            affinity.release_current_thread()
+        
+        setaffinity.assert_called_with(0, {0, 1, 2})
+        self.assertEqual(setpriority.call_args_list[-1].args[2], 0)
 
 
 def run_tests():
@@ -164,6 +765,13 @@ def run_tests():
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDisplayManager))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAPIClient))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAudioCapture))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestChunkBatch))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAudioStreamerSending))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCommandHandler))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDataParser))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDMRMonitor))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestScheduler))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAffinity))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -121,6 +121,8 @@ cp -r EasyDispatch/raspberry/mmdvm-config /etc/mmdvm-templates
 # Install Python package
 cd "${INSTALL_DIR}"
 pip3 install -r requirements.txt
+# Optional speedups; the collector runs without them if they fail to build
+pip3 install -r requirements-optional.txt || echo "Optional speedups not installed, continuing"
 
 echo ""
 echo "Step 9: Creating configuration files..."